@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Durum değişikliği bildirimleri (webhook, komut, e-posta)
+"""
+
+import collections
+import json
+import os
+import smtplib
+import socket
+import subprocess
+import threading
+import time
+import urllib.request
+from email.message import EmailMessage
+
+from device_registry import (STATUS_NAMES, STATUS_UNKNOWN, STATUS_ONLINE, STATUS_OFFLINE,
+                             STATUS_UNREACHABLE)
+from event_log import LOG_CHANGE
+
+COALESCE_DELAY = 10    # saniye; ilk değişiklikten sonra bu süredeki değişiklikler tek bildirimde toplanır
+RATE_LIMIT = 6         # kanal başına dakikada en fazla bildirim
+MAX_BACKLOG = 100      # kanal başına gönderilmeyi bekleyen en fazla bildirim
+MAX_RETRIES = 5
+RETRY_DELAY = 2        # saniye, her denemede iki katına çıkar
+MAX_RETRY_DELAY = 60
+SEND_TIMEOUT = 10      # saniye
+CLOSE_TIMEOUT = 5      # saniye, kapanırken bekleyen bildirimleri gönderme süresi
+MAX_LISTED = 20        # özet metninde adı yazılan en fazla cihaz
+
+
+class Alert:
+    """Tek bildirimde birleştirilmiş durum değişiklikleri.
+
+    Olaylar cihaz başına birleştirilir: bekleme süresinde düşüp yeniden gelen
+    cihaz bildirilmez, birden çok kez değişen cihazın yalnızca ilk ve son
+    durumu kalır.
+    """
+
+    def __init__(self, events, timestamp=None):
+        self.events = coalesce(events)
+        self.time = time.time() if timestamp is None else timestamp
+
+    def __bool__(self):
+        return bool(self.events)
+
+    def merge(self, other):
+        return Alert(self.events + other.events, other.time)
+
+    @property
+    def down(self):
+        return [event for event in self.events if event['status'] == STATUS_NAMES[STATUS_OFFLINE]]
+
+    @property
+    def up(self):
+        return [event for event in self.events if event['status'] == STATUS_NAMES[STATUS_ONLINE]]
+
+    def summary(self):
+        """'3 cihaz çevrimdışı: a, b, c; 1 cihaz yeniden çevrimiçi: d' biçiminde tek satır"""
+        parts = []
+        for events, text in ((self.down, "çevrimdışı"), (self.up, "yeniden çevrimiçi")):
+            if not events:
+                continue
+            names = ', '.join(event['name'] for event in events[:MAX_LISTED])
+            if len(events) > MAX_LISTED:
+                names += f" (+{len(events) - MAX_LISTED})"
+            parts.append(f"{len(events)} cihaz {text}: {names}")
+        other = len(self.events) - len(self.down) - len(self.up)
+        if other:
+            parts.append(f"{other} cihazın durumu değişti")
+        return '; '.join(parts)
+
+    def to_dict(self):
+        return {'time': self.time, 'summary': self.summary(), 'down': len(self.down),
+                'up': len(self.up), 'events': self.events}
+
+
+def coalesce(events):
+    """Aynı cihazın olaylarını ilk önceki ve son yeni durumla birleştir; değişmeyenleri at"""
+    merged = {}
+    for event in events:
+        first = merged.get(event['id'])
+        if first is not None:
+            event = dict(event, previous=first['previous'])
+        merged[event['id']] = event
+    return [event for event in merged.values() if event['status'] != event['previous']]
+
+
+def make_event(device, old_status, new_status, timestamp):
+    return {'id': device.id, 'name': device.name, 'target': device.target,
+            'previous': STATUS_NAMES[old_status], 'status': STATUS_NAMES[new_status],
+            'time': timestamp}
+
+
+class WebhookSink:
+    """Bildirimi JSON olarak URL'ye POST eder"""
+
+    def __init__(self, url, timeout=SEND_TIMEOUT):
+        self.name = f"webhook {url}"
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alert):
+        body = json.dumps(alert.to_dict(), ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, method='POST',
+                                         headers={'Content-Type': 'application/json',
+                                                  'User-Agent': 'PingMonitor'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as reply:
+            reply.read()
+
+
+class CommandSink:
+    """Yerel komutu çalıştırır; bildirim JSON olarak standart girdiden verilir.
+
+    Kısa özet PING_ALERT_SUMMARY, sayılar PING_ALERT_DOWN ve PING_ALERT_UP
+    ortam değişkenlerindedir. Sıfırdan farklı çıkış kodu başarısız sayılır.
+    """
+
+    def __init__(self, command, timeout=SEND_TIMEOUT):
+        self.name = f"komut {command}"
+        self.command = command
+        self.timeout = timeout
+
+    def send(self, alert):
+        env = dict(os.environ, PING_ALERT_SUMMARY=alert.summary(),
+                   PING_ALERT_DOWN=str(len(alert.down)), PING_ALERT_UP=str(len(alert.up)))
+        result = subprocess.run(self.command, shell=True, env=env, timeout=self.timeout,
+                                input=json.dumps(alert.to_dict(), ensure_ascii=False).encode('utf-8'),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode:
+            error = result.stderr.decode('utf-8', 'replace').strip()[:200]
+            raise OSError(f"çıkış kodu {result.returncode}" + (f": {error}" if error else ''))
+
+
+class EmailSink:
+    """Bildirimi SMTP sunucusu üzerinden e-postayla gönderir"""
+
+    def __init__(self, host, port, sender, recipients, timeout=SEND_TIMEOUT):
+        self.name = f"e-posta {', '.join(recipients)}"
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.timeout = timeout
+
+    def send(self, alert):
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = ', '.join(self.recipients)
+        subject = alert.summary()
+        message['Subject'] = "[Ping Monitor] " + (subject if len(subject) <= 150 else subject[:147] + '...')
+        lines = []
+        for event in alert.events:
+            changed = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(event['time']))
+            lines.append(f"{changed}  {event['name']} ({event['target']}): "
+                         f"{event['previous']} -> {event['status']}")
+        message.set_content('\n'.join(lines) + '\n')
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(message)
+
+
+class Channel:
+    """Tek bir bildirim kanalı: kendi thread'i, sınırlı kuyruğu, hız sınırı ve yeniden denemeleri.
+
+    Hız sınırı yüzünden bekleyen bildirimler gönderilirken tek bildirimde
+    birleştirilir. Kuyruk dolarsa en eski bildirim atılır.
+    """
+
+    def __init__(self, sink, monitor, rate_limit=RATE_LIMIT, max_backlog=MAX_BACKLOG):
+        self.sink = sink
+        self.monitor = monitor
+        self.rate_limit = rate_limit
+        self.max_backlog = max_backlog
+        self.pending = collections.deque()
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._sent_times = collections.deque()  # son bir dakikadaki gönderim zamanları
+        self._closing = False
+        self._deadline = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='alert-channel', daemon=True)
+        self._thread.start()
+
+    def put(self, alert):
+        with self._cond:
+            if len(self.pending) >= self.max_backlog:
+                self.pending.popleft()
+                self.dropped += 1
+                self.monitor.log_message(f"⚠️ Bildirim kuyruğu dolu ({self.sink.name}), en eski bildirim atıldı",
+                                         LOG_CHANGE)
+            self.pending.append(alert)
+            self._cond.notify()
+
+    def close(self, deadline):
+        with self._cond:
+            self._closing = True
+            self._deadline = deadline
+            self._cond.notify()
+
+    def join(self):
+        self._thread.join(max(0.0, self._deadline - time.monotonic()))
+
+    def _rate_wait(self):
+        """Hız sınırına göre beklenmesi gereken süre"""
+        if not self.rate_limit:
+            return 0
+        now = time.monotonic()
+        while self._sent_times and now - self._sent_times[0] >= 60:
+            self._sent_times.popleft()
+        if len(self._sent_times) < self.rate_limit:
+            return 0
+        return self._sent_times[0] + 60 - now
+
+    def _wait(self, seconds):
+        """Kapanış istenmediyse bekle; kapanış istendiyse False döndür"""
+        with self._cond:
+            if not self._closing:
+                self._cond.wait(seconds)
+            return not self._closing
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.pending and not self._closing:
+                    self._cond.wait()
+                if not self.pending:
+                    return
+                # Kapanırken hız sınırı uygulanmaz, son bildirimler hemen gönderilir
+                wait = 0 if self._closing else self._rate_wait()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                alert = self.pending.popleft()
+                while self.pending:
+                    alert = alert.merge(self.pending.popleft())
+            if alert:
+                self._deliver(alert)
+
+    def _deliver(self, alert):
+        delay = RETRY_DELAY
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                self.sink.send(alert)
+            except Exception as e:
+                error = e
+            else:
+                self._sent_times.append(time.monotonic())
+                self.sent += 1
+                return
+            if attempt == MAX_RETRIES or not self._wait(delay):
+                break
+            delay = min(delay * 2, MAX_RETRY_DELAY)
+        self.failed += 1
+        self.monitor.log_message(f"⚠️ Bildirim gönderilemedi ({self.sink.name}): {error}", LOG_CHANGE)
+
+
+class AlertBus:
+    """Durum değişikliklerini toplayıp bildirim kanallarına dağıtan olay yolu.
+
+    publish() izleme döngüsünden (durum dinleyicisi olarak) çağrılır ve yalnızca
+    olayı kaydeder; ağ ya da disk işlemi yapmaz. Dağıtıcı thread ilk değişiklikten
+    sonra coalesce_delay saniye bekler ve bu sürede gelen tüm değişiklikleri
+    (ör. 500 cihazın birlikte düşmesi) tek bildirimde birleştirip her kanalın
+    kuyruğuna koyar. Gönderim, hız sınırı ve yeniden deneme kanal thread'lerindedir.
+    İlk pingte BİLİNMİYOR durumundan çıkış ve üst cihaz yüzünden erişilemez
+    olma bildirilmez.
+    """
+
+    def __init__(self, monitor, sinks, coalesce_delay=COALESCE_DELAY, rate_limit=RATE_LIMIT,
+                 max_backlog=MAX_BACKLOG):
+        self.monitor = monitor
+        self.coalesce_delay = coalesce_delay
+        self.channels = [Channel(sink, monitor, rate_limit, max_backlog) for sink in sinks]
+        self._events = []
+        self._first = None
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='alerts', daemon=True)
+        self._thread.start()
+        monitor.status_listeners.append(self.publish)
+
+    def publish(self, device, old_status, new_status, timestamp):
+        if old_status == STATUS_UNKNOWN:
+            return
+        # Üst cihazı düşen cihazlar ayrıca bildirilmez (bildirimde yalnızca üst
+        # cihaz yer alır); üst cihaz geri gelince yeniden çevrimiçi olmaları da
+        if new_status == STATUS_UNREACHABLE or (old_status == STATUS_UNREACHABLE
+                                                and new_status == STATUS_ONLINE):
+            return
+        event = make_event(device, old_status, new_status, timestamp)
+        with self._cond:
+            if not self._events:
+                self._first = time.monotonic()
+                self._cond.notify()
+            self._events.append(event)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._events and not self._closing:
+                    self._cond.wait()
+                if not self._events:
+                    return
+                while not self._closing:
+                    remaining = self._first + self.coalesce_delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                events, self._events = self._events, []
+            alert = Alert(events)
+            if alert:
+                for channel in self.channels:
+                    channel.put(alert)
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """Bekleyen değişiklikleri hemen gönder ve kanalları kapat"""
+        try:
+            self.monitor.status_listeners.remove(self.publish)
+        except ValueError:
+            pass
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        for channel in self.channels:
+            channel.close(deadline)
+        for channel in self.channels:
+            channel.join()
+
+
+def build_sinks(webhooks=(), commands=(), smtp=None, mail_from=None, mail_to=()):
+    """Komut satırı seçeneklerinden bildirim kanalları"""
+    sinks = [WebhookSink(url) for url in webhooks]
+    sinks.extend(CommandSink(command) for command in commands)
+    if mail_to:
+        host, _, port = (smtp or 'localhost').partition(':')
+        sender = mail_from or f"ping-monitor@{socket.gethostname()}"
+        sinks.append(EmailSink(host, int(port or 25), sender, mail_to))
+    return sinks
@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Performans ölçüm betikleri
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+from datetime import datetime
+
+from device_registry import Device, STATUS_ONLINE, STATUS_NAMES, format_clock
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Bellek ölçümündeki cihazların son kontrol zamanları bu kadar saniyeye yayılır
+# (bir ping aralığındaki gibi)
+CHECK_SPREAD = 60
+
+
+def measure_allocation(build):
+    """build() ile oluşturulan nesnelerin bellek kullanımını ve süresini ölç"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def legacy_devices(count):
+    """Eski biçim: ISO zaman metinleri içeren cihaz sözlükleri"""
+    now = time.time()
+    changed = datetime.fromtimestamp(now).isoformat()
+    return [{'id': f'{index:012x}', 'name': f'host-{index}', 'ip': f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}',
+             'status': 'online', 'last_check': datetime.fromtimestamp(now - index % CHECK_SPREAD).isoformat(),
+             'last_status_change': changed, 'last_rtt': 1.5}
+            for index in range(count)]
+
+
+def compact_devices(count):
+    """Yeni biçim: __slots__ kayıtları, epoch zamanlar ve durum kodları"""
+    now = time.time()
+    devices = []
+    for index in range(count):
+        device = Device(f'host-{index}', f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}',
+                        id=f'{index:012x}')
+        device.status = STATUS_ONLINE
+        device.last_check = now - index % CHECK_SPREAD
+        device.last_status_change = now
+        device.last_rtt = 1.5
+        devices.append(device)
+    return devices
+
+
+def run_memory(args):
+    """Cihaz başına bellek ve tablo yenileme maliyetini karşılaştır"""
+    count = args.devices
+    legacy, legacy_size, legacy_build = measure_allocation(lambda: legacy_devices(count))
+    compact, compact_size, compact_build = measure_allocation(lambda: compact_devices(count))
+
+    # Eski update_display her yenilemede ISO metni yeniden ayrıştırıyordu
+    started = time.perf_counter()
+    for device in legacy:
+        datetime.fromisoformat(device['last_check']).strftime("%H:%M:%S")
+        device.get('status', 'unknown')
+    legacy_render = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for device in compact:
+        format_clock(device.last_check)
+        STATUS_NAMES[device.status]
+    compact_render = time.perf_counter() - started
+
+    print(f"Cihaz sayısı: {count}")
+    print(f"{'':24}{'sözlük (eski)':>16}{'Device (yeni)':>16}")
+    print(f"{'Toplam bellek (MB)':24}{legacy_size / 1e6:16.1f}{compact_size / 1e6:16.1f}")
+    print(f"{'Cihaz başına (bayt)':24}{legacy_size / count:16.0f}{compact_size / count:16.0f}")
+    print(f"{'Oluşturma (s)':24}{legacy_build:16.3f}{compact_build:16.3f}")
+    print(f"{'Tam tablo biçimleme (s)':24}{legacy_render:16.3f}{compact_render:16.3f}")
+    print(f"Bellek kazancı: %{100 * (1 - compact_size / legacy_size):.0f}")
+
+
+class SimulatedNetwork:
+    """Ağ olmadan ölçüm için sahte ping arka ucu.
+
+    PingMonitor.ping_device yerine kullanılır. Her sahte cihazın profili (kapalı,
+    kayıplı, ortalama gecikme) IP ve tohumdan türetildiği için aynı ayarlarla
+    çalıştırılan ölçümler aynı ağı görür. Ping, gecikme ya da zaman aşımı kadar
+    bekler; böylece gerçek arka uçtaki gibi işçi thread'lerini meşgul eder.
+    """
+
+    def __init__(self, latency=20.0, jitter=5.0, loss=0.01, down=0.02, seed=1):
+        self.latency = latency  # ms, cihazların ortalama gecikmesi
+        self.jitter = jitter    # ms, ping başına gecikme sapması
+        self.loss = loss        # her pingin kaybolma olasılığı
+        self.down = down        # hiç yanıt vermeyen cihaz oranı
+        self.seed = seed
+        self.probes = 0
+        self.timeouts = 0
+        self._profiles = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # İşçi işlemlerine gönderilebilmesi için (çok işlemli mod)
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def profile(self, ip):
+        """Cihazın (kapalı mı, temel gecikme) profili"""
+        profile = self._profiles.get(ip)
+        if profile is None:
+            rng = random.Random(zlib.crc32(ip.encode()) ^ self.seed)
+            profile = (rng.random() < self.down, self.latency * rng.uniform(0.2, 1.8))
+            self._profiles[ip] = profile
+        return profile
+
+    def ping(self, ip, timeout=None):
+        """ping_device ile aynı imza: gecikme (ms) ya da yanıt yoksa None"""
+        timeout = timeout or 1.0
+        down, base = self.profile(ip)
+        rtt = max(0.1, random.gauss(base, self.jitter))
+        with self._lock:
+            self.probes += 1
+            lost = down or random.random() < self.loss or rtt > timeout * 1000
+            if lost:
+                self.timeouts += 1
+        if lost:
+            time.sleep(timeout)
+            return None
+        time.sleep(rtt / 1000)
+        return rtt
+
+
+def peak_rss_mb():
+    """Sürecin en yüksek bellek kullanımı (MB, ölçülemiyorsa None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_sweep(args):
+    """Sahte ağdaki cihazlarla PingMonitor motorunun ölçeklenmesini ölç"""
+    from ping_monitor import PingMonitor
+
+    random.seed(args.seed)
+    network = SimulatedNetwork(latency=args.latency, jitter=args.jitter, loss=args.loss,
+                               down=args.down, seed=args.seed)
+
+    # GUI'nin on_device_update'i gibi: kilit altında bekleyen güncellemeye ekle
+    pending = {}
+    pending_lock = threading.Lock()
+    callback_calls = 0
+    callback_time = 0.0
+    lost = 0
+
+    def on_device_update(device):
+        nonlocal callback_calls, callback_time, lost
+        started = time.perf_counter()
+        with pending_lock:
+            pending[device.id] = device
+        callback_calls += 1
+        callback_time += time.perf_counter() - started
+        if device.last_rtt is None:
+            lost += 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        monitor = PingMonitor(gui_callback=on_device_update, history_file=None,
+                              devices_file=os.path.join(directory, 'devices.json'))
+        monitor.log_to_console = False
+        monitor.set_log_buffer_size(1)
+        monitor.ping_interval = args.interval
+        monitor.ping_timeout = args.timeout
+        monitor.max_concurrency = args.concurrency
+        monitor.workers = args.workers
+        monitor.import_devices({'name': f'sim-{index}', 'ip': f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}'}
+                               for index in range(args.devices))
+        monitor.ping_device = network.ping
+        if args.metrics:
+            monitor.enable_metrics()
+
+        # Her count cihaz pinginde bir tarama tamamlanmış sayılır. Sayım işlenen
+        # sonuçlardan yapılır; çok işlemli modda sahte ağ her işçide ayrı kopyadır
+        sweep_times = []
+        # İşçi işlemlerinin CPU süresi de sayılır (kapatılıp beklendikten sonra)
+        cpu_started = time.process_time() + sum(os.times()[2:4])
+        started = time.perf_counter()
+        monitor.start_monitoring()
+        deadline = started + args.duration
+        while time.perf_counter() < deadline:
+            time.sleep(0.05)
+            while callback_calls >= (len(sweep_times) + 1) * args.devices:
+                sweep_times.append(time.perf_counter() - started)
+        monitor.close()
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() + sum(os.times()[2:4]) - cpu_started
+
+    durations = [later - earlier for earlier, later in zip([0.0] + sweep_times, sweep_times)]
+    result = {
+        'devices': args.devices,
+        'interval': args.interval,
+        'concurrency': args.concurrency,
+        'workers': args.workers,
+        'elapsed': elapsed,
+        'probes': callback_calls,
+        'timeouts': lost,
+        'probes_per_second': callback_calls / elapsed,
+        'target_per_second': args.devices / args.interval,
+        'sweeps': len(sweep_times),
+        'first_sweep': durations[0] if durations else None,
+        'mean_sweep': sum(durations[1:]) / len(durations[1:]) if len(durations) > 1 else None,
+        'cpu_seconds': cpu,
+        'cpu_percent': 100 * cpu / elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'callback_calls': callback_calls,
+        'callback_us': 1e6 * callback_time / callback_calls if callback_calls else None,
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    def show(value, unit=''):
+        return '-' if value is None else f"{value:.3f}{unit}" if isinstance(value, float) else f"{value}{unit}"
+
+    print(f"Cihaz sayısı: {args.devices}, aralık: {args.interval} s, eşzamanlılık: {args.concurrency}, "
+          f"işçi: {args.workers or 1}")
+    print(f"{'Süre (s)':28}{show(elapsed)}")
+    print(f"{'Ping / zaman aşımı':28}{callback_calls} / {lost}")
+    print(f"{'Ping/s (hedef)':28}{result['probes_per_second']:.0f} ({result['target_per_second']:.0f})")
+    print(f"{'Tarama sayısı':28}{len(sweep_times)}")
+    print(f"{'İlk tarama (s)':28}{show(result['first_sweep'])}")
+    print(f"{'Ortalama tarama (s)':28}{show(result['mean_sweep'])}")
+    print(f"{'CPU (s / %)':28}{cpu:.2f} / {result['cpu_percent']:.0f}")
+    print(f"{'En yüksek bellek (MB)':28}{show(result['peak_rss_mb'])}")
+    print(f"{'GUI callback (adet / µs)':28}{callback_calls} / {show(result['callback_us'])}")
+
+
+# Ayrı bir Python işleminde PingMonitor'ü açıp yükleme süresini yazan kod
+STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from ping_monitor import PingMonitor
+imported = time.perf_counter()
+monitor = PingMonitor(history_file=None, devices_file=sys.argv[2], cache_file=None if sys.argv[3] == '1' else False)
+loaded = time.perf_counter()
+print(json.dumps({'import': imported - started, 'load': loaded - imported, 'devices': len(monitor.devices)}))
+"""
+
+
+def run_startup(args):
+    """Büyük cihaz listesinde açılış (JSON ve ikili önbellek) ve kayıt sürelerini ölç"""
+    count = args.devices
+    package = os.path.dirname(os.path.abspath(__file__))
+    results = {'devices': count}
+
+    def start(label, devices_file, cache=True):
+        # Soğuk açılış: yorumlayıcı ve modüller her seferinde yeniden yüklenir
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', STARTUP_PROBE, package, devices_file, '1' if cache else '0'],
+                                check=True, capture_output=True, text=True).stdout
+        elapsed = time.perf_counter() - started
+        report = json.loads(output.strip().splitlines()[-1])
+        if report['devices'] != count:
+            raise RuntimeError(f"{label}: {report['devices']} cihaz yüklendi, {count} bekleniyordu")
+        results[label] = {'process': elapsed, 'import': report['import'], 'load': report['load']}
+
+    with tempfile.TemporaryDirectory() as directory:
+        devices_file = os.path.join(directory, 'devices.json')
+        # Önceki sürümlerin yazdığı gibi girintili liste ve durum dosyası
+        now = time.time()
+        devices = [{'id': f'{index:012x}', 'name': f'host-{index}',
+                    'ip': f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}'}
+                   for index in range(count)]
+        with open(devices_file, 'w', encoding='utf-8') as f:
+            json.dump(devices, f, indent=2)
+        with open(os.path.join(directory, 'devices_state.json'), 'w', encoding='utf-8') as f:
+            json.dump({device['id']: {'status': 'online', 'last_check': now, 'last_status_change': now,
+                                      'last_rtt': 1.5} for device in devices}, f)
+        del devices
+
+        start('json', devices_file, cache=False)
+        start('first', devices_file)   # JSON okunur, önbellek yazılır
+        start('cached', devices_file)
+        os.utime(devices_file)         # içerik aynı, zaman farklı: özet karşılaştırılır
+        start('touched', devices_file)
+
+        sys.path.insert(0, package)
+        from ping_monitor import PingMonitor
+        monitor = PingMonitor(history_file=None, devices_file=devices_file)
+        monitor.log_to_console = False
+        for name, action in (('save_devices', monitor.save_devices), ('save_state', monitor.save_state),
+                             ('save_cache', monitor.save_cache)):
+            started = time.perf_counter()
+            action()
+            results[name] = time.perf_counter() - started
+        results['cache_mb'] = os.path.getsize(monitor.cache_file) / 1e6
+        results['json_mb'] = os.path.getsize(devices_file) / 1e6
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Cihaz sayısı: {count}")
+    print(f"{'':36}{'işlem (s)':>12}{'import (s)':>12}{'yükleme (s)':>12}")
+    for label, title in (('json', 'JSON (önbellek kapalı)'), ('first', 'İlk açılış (önbellek yazılır)'),
+                         ('cached', 'Önbellekten'), ('touched', 'Önbellekten (zamanı değişen dosya)')):
+        row = results[label]
+        print(f"{title:36}{row['process']:12.3f}{row['import']:12.3f}{row['load']:12.3f}")
+    print(f"{'save_devices (s)':36}{results['save_devices']:12.3f}")
+    print(f"{'save_state (s)':36}{results['save_state']:12.3f}")
+    print(f"{'save_cache (s)':36}{results['save_cache']:12.3f}")
+    print(f"{'Dosya boyutu (MB, JSON / önbellek)':36}{results['json_mb']:12.1f}{results['cache_mb']:12.1f}")
+
+
+def build_history(path, devices, days, interval, outages, loss, seed):
+    """Sahte geçmiş veritabanı: tüm saatlik özetler ve gecikme histogramları, hatalı
+    cihaz-saatlerinin dakikalık özetleri ve tamamlanmamış son saatin ham kayıtları.
+    Rapor ayrıntıya yalnızca bunlarda indiğinden diğer dakikalar üretilmez.
+    (üretilen kesinti sayısı, tablo satır sayıları) döndürür.
+    """
+    from history_store import SCHEMA, LATENCY_BIN_SQL
+    rng = random.Random(seed)
+    now = int(time.time()) // 60 * 60
+    start = (now - int(days * 86400)) // 3600 * 3600
+    hour_done = now - 120                       # son iki dakika saatlik özete aktarılmamış
+    tail = hour_done // 3600 * 3600             # bu saatten sonrası yalnızca ham kayıtlarda
+    per_hour = 3600 // interval
+    per_minute = 60 // interval
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    injected = 0
+    hours, histogram, minutes, raw = [], [], [], []
+    for index in range(devices):
+        device = f'{index:012x}'
+        base = rng.lognormvariate(1.5, 0.8)
+        low_bin, high_bin = (conn.execute('SELECT ' + LATENCY_BIN_SQL.format(rtt=':rtt'), {'rtt': rtt}).fetchone()[0]
+                             for rtt in (base, base * 1.3))
+        failed = set()
+        count = int(outages * days / 30 + rng.random())
+        injected += count
+        for _ in range(count):
+            begin = rng.uniform(start, now)
+            duration = rng.expovariate(1 / 600)
+            failed.update(range(int((begin - start) // interval), int((begin + duration - start) // interval) + 1))
+        t = start
+        while loss:
+            t += rng.expovariate(loss / interval)
+            if t >= now:
+                break
+            failed.add(int((t - start) // interval))
+        by_hour = {}
+        for probe in failed:
+            by_hour[probe // per_hour] = by_hour.get(probe // per_hour, 0) + 1
+        for hour in range((tail - start) // 3600):
+            bucket = start + hour * 3600
+            ok = per_hour - by_hour.get(hour, 0)
+            hours.append((bucket, device, per_hour, ok, ok * base, base * 0.8, base * 1.5))
+            if high_bin == low_bin or not ok // 4:
+                histogram.append((bucket, device, low_bin, ok))
+            else:
+                histogram.append((bucket, device, low_bin, ok - ok // 4))
+                histogram.append((bucket, device, high_bin, ok // 4))
+            if ok == per_hour:
+                continue
+            first = hour * per_hour
+            for minute in range(60):
+                probes = range(first + minute * per_minute, first + (minute + 1) * per_minute)
+                ok = sum(probe not in failed for probe in probes)
+                rtt = base if ok else None
+                minutes.append((bucket + minute * 60, device, per_minute, ok, ok * base if ok else None, rtt, rtt))
+        for probe in range((tail - start) // interval, (now - start) // interval):
+            raw.append((start + probe * interval, device, probe not in failed, None if probe in failed else base))
+    with conn:
+        conn.executemany('INSERT INTO rollup_1h VALUES (?, ?, ?, ?, ?, ?, ?)', hours)
+        conn.executemany('INSERT INTO latency_1h VALUES (?, ?, ?, ?)', histogram)
+        conn.executemany('INSERT INTO rollup_1m VALUES (?, ?, ?, ?, ?, ?, ?)', minutes)
+        conn.executemany('INSERT INTO probes (ts, device, ok, rtt) VALUES (?, ?, ?, ?)', raw)
+        conn.execute("INSERT INTO meta VALUES ('rollup_1h_bucket', ?)", (hour_done,))
+        conn.execute("INSERT INTO meta VALUES ('rollup_1m_rowid', ?)", (len(raw),))
+    conn.close()
+    return injected, {'hour_rows': len(hours), 'minute_rows': len(minutes), 'raw_rows': len(raw)}
+
+
+def run_report(args):
+    """Sahte geçmişte erişilebilirlik raporunun süresini ölç"""
+    import sla_report
+
+    results = {'devices': args.devices, 'days': args.days}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'history.db')
+        started = time.perf_counter()
+        injected, rows = build_history(path, args.devices, args.days, args.interval, args.outages,
+                                       args.loss, args.seed)
+        results['generate'] = time.perf_counter() - started
+        results['db_mb'] = os.path.getsize(path) / 1e6
+        results.update(rows)
+
+        now = time.time()
+        start, end = int(now - args.days * 86400) // 60 * 60, int(now) // 60 * 60
+        started = time.perf_counter()
+        conn = sla_report.open_history(path)
+        stats = sla_report.SlaReport(conn, args.min_failures).run(start, end)
+        conn.close()
+        results['compute'] = time.perf_counter() - started
+        started = time.perf_counter()
+        report = sla_report.build_report(stats, {}, start, end, args.min_failures)
+        results['build'] = time.perf_counter() - started
+        for name, writer in sla_report.WRITERS.items():
+            started = time.perf_counter()
+            writer(report, io.StringIO())
+            results[name] = time.perf_counter() - started
+        results['outages_injected'] = injected
+        results['outages_found'] = report['total']['outages']
+        results['uptime'] = report['total']['uptime']
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Cihaz sayısı: {args.devices}, gün: {args.days}, aralık: {args.interval} s")
+    print(f"{'Üretim (s)':36}{results['generate']:12.3f}")
+    print(f"{'Veritabanı (MB)':36}{results['db_mb']:12.1f}")
+    print(f"{'Satır (saatlik / dakikalık / ham)':36}{rows['hour_rows']:12}{rows['minute_rows']:12}{rows['raw_rows']:12}")
+    print(f"{'Hesaplama (s)':36}{results['compute']:12.3f}")
+    print(f"{'Rapor satırları (s)':36}{results['build']:12.3f}")
+    print(f"{'CSV / JSON / HTML (s)':36}{results['csv']:12.3f}{results['json']:12.3f}{results['html']:12.3f}")
+    print(f"{'Kesinti (üretilen / bulunan)':36}{injected:12}{results['outages_found']:12}")
+    print(f"{'Toplam erişilebilirlik (%)':36}{results['uptime']:12.4f}")
+
+def main(argv=None):
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="Ping Monitor performans ölçümleri")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    memory = commands.add_parser('memory', help="Cihaz kayıtlarının bellek kullanımı")
+    memory.add_argument('--devices', type=int, default=100000, help="Cihaz sayısı")
+    memory.set_defaults(func=run_memory)
+
+    sweep = commands.add_parser('sweep', help="Sahte ağda izleme motorunun ölçeklenmesi")
+    sweep.add_argument('--devices', type=int, default=2000, help="Sahte cihaz sayısı")
+    sweep.add_argument('--interval', type=float, default=5, help="Ping aralığı (saniye)")
+    sweep.add_argument('--timeout', type=float, default=1, help="Ping zaman aşımı (saniye)")
+    sweep.add_argument('--concurrency', type=int, default=256, help="Aynı anda en fazla ping sayısı")
+    sweep.add_argument('--workers', type=int, default=0, help="İşçi işlemi sayısı (çok işlemli mod)")
+    sweep.add_argument('--duration', type=float, default=20, help="Ölçüm süresi (saniye)")
+    sweep.add_argument('--latency', type=float, default=20, help="Ortalama gecikme (ms)")
+    sweep.add_argument('--jitter', type=float, default=5, help="Gecikme sapması (ms)")
+    sweep.add_argument('--loss', type=float, default=0.01, help="Paket kaybı olasılığı (0-1)")
+    sweep.add_argument('--down', type=float, default=0.02, help="Kapalı cihaz oranı (0-1)")
+    sweep.add_argument('--seed', type=int, default=1, help="Rastgelelik tohumu")
+    sweep.add_argument('--metrics', action='store_true', help="Ölçümleri açık çalıştır (ek yükü görmek için)")
+    sweep.add_argument('--json', action='store_true', help="Sonuçları JSON olarak yaz")
+    sweep.set_defaults(func=run_sweep)
+
+    startup = commands.add_parser('startup', help="Büyük cihaz listesinde açılış ve kayıt süreleri")
+    startup.add_argument('--devices', type=int, default=100000, help="Cihaz sayısı")
+    startup.add_argument('--json', action='store_true', help="Sonuçları JSON olarak yaz")
+    startup.set_defaults(func=run_startup)
+
+    report = commands.add_parser('report', help="Ping geçmişinden erişilebilirlik raporu süresi")
+    report.add_argument('--devices', type=int, default=1000, help="Sahte cihaz sayısı")
+    report.add_argument('--days', type=float, default=30, help="Rapor dönemi (gün)")
+    report.add_argument('--interval', type=int, default=10, help="Ping aralığı (saniye, 60'ı bölmeli)")
+    report.add_argument('--outages', type=float, default=2, help="Cihaz başına aylık ortalama kesinti")
+    report.add_argument('--loss', type=float, default=0.0002, help="Tekil ping kaybı olasılığı")
+    report.add_argument('--min-failures', type=int, default=3, help="Kesinti için art arda başarısız ping")
+    report.add_argument('--seed', type=int, default=1, help="Rastgele sayı tohumu")
+    report.add_argument('--json', action='store_true', help="Sonuçları JSON olarak yaz")
+    report.set_defaults(func=run_report)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
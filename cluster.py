@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Dağıtık izleme: koordinatör ve ajan modları
+"""
+
+import bisect
+import collections
+import hashlib
+import hmac
+import json
+import signal
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from device_registry import STATE_KEYS, STATUS_NAMES
+from event_log import LOG_CHANGE, LOG_LEVELS
+from ping_monitor import PingMonitor
+from sharding import (WORKER_SETTINGS, apply_results, device_payload, probe_delta, status_delta,
+                      _add_devices)
+from topology import dependency_groups
+
+SYNC_PATH = '/cluster/sync'
+SYNC_INTERVAL = 1.0      # saniye, ajanın sonuç gönderme (ve kalp atışı) aralığı
+AGENT_TIMEOUT = 15       # saniye, bu süre haber alınamayan ajanın cihazları dağıtılır
+MAX_BUFFER = 100000      # koordinatöre ulaşılamazken ajanda bekletilen en fazla sonuç
+MAX_REQUEST = 64 << 20   # bayt
+
+# Koordinatörün ajanlara gönderdiği ayarlar (ping arka ucu her ajanda yereldir)
+AGENT_SETTINGS = tuple(name for name in WORKER_SETTINGS if name != 'ping_backend')
+
+
+class HashRing:
+    """Sanal düğümlü tutarlı özetleme halkası.
+
+    Bir düğüm eklenip çıkarıldığında anahtarların yalnızca yaklaşık 1/N'i
+    yer değiştirir.
+    """
+
+    def __init__(self, nodes=(), replicas=64):
+        self.replicas = replicas
+        self.nodes = set(nodes)
+        self._hashes = []
+        self._owners = []
+        self._rebuild()
+
+    @staticmethod
+    def hash(key):
+        return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+    def _rebuild(self):
+        points = sorted((self.hash(f'{node}#{index}'), node)
+                        for node in self.nodes for index in range(self.replicas))
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def add(self, node):
+        self.nodes.add(node)
+        self._rebuild()
+
+    def remove(self, node):
+        self.nodes.discard(node)
+        self._rebuild()
+
+    def node_for(self, key):
+        """Anahtarın atandığı düğüm (halka boşsa None)"""
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, self.hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class Coordinator:
+    """Cihazları ajanlara dağıtan ve sonuçlarını toplayan koordinatör.
+
+    Kendisi ping atmaz. Ajanlar SYNC_PATH adresine her saniye toplu sonuçlarını
+    gönderir; bu istek aynı zamanda kalp atışıdır. Yanıtta güncel ayarlar ve
+    atama değiştiyse ajanın yeni cihaz listesi döner. AGENT_TIMEOUT boyunca
+    haber alınamayan ajan halkadan çıkarılır ve cihazları diğerlerine geçer.
+    Bir cihaz ve üst cihazları her zaman aynı ajana atanır.
+    PingMonitor için ShardPool ile aynı arayüzü (add/remove/set_interval/run) sağlar.
+    """
+
+    def __init__(self, monitor, host='127.0.0.1', port=8765, token=None, agent_timeout=AGENT_TIMEOUT):
+        self.monitor = monitor
+        self.token = token
+        self.agent_timeout = agent_timeout
+        self.ring = HashRing()
+        self.agents = {}      # ajan adı -> son kalp atışı (monotonic)
+        self.ring_version = 0     # ajan katılınca/ayrılınca artar
+        self.devices_version = 0  # cihaz eklenince/silinince artar (monitör kilidi altında)
+        self._owners = None       # cihaz kimliği -> ajan (atama sürümü değişince yeniden hesaplanır)
+        self._lock = threading.Lock()
+        self._apply_lock = threading.Lock()
+
+        coordinator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path != SYNC_PATH:
+                    self.send_error(404)
+                    return
+                if coordinator.token and not hmac.compare_digest(
+                        self.headers.get('X-Cluster-Token', ''), coordinator.token):
+                    self.send_error(403)
+                    return
+                length = int(self.headers.get('Content-Length') or 0)
+                if length > MAX_REQUEST:
+                    self.send_error(413)
+                    return
+                try:
+                    request = json.loads(self.rfile.read(length))
+                    response = coordinator.sync(request)
+                except (ValueError, KeyError, TypeError) as e:
+                    self.send_error(400, str(e))
+                    return
+                body = json.dumps(response, separators=(',', ':')).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address
+
+    def add(self, devices):
+        self.devices_version += 1
+
+    def remove(self, device_ids):
+        self.devices_version += 1
+
+    def set_interval(self, seconds):
+        pass  # ayarlar her yanıtta gönderilir
+
+    def _owners_map(self):
+        """Atama sürümü ve cihaz -> ajan eşlemesi (kilit altında çağrılır)"""
+        monitor = self.monitor
+        with monitor._cond:
+            version = f'{self.ring_version}.{self.devices_version}'
+            if self._owners is None or self._owners[0] != version:
+                ids = monitor.devices.ids()
+                groups = dependency_groups(monitor.devices)
+            else:
+                ids = None
+        if ids is not None:
+            # Bağımlılıkla bağlı cihazlar kümenin anahtarıyla aynı ajana düşer
+            self._owners = (version, {device_id: self.ring.node_for(groups.get(device_id, device_id))
+                                      for device_id in ids})
+        return self._owners
+
+    def sync(self, request):
+        """Ajanın sonuçlarını işle, ayarları ve gerekiyorsa cihaz listesini döndür"""
+        agent = str(request['agent'])
+        monitor = self.monitor
+        with self._lock:
+            if agent not in self.agents:
+                self.ring.add(agent)
+                self.ring_version += 1
+                monitor.log_message(f"Ajan katıldı: {agent} ({len(self.ring.nodes)} ajan)")
+            self.agents[agent] = time.monotonic()
+            version, owners = self._owners_map()
+
+        # İstek uygulanmadan önce doğrulanır; hatalı istek (400) hiçbir sonucu
+        # işlemez, ajan onu bölerek yeniden gönderdiğinde sonuçlar tekrarlanmaz.
+        # Başka ajana geçmiş cihazların geç gelen sonuçları atlanır
+        results = [result for result in map(parse_result, request.get('results', ()))
+                   if owners.get(result[0]) == agent]
+        logs = [parse_log(entry) for entry in request.get('logs', ())]
+        with self._apply_lock:
+            apply_results(monitor, results, logs)
+
+        response = {'version': version,
+                    'settings': {name: getattr(monitor, name) for name in AGENT_SETTINGS}}
+        if request.get('version') != version:
+            with monitor._cond:
+                response['devices'] = [device_payload(device) for device in monitor.devices
+                                       if owners.get(device.id) == agent]
+        return response
+
+    def expire_agents(self):
+        """Kalp atışı kesilen ajanları halkadan çıkar"""
+        now = time.monotonic()
+        with self._lock:
+            for agent, last_seen in list(self.agents.items()):
+                if now - last_seen > self.agent_timeout:
+                    del self.agents[agent]
+                    self.ring.remove(agent)
+                    self.ring_version += 1
+                    self.monitor.log_message(
+                        f"Ajan yanıt vermiyor: {agent}; cihazları diğer ajanlara dağıtılıyor", LOG_CHANGE)
+
+    def run(self, run_id):
+        """Sunucuyu çalıştır; izleme durdurulunca kapat"""
+        monitor = self.monitor
+        thread = threading.Thread(target=self.server.serve_forever, name='coordinator', daemon=True)
+        thread.start()
+        monitor.log_message(f"Koordinatör: http://{self.address[0]}:{self.address[1]}{SYNC_PATH}")
+        try:
+            while True:
+                with monitor._cond:
+                    if not monitor.monitoring or run_id != monitor._run_id:
+                        break
+                    monitor._cond.wait(1)
+                self.expire_agents()
+                if (monitor._state_dirty_since is not None
+                        and time.monotonic() - monitor._state_dirty_since >= monitor.state_save_delay):
+                    monitor.save_state()
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+            monitor.save_state()
+
+
+def parse_result(result):
+    """Ajanın gönderdiği sonuç demetini doğrula (hatalıysa ValueError)"""
+    device_id, timestamp, rtt, status, last_status_change = result
+    numbers = (timestamp, rtt, last_status_change)
+    if (not isinstance(device_id, str) or type(status) is not int or not 0 <= status < len(STATUS_NAMES)
+            or not all(value is None or type(value) in (int, float) for value in numbers)
+            or timestamp is None and rtt is not None):
+        raise ValueError(f"geçersiz sonuç: {result!r}")
+    return device_id, timestamp, rtt, status, last_status_change
+
+
+def parse_log(entry):
+    """Ajanın gönderdiği (satır, olay kaydı) çiftini doğrula (hatalıysa ValueError)"""
+    line, record = entry
+    if not isinstance(line, str) or not (record is None or isinstance(record, dict)):
+        raise ValueError(f"geçersiz log kaydı: {entry!r}")
+    return line, record
+
+
+def sync_devices(monitor, payloads):
+    """Ajanın cihaz listesini koordinatörün atamasıyla eşitle"""
+    wanted = {data['id']: data for data in payloads}
+    kept = []
+    with monitor._cond:
+        for device in list(monitor.devices):
+            data = wanted.get(device.id)
+            config = None if data is None else {key: value for key, value in data.items()
+                                                 if key not in STATE_KEYS}
+            if config != device.to_config():
+                # Atanmamış ya da yapılandırması değişmiş cihaz
+                monitor.devices.remove(device.id)
+                monitor._entries.pop(device.id, None)
+            else:
+                wanted.pop(device.id)
+                kept.append(device.id)
+    _add_devices(monitor, wanted.values())
+    return len(wanted), len(kept)
+
+
+class Agent:
+    """Koordinatörün atadığı cihazları pingleyip sonuçları toplu gönderen ajan"""
+
+    def __init__(self, monitor, url, name, token=None, sync_interval=SYNC_INTERVAL):
+        self.monitor = monitor
+        self.url = url.rstrip('/') + SYNC_PATH
+        self.name = name
+        self.token = token
+        self.sync_interval = sync_interval
+        self.version = None
+        self.pending = collections.deque(maxlen=MAX_BUFFER)
+        self.pending_logs = collections.deque(maxlen=MAX_BUFFER)  # gönderilemeyen log kayıtları
+        self.connected = None
+        monitor.gui_callback = self.on_device_update
+        monitor.status_callback = self.on_status_update
+        monitor.stats_windows = ()  # istatistikler koordinatörde hesaplanır
+
+    def on_device_update(self, device):
+        self.pending.append(probe_delta(device))
+
+    def on_status_update(self, device):
+        self.pending.append(status_delta(device))
+
+    def post(self, batch, logs):
+        """Sonuçları ve logları koordinatöre gönder, yanıtını döndür"""
+        body = json.dumps({'agent': self.name, 'version': self.version,
+                           'results': batch, 'logs': logs}, separators=(',', ':')).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        if self.token:
+            request.add_header('X-Cluster-Token', self.token)
+        with urllib.request.urlopen(request, timeout=10) as reply:
+            return json.loads(reply.read())
+
+    def deliver(self, batch, logs):
+        """Sonuçları gönder; son başarılı yanıtı (hiçbiri kabul edilmezse None) döndür.
+
+        Koordinatörün reddettiği (400, 413) istek ikiye bölünerek yeniden
+        gönderilir; böylece hatalı sonuçlar ayıklanır ve tek başına reddedilen
+        parça atılır. Diğer 4xx yanıtlarında istek atılır. Ağ hatalarında ve
+        5xx yanıtlarında gönderilemeyen sonuçlar ve loglar kuyruğa geri konup
+        hata yükseltilir; bir sonraki denemede tekrar gönderilir.
+        """
+        response = None
+        parts = [(batch, logs)]
+        while parts:
+            part_batch, part_logs = parts.pop()
+            try:
+                response = self.post(part_batch, part_logs)
+            except urllib.error.HTTPError as e:
+                if not 400 <= e.code < 500 or e.code in (408, 429):
+                    self._requeue([(part_batch, part_logs)] + parts[::-1])
+                    raise
+                if e.code in (400, 413) and len(part_batch) + len(part_logs) > 1:
+                    middle = (len(part_batch) + len(part_logs)) // 2
+                    middle_logs = max(0, middle - len(part_batch))
+                    parts.append((part_batch[middle:], part_logs[middle_logs:]))
+                    parts.append((part_batch[:middle], part_logs[:middle_logs]))
+                elif part_batch or part_logs:
+                    self.monitor.log_message(f"Koordinatör isteği reddetti ({e.code} {e.reason}): "
+                                             f"{len(part_batch)} sonuç, {len(part_logs)} log atıldı",
+                                             LOG_CHANGE)
+            except (OSError, ValueError):
+                self._requeue([(part_batch, part_logs)] + parts[::-1])
+                raise
+        return response
+
+    def _requeue(self, parts):
+        """Gönderilemeyen sonuçları ve logları sıralarını koruyarak kuyruğun başına koy"""
+        for part_batch, part_logs in reversed(parts):
+            self.pending.extendleft(reversed(part_batch))
+            self.pending_logs.extendleft(reversed(part_logs))
+
+    def sync(self):
+        """Biriken sonuçları gönder, yanıttaki ayar ve atamaları uygula"""
+        monitor = self.monitor
+        batch = [self.pending.popleft() for _ in range(len(self.pending))]
+        logs, _ = monitor.drain_logs(records=True)
+        logs[:0] = [self.pending_logs.popleft() for _ in range(len(self.pending_logs))]
+        try:
+            response = self.deliver(batch, logs)
+        except (OSError, ValueError) as e:
+            if self.connected is not False:
+                monitor.log_message(f"Koordinatöre ulaşılamadı: {e}", LOG_CHANGE)
+            self.connected = False
+            return False
+        if response is None:
+            return False
+        if not self.connected:
+            monitor.log_message(f"Koordinatöre bağlanıldı: {self.url}", LOG_CHANGE)
+        self.connected = True
+
+        settings = response.get('settings', {})
+        interval = settings.pop('ping_interval', monitor.ping_interval)
+        for name, value in settings.items():
+            if name in AGENT_SETTINGS:
+                setattr(monitor, name, value)
+        if interval != monitor.ping_interval:
+            monitor.set_ping_interval(interval)
+        if 'devices' in response:
+            added, kept = sync_devices(monitor, response['devices'])
+            monitor.log_message(f"Atama güncellendi: {added + kept} cihaz ({added} yeni)", LOG_CHANGE)
+        self.version = response.get('version')
+        return True
+
+    def run(self, stop_event):
+        self.monitor.start_monitoring()
+        try:
+            while True:
+                self.sync()
+                if stop_event.wait(self.sync_interval):
+                    break
+        finally:
+            self.monitor.close()
+            if self.pending:
+                self.sync()
+
+
+def run_agent(args):
+    """Ajan modu: cihaz listesi koordinatörden gelir, sonuçlar ona gönderilir"""
+    monitor = PingMonitor(history_file=None, devices_file=None)
+    monitor.max_concurrency = args.concurrency
+    monitor.ping_backend = args.backend
+    monitor.log_level = LOG_LEVELS[args.log_level]
+    agent = Agent(monitor, args.agent, args.agent_name or socket.gethostname(), args.cluster_token)
+
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        stop_event.set()
+
+    for name in ('SIGINT', 'SIGTERM', 'SIGHUP'):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), handle_signal)
+
+    monitor.log_message(f"Ajan modu: {agent.name} -> {agent.url}")
+    try:
+        agent.run(stop_event)
+    except OSError as e:
+        monitor.log_message(f"İzleme başlatılamadı: {e}", LOG_CHANGE)
+        monitor.close()
+        return 1
+    return 0
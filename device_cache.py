@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Hızlı açılış için ikili cihaz listesi önbelleği ve akışlı JSON okuma
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+import tempfile
+
+CACHE_MAGIC = 'ping-monitor-cache'
+CACHE_VERSION = 1
+LENGTH = struct.Struct('<Q')  # başlık uzunluğu öneki
+READ_CHUNK = 1 << 20  # bayt, akışlı okumada bir seferde okunan miktar
+WHITESPACE = ' \t\r\n'  # JSON boşluk karakterleri
+
+
+def file_signature(path):
+    """Dosyanın (mtime_ns, boyut, blake2b özeti) imzası; dosya yoksa None"""
+    try:
+        with open(path, 'rb') as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+            stat = os.fstat(f.fileno())
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, digest
+
+
+def signature_matches(path, signature):
+    """Dosya imzadaki haliyle aynı mı; zaman değiştiyse içerik özeti karşılaştırılır"""
+    if path is None:
+        return signature is None
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return signature is None
+    if signature is None:
+        return False
+    if (stat.st_mtime_ns, stat.st_size) == tuple(signature[:2]):
+        return True
+    # Kopyalanan ya da yalnızca zamanı değişen (touch) dosya
+    current = file_signature(path)
+    return current is not None and current[1:] == tuple(signature[1:])
+
+
+def read_cache(path, devices_file, state_file):
+    """Önbellekteki cihaz satırlarını oku.
+
+    (satırlar, durum_geçerli) döndürür; önbellek yoksa, bozuksa, başka bir
+    Python sürümüyle yazıldıysa ya da cihaz dosyası o zamandan beri
+    değiştiyse (None, False). durum_geçerli False ise satırlardaki durum
+    alanları durum dosyasından yeniden okunmalıdır.
+    """
+    try:
+        with open(path, 'rb') as f:
+            # marshal.load dosyadan küçük parçalarla okur; baytları tek seferde alıp çöz
+            (length,) = LENGTH.unpack(f.read(LENGTH.size))
+            header = marshal.loads(f.read(length))
+            if (not isinstance(header, tuple) or len(header) != 6 or header[0] != CACHE_MAGIC
+                    or header[1] != CACHE_VERSION or header[2] != tuple(sys.version_info[:2])):
+                return None, False
+            if not signature_matches(devices_file, header[3]):
+                return None, False
+            state_valid = signature_matches(state_file, header[4])
+            rows = marshal.loads(f.read())
+            if not isinstance(rows, list) or len(rows) != header[5]:
+                return None, False
+    except (OSError, EOFError, ValueError, TypeError, struct.error):
+        return None, False
+    return rows, state_valid
+
+
+def write_cache(path, rows, devices_signature, state_signature):
+    """Cihaz satırlarını, kaynak dosyaların imzalarıyla birlikte atomik olarak yaz"""
+    header = (CACHE_MAGIC, CACHE_VERSION, tuple(sys.version_info[:2]),
+              devices_signature, state_signature, len(rows))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+    try:
+        header = marshal.dumps(header)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(LENGTH.pack(len(header)))
+            f.write(header)
+            f.write(marshal.dumps(rows))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def iter_json_array(f, chunk_size=READ_CHUNK):
+    """Bir JSON dizisinin öğelerini dosyanın tamamını belleğe almadan tek tek üret.
+
+    Öğelerin nesne ya da dizi olduğu varsayılır (kapanış parantezi öğenin
+    bittiğini gösterir). Dosya geçerli bir JSON dizisi değilse (eksik ya da
+    fazla virgül, yarım kalan dosya, sondaki fazladan veri) ValueError
+    fırlatır; hata son öğe üretildikten sonra da gelebilir, çağıran öğeleri
+    ancak üreteç bitince kesinleştirmelidir.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def skip(chars):
+        # Boşlukları atla; gerekirse yeni parça oku
+        nonlocal buffer, pos, eof
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = chunk, 0
+
+    skip(WHITESPACE)
+    if buffer[pos:pos + 1] != '[':
+        raise ValueError("JSON dizisi bekleniyordu")
+    pos += 1
+    skip(WHITESPACE)
+    if buffer[pos:pos + 1] == ']':
+        pos += 1
+    else:
+        while True:
+            skip(WHITESPACE)
+            if pos >= len(buffer):
+                raise ValueError("JSON dizisi beklenmedik şekilde bitti")
+            if buffer[pos] in ',]':
+                raise ValueError(f"JSON dizisinde öğe bekleniyordu: {buffer[pos]!r}")
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                # Öğe parçanın sonunda bölünmüş; kalanıyla birleştirip yeniden dene
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            pos = end
+            yield item
+            skip(WHITESPACE)
+            separator = buffer[pos:pos + 1]
+            pos += 1
+            if separator == ']':
+                break
+            if separator != ',':
+                raise ValueError("JSON dizisi beklenmedik şekilde bitti" if not separator
+                                 else f"JSON dizisinde ',' ya da ']' bekleniyordu: {separator!r}")
+    skip(WHITESPACE)
+    if pos < len(buffer):
+        raise ValueError("JSON dizisinden sonra fazladan veri var")
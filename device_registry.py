@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - İndeksli cihaz kayıt defteri ve toplu cihaz içe aktarma
+"""
+
+import csv
+import functools
+import gc
+import ipaddress
+import json
+import operator
+import os
+import re
+import uuid
+from datetime import datetime
+
+# Durum kodları; dosyalarda ve API'de adlarıyla (STATUS_NAMES) yazılır
+STATUS_UNKNOWN = 0
+STATUS_ONLINE = 1
+STATUS_OFFLINE = 2
+STATUS_UNREACHABLE = 3  # üst cihaz çevrimdışı olduğu için pinglenmiyor
+STATUS_NAMES = ('unknown', 'online', 'offline', 'unreachable')
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+# Cihaz kayıtlarındaki çalışma zamanı alanları; devices.json yerine durum dosyasına yazılır
+STATE_KEYS = ('status', 'last_check', 'last_status_change', 'last_rtt')
+
+# Tek seferde içe aktarılabilecek en fazla adres (yanlışlıkla /8 girilmesine karşı)
+MAX_IMPORT_HOSTS = 1 << 20
+
+# RFC 1123 ana bilgisayar adı etiketi (iç ağlarda sık görülen "_" de kabul edilir)
+HOSTNAME_LABEL = re.compile(r'(?!-)[a-z0-9_-]{1,63}(?<!-)')
+
+
+def new_device_id():
+    """Yeni, kararlı bir cihaz kimliği üret"""
+    return uuid.uuid4().hex[:12]
+
+
+def normalize_host(value):
+    """Hedefi tek biçime getir: IPv6 köşeli parantezleri atılır, IP adresleri
+    kısa biçimde, ana bilgisayar adları küçük harfle ve sondaki nokta olmadan yazılır"""
+    value = value.strip()
+    if value.startswith('[') and value.endswith(']'):
+        value = value[1:-1]
+    try:
+        return str(ipaddress.ip_address(value))
+    except ValueError:
+        return value.lower().rstrip('.')
+
+
+def valid_host(value):
+    """IPv4/IPv6 adresi ya da geçerli bir ana bilgisayar (DNS) adı mı"""
+    host = normalize_host(value)
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        pass
+    try:
+        host = host.encode('idna').decode('ascii')  # uluslararası alan adları
+    except UnicodeError:
+        return False
+    labels = host.split('.')
+    if not host or len(host) > 253 or labels[-1].isdigit():
+        return False  # son etiketi sayı olan ad geçersiz bir IPv4 adresidir
+    return all(HOSTNAME_LABEL.fullmatch(label) for label in labels)
+
+
+def parse_parents(value):
+    """Üst cihaz listesi: JSON listesi ya da (CSV'deki gibi) virgülle ayrılmış metin"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    parents = [str(reference).strip() for reference in value if str(reference).strip()]
+    return parents or None
+
+
+def parse_timestamp(value):
+    """Epoch saniyesi ya da (eski dosyalardaki) ISO metni -> epoch float"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _clock_text(second):
+    return datetime.fromtimestamp(second).strftime("%H:%M:%S")
+
+
+def format_clock(timestamp):
+    """Epoch zamanını tablo için "SS:DD:ss" metnine çevir.
+
+    Bir ping aralığındaki kontroller birkaç yüz farklı saniyeye düştüğünden
+    metinler saniye başına önbelleğe alınır; cihaz başına metin saklanmaz.
+    """
+    return _clock_text(int(timestamp))
+
+
+class Device:
+    """Tek bir izlenen cihaz: yapılandırma ve çalışma zamanı durumu.
+
+    Çok büyük listelerde bellek için __slots__ kullanılır; zamanlar epoch float,
+    durum küçük bir tamsayı koddur. Metne çevirme yalnızca gösterim sırasında
+    yapılır (bkz. format_clock).
+    """
+
+    __slots__ = ('id', 'name', 'ip', 'type', 'port', 'interval', 'timeout', 'jitter', 'parents', 'extra',
+                 'status', 'last_check', 'last_status_change', 'last_rtt', 'stats',
+                 'recent_failures', 'success_streak')
+
+    # devices.json'a yazılan alanlar (None olanlar yazılmaz)
+    CONFIG_FIELDS = ('id', 'name', 'ip', 'type', 'port', 'interval', 'timeout', 'jitter', 'parents')
+    # İkili önbellekteki satırların alanları (yapılandırma ve son durum)
+    ROW_FIELDS = CONFIG_FIELDS + ('extra', 'status', 'last_check', 'last_status_change', 'last_rtt')
+
+    def __init__(self, name, ip, id=None, type=None, port=None, interval=None, timeout=None,
+                 jitter=None, parents=None, extra=None):
+        self.id = id
+        self.name = name
+        self.ip = ip
+        self.type = type  # kontrol tipi: None/'icmp', 'tcp', 'http', 'https', 'dns'
+        self.port = int(port) if port not in (None, '') else None
+        self.interval = interval
+        self.timeout = timeout
+        self.jitter = jitter
+        self.parents = parse_parents(parents)  # bağlı olduğu üst cihazlar (kimlik, IP ya da ad)
+        self.extra = extra or None  # tanınmayan yapılandırma alanları, olduğu gibi saklanır
+        self.status = STATUS_UNKNOWN
+        self.last_check = None
+        self.last_status_change = None
+        self.last_rtt = None
+        self.stats = None  # RollingLatency kayıtları, ilk pingte oluşturulur
+        self.recent_failures = 0  # son pinglerin başarısızlık bit maskesi (bit 0 en yeni)
+        self.success_streak = 0   # art arda başarılı ping sayısı
+
+    @property
+    def target(self):
+        """Kontrol edilen hedef: ICMP için IP, servis kontrolleri için tip ve adres.
+
+        Kayıt defterinde aynı hedefin iki kez eklenmesini önlemek için de kullanılır.
+        """
+        if not self.type or self.type == 'icmp':
+            return self.ip
+        extra = self.extra or {}
+        if self.type in ('http', 'https'):
+            port = f':{self.port}' if self.port else ''
+            return extra.get('url') or f"{self.type}://{self.ip}{port}/"
+        if self.type == 'dns':
+            return f"dns {self.ip} {extra.get('query', '.')} {extra.get('record', 'A')}"
+        return f"{self.type} {self.ip}:{self.port}"
+
+    @classmethod
+    def from_dict(cls, data):
+        """JSON/CSV sözlüğünden cihaz oluştur (eski dosyalardaki durum alanları dahil)"""
+        config = {key: data.get(key) for key in cls.CONFIG_FIELDS}
+        keys = data.keys()
+        extra = None
+        if not keys <= KNOWN_KEYS:  # büyük listelerde çoğu kayıtta ek alan yoktur
+            extra = {key: value for key, value in data.items() if key not in KNOWN_KEYS}
+        config['name'] = config['name'] or data['ip']
+        device = cls(extra=extra, **config)
+        if not keys.isdisjoint(STATE_KEYS):
+            device.apply_state(data)
+        return device
+
+    @classmethod
+    def from_row(cls, row):
+        """Önbellek satırından (ROW_FIELDS sırasıyla) doğrulama yapmadan cihaz oluştur"""
+        device = cls.__new__(cls)
+        (device.id, device.name, device.ip, device.type, device.port, device.interval, device.timeout,
+         device.jitter, device.parents, device.extra, device.status, device.last_check,
+         device.last_status_change, device.last_rtt) = row
+        device.stats = None
+        device.recent_failures = 0
+        device.success_streak = 0
+        return device
+
+    def to_config(self):
+        """devices.json'a yazılacak yapılandırma sözlüğü"""
+        config = {key: getattr(self, key) for key in self.CONFIG_FIELDS
+                  if getattr(self, key) is not None}
+        if self.extra:
+            config.update(self.extra)
+        return config
+
+    def to_row(self):
+        """İkili önbelleğe yazılacak satır (ROW_FIELDS sırasıyla demet)"""
+        return _row_getter(self)
+
+    def to_state(self):
+        """Durum dosyasına yazılacak sözlük"""
+        return {'status': STATUS_NAMES[self.status], 'last_check': self.last_check,
+                'last_status_change': self.last_status_change, 'last_rtt': self.last_rtt}
+
+    def apply_state(self, state):
+        """Durum dosyasından (ya da eski devices.json alanlarından) durumu yükle"""
+        if 'status' in state:
+            self.status = STATUS_CODES.get(state['status'], STATUS_UNKNOWN)
+        if 'last_check' in state:
+            self.last_check = parse_timestamp(state['last_check'])
+        if 'last_status_change' in state:
+            self.last_status_change = parse_timestamp(state['last_status_change'])
+        if state.get('last_rtt') is not None:
+            self.last_rtt = float(state['last_rtt'])
+
+
+_row_getter = operator.attrgetter(*Device.ROW_FIELDS)
+KNOWN_KEYS = frozenset(Device.CONFIG_FIELDS + STATE_KEYS)
+
+
+class DeviceRegistry:
+    """Cihazları kimlik ve hedefe (ICMP için IP adresi) göre indeksler.
+
+    Ekleme sırasını korur; kimlik ve hedefle arama, güncelleme ve silme O(1)'dir.
+    Üzerinde dolaşmak Device kayıtlarını ekleme sırasıyla verir. Her ekleme,
+    silme ve güncellemede generation artar; türetilen yapılar (ör. bağımlılık
+    grafiği) eskiyip eskimediklerini buna bakarak anlar.
+    """
+
+    def __init__(self, devices=()):
+        self._by_id = {}
+        self._by_target = {}
+        self.generation = 0
+        for device in devices:
+            self.add(device)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Önbellek satırlarından kayıt defteri kur; satırlar kayıtlı bir defterden
+        geldiği için kimlik ve hedef tekrarı denetlenmez"""
+        registry = cls()
+        by_id = registry._by_id
+        by_target = registry._by_target
+        from_row = Device.from_row
+        # Yeni kayıtlar döngü oluşturmaz; toplu oluşturmada çöp toplayıcıyı beklemeyelim
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for row in rows:
+                device = from_row(row)
+                by_id[device.id] = device
+                by_target[device.target] = device
+        finally:
+            if gc_enabled:
+                gc.enable()
+        registry.generation = 1
+        return registry
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, device_id):
+        return device_id in self._by_id
+
+    def get(self, device_id):
+        """Kimliğe göre cihazı döndür"""
+        return self._by_id.get(device_id)
+
+    def find_target(self, target):
+        """Hedefe (ICMP cihazları için IP adresi) göre cihazı döndür"""
+        return self._by_target.get(target)
+
+    def ids(self):
+        """Cihaz kimliklerini ekleme sırasıyla döndür"""
+        return list(self._by_id)
+
+    def add(self, device):
+        """Cihazı ekle; aynı hedef zaten kayıtlıysa eklemeden False döndür"""
+        target = device.target
+        if target in self._by_target:
+            return False
+        device_id = device.id
+        while not device_id or device_id in self._by_id:
+            device_id = new_device_id()
+        device.id = device_id
+        self._by_id[device_id] = device
+        self._by_target[target] = device
+        self.generation += 1
+        return True
+
+    def remove(self, device_id):
+        """Cihazı sil ve döndür (yoksa None)"""
+        device = self._by_id.pop(device_id, None)
+        if device is not None:
+            self._by_target.pop(device.target, None)
+            self.generation += 1
+        return device
+
+    def update(self, device_id, **fields):
+        """Cihaz alanlarını güncelle; hedef değişirse indeksi de güncelle"""
+        device = self._by_id[device_id]
+        old_target = device.target
+        old_values = {key: getattr(device, key) for key in fields}
+        for key, value in fields.items():
+            setattr(device, key, value)
+        new_target = device.target
+        if new_target != old_target:
+            if new_target in self._by_target:
+                for key, value in old_values.items():
+                    setattr(device, key, value)
+                raise ValueError(f"{new_target} zaten kayıtlı")
+            del self._by_target[old_target]
+            self._by_target[new_target] = device
+        self.generation += 1
+        return device
+
+
+def expand_targets(spec):
+    """CIDR ("10.0.0.0/24"), aralık ("10.0.0.1-10.0.0.50", "10.0.0.1-50"), tek
+    adres ya da ana bilgisayar adı ifadesini hedef listesine aç"""
+    spec = spec.strip()
+    if '/' in spec:
+        network = ipaddress.ip_network(spec, strict=False)
+        if network.num_addresses > MAX_IMPORT_HOSTS:
+            raise ValueError(f"{spec} çok büyük ({network.num_addresses} adres)")
+        if network.num_addresses == 1:
+            return [str(network.network_address)]
+        return [str(host) for host in network.hosts()]
+
+    start = None
+    if '-' in spec:
+        start_text, end_text = (part.strip() for part in spec.split('-', 1))
+        try:
+            start = ipaddress.ip_address(start_text)
+        except ValueError:
+            pass  # "sunucu-1.lan" gibi tire içeren ana bilgisayar adı
+    if start is not None:
+        if '.' not in end_text and ':' not in end_text:
+            # "10.0.0.1-50" kısaltması: son okteti değiştir
+            end_text = start_text.rsplit('.', 1)[0] + '.' + end_text
+        end = ipaddress.ip_address(end_text)
+        if end.version != start.version or int(end) < int(start):
+            raise ValueError(f"Geçersiz aralık: {spec}")
+        count = int(end) - int(start) + 1
+        if count > MAX_IMPORT_HOSTS:
+            raise ValueError(f"{spec} çok büyük ({count} adres)")
+        address_class = type(start)
+        first = int(start)
+        return [str(address_class(first + offset)) for offset in range(count)]
+
+    if not valid_host(spec):
+        raise ValueError(f"Geçersiz hedef: {spec}")
+    return [normalize_host(spec)]
+
+
+def read_device_file(path):
+    """CSV (name, ip, ... başlıklı) ya da JSON (cihaz listesi) dosyasından cihazları oku.
+
+    CSV/JSON satırlarındaki "ip" alanı ana bilgisayar adı, CIDR veya aralık da olabilir.
+    """
+    if os.path.splitext(path)[1].lower() == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+    else:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            rows = [{key.strip().lower(): (value or '').strip() for key, value in row.items() if key}
+                    for row in csv.DictReader(f, dialect=dialect)]
+
+    devices = []
+    for row in rows:
+        target = row.get('ip')
+        if not target:
+            continue
+        options = {key: value for key, value in row.items()
+                   if key not in ('ip', 'name', 'id') and key not in STATE_KEYS
+                   and value not in ('', None)}
+        for key in ('interval', 'timeout', 'jitter'):
+            if isinstance(options.get(key), str):
+                options[key] = float(options[key])
+        if isinstance(options.get('port'), str):
+            options['port'] = int(options['port'])
+        addresses = expand_targets(target)
+        for ip in addresses:
+            name = row.get('name') or ip
+            if len(addresses) > 1:
+                name = f"{name} {ip}" if row.get('name') else ip
+            devices.append(dict(options, name=name, ip=ip))
+    return devices
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Arka planda toplu yazan konsol ve JSON-lines olay günlüğü
+"""
+
+import collections
+import glob
+import gzip
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+
+FLUSH_INTERVAL = 0.25       # saniye, biriken satırların en geç yazılma süresi
+BATCH_SIZE = 1000           # bu kadar satır birikince beklemeden yazılır
+MAX_QUEUE = 100000          # yazılmayı bekleyen en fazla satır (fazlası atılır)
+MAX_BYTES = 50 * 1024 ** 2  # bayt, dosya bu boyuta ulaşınca döndürülür
+ROTATE_INTERVAL = 86400     # saniye, dosya en fazla bu kadar süre kullanılır
+BACKUPS = 14                # saklanacak eski dosya sayısı
+CLOSE_TIMEOUT = 5           # saniye, kapanırken yazıcıyı bekleme süresi
+
+# Log seviyeleri: durum değişiklikleri seviyeden bağımsız her zaman tutulur
+LOG_DEBUG = 10    # her ping için "ping atılıyor" satırları
+LOG_INFO = 20     # ping sonuçları ve genel mesajlar
+LOG_CHANGE = 30   # durum değişiklikleri
+LOG_LEVELS = {'debug': LOG_DEBUG, 'info': LOG_INFO, 'change': LOG_CHANGE}
+LOG_LEVEL_NAMES = {level: name for name, level in LOG_LEVELS.items()}
+
+
+class LogWriter:
+    """Log satırlarını çağıran thread'i bekletmeden yazan arka plan yazıcısı.
+
+    write() yalnızca kuyruğa ekler; yazıcı thread'i biriken satırları toplu
+    olarak konsola (stream) ve path verilmişse JSON-lines dosyasına yazar.
+    Dosya max_bytes boyutuna ya da rotate_interval yaşına ulaşınca
+    "ad-YYYYmmdd-HHMMSS.jsonl" olarak kenara alınır, ayrı bir thread'de
+    gzip ile sıkıştırılır ve en yeni backups dosya dışındakiler silinir.
+    Kuyruk dolarsa yeni satırlar atılır ve dropped sayacı artar.
+    """
+
+    def __init__(self, path=None, stream=None, max_bytes=MAX_BYTES,
+                 rotate_interval=ROTATE_INTERVAL, backups=BACKUPS, compress=True):
+        self.path = path
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backups = backups
+        self.compress = compress
+        self.dropped = 0
+        self._queue = collections.deque()  # (konsol satırı ya da None, kayıt ya da None)
+        self._wake = threading.Event()
+        self._closed = False
+        self._file = None
+        self._size = 0
+        self._opened = None  # dosyadaki ilk kaydın zamanı (epoch)
+        self._compressor = None
+        if path:
+            self._open()  # açılamazsa hata çağırana OSError olarak döner
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, text=None, record=None):
+        """Konsol satırını ve/veya dosya kaydını kuyruğa ekle"""
+        if len(self._queue) >= MAX_QUEUE:
+            self.dropped += 1
+            return
+        self._queue.append((text if self.stream else None, record if self.path else None))
+        if len(self._queue) >= BATCH_SIZE:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            closed = self._closed
+            queue = self._queue
+            batch = [queue.popleft() for _ in range(len(queue))]
+            if batch:
+                self._write_batch(batch)
+            if closed and not queue:
+                break
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_batch(self, batch):
+        if self.stream is not None:
+            lines = [text for text, _ in batch if text is not None]
+            if lines:
+                try:
+                    self.stream.write('\n'.join(lines) + '\n')
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    pass  # kapanmış ya da yazılamayan konsol
+        if self.path is None:
+            return
+        lines = [json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str)
+                 for _, record in batch if record is not None]
+        if not lines:
+            return
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        try:
+            self._maybe_rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+        except OSError as e:
+            self.dropped += len(lines)
+            print(f"Olay günlüğü yazılamadı ({self.path}): {e}", file=sys.stderr)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self):
+        """Günlük dosyasını ekleme kipinde aç; süre hesabı için ilk kaydın zamanını oku"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'ab')
+        self._size = self._file.tell()
+        self._opened = None
+        if self._size:
+            try:
+                with open(self.path, 'rb') as f:
+                    self._opened = float(json.loads(f.readline())['ts'])
+            except (OSError, ValueError, KeyError, TypeError):
+                self._opened = time.time()
+
+    def _maybe_rotate(self):
+        if self._file is None:
+            self._open()
+        now = time.time()
+        if self._opened is None:
+            self._opened = now
+            return
+        if self._size < self.max_bytes and now - self._opened < self.rotate_interval:
+            return
+        self._file.close()
+        self._file = None
+        base, ext = os.path.splitext(self.path)
+        stamp = datetime.fromtimestamp(self._opened).strftime('%Y%m%d-%H%M%S')
+        rotated = f'{base}-{stamp}{ext}'
+        suffix = 1
+        while os.path.exists(rotated) or os.path.exists(rotated + '.gz'):
+            rotated = f'{base}-{stamp}-{suffix}{ext}'
+            suffix += 1
+        os.replace(self.path, rotated)
+        self._open()
+        self._opened = now
+        # Sıkıştırma yazmayı bekletmesin; bir öncekinin bitmesi beklenir
+        if self._compressor is not None:
+            self._compressor.join()
+        self._compressor = threading.Thread(target=self._compress, args=(rotated,),
+                                            name='log-compress', daemon=True)
+        self._compressor.start()
+
+    def _compress(self, rotated):
+        """Döndürülen dosyayı sıkıştır ve fazla eski dosyaları sil"""
+        if self.compress:
+            try:
+                with open(rotated, 'rb') as source, gzip.open(rotated + '.gz', 'wb') as target:
+                    shutil.copyfileobj(source, target, 1024 * 1024)
+                os.remove(rotated)
+            except OSError as e:
+                print(f"Olay günlüğü sıkıştırılamadı ({rotated}): {e}", file=sys.stderr)
+        self.prune()
+
+    def segments(self):
+        """Eski (döndürülmüş) günlük dosyaları, eskiden yeniye"""
+        base, ext = os.path.splitext(self.path)
+        pattern = glob.escape(base) + '-[0-9]*' + glob.escape(ext)
+        return sorted(set(glob.glob(pattern) + glob.glob(pattern + '.gz')), key=self._mtime)
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0
+
+    def prune(self):
+        """En yeni backups dosya dışındaki eski günlükleri sil"""
+        segments = self.segments()
+        for path in segments[:max(0, len(segments) - self.backups)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self):
+        """Kuyruktaki satırları yaz, dosyayı kapat"""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(CLOSE_TIMEOUT)
+        if self._compressor is not None:
+            self._compressor.join(CLOSE_TIMEOUT)
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Ping sonuçlarının kalıcı geçmişi (SQLite, WAL modu)
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+
+_STOP = object()
+
+MAX_ATTEMPTS = 3     # bir toplu yazma bu kadar denemede başarısız olursa atılır
+RETRY_INTERVAL = 5   # saniye, veritabanı açılamazsa yeniden deneme aralığı
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    device TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    rtt REAL
+);
+CREATE INDEX IF NOT EXISTS probes_ts ON probes(ts);
+CREATE TABLE IF NOT EXISTS rollup_1m (
+    bucket INTEGER NOT NULL,
+    device TEXT NOT NULL,
+    probes INTEGER NOT NULL,
+    ok INTEGER NOT NULL,
+    rtt_sum REAL,
+    rtt_min REAL,
+    rtt_max REAL,
+    PRIMARY KEY (bucket, device)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_1h (
+    bucket INTEGER NOT NULL,
+    device TEXT NOT NULL,
+    probes INTEGER NOT NULL,
+    ok INTEGER NOT NULL,
+    rtt_sum REAL,
+    rtt_min REAL,
+    rtt_max REAL,
+    PRIMARY KEY (bucket, device)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS latency_1h (
+    bucket INTEGER NOT NULL,
+    device TEXT NOT NULL,
+    bin INTEGER NOT NULL,
+    probes INTEGER NOT NULL,
+    PRIMARY KEY (bucket, device, bin)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+INSERT_SQL = 'INSERT INTO probes (ts, device, ok, rtt) VALUES (?, ?, ?, ?)'
+
+# Ham kayıtlardan dakikalık özete (artan satır id aralığına göre)
+ROLLUP_1M_SQL = """
+INSERT INTO rollup_1m (bucket, device, probes, ok, rtt_sum, rtt_min, rtt_max)
+SELECT CAST(ts / 60 AS INTEGER) * 60, device, COUNT(*), SUM(ok), SUM(rtt), MIN(rtt), MAX(rtt)
+FROM probes WHERE id > ? AND id <= ?
+GROUP BY 1, device
+ON CONFLICT(bucket, device) DO UPDATE SET
+    probes = probes + excluded.probes,
+    ok = ok + excluded.ok,
+    rtt_sum = COALESCE(rtt_sum, 0) + COALESCE(excluded.rtt_sum, 0),
+    rtt_min = MIN(COALESCE(rtt_min, excluded.rtt_min), COALESCE(excluded.rtt_min, rtt_min)),
+    rtt_max = MAX(COALESCE(rtt_max, excluded.rtt_max), COALESCE(excluded.rtt_max, rtt_max))
+"""
+
+# Gecikme histogram dilimi: 1 ms altında 0,01 ms, sonraki her onlukta iki anlamlı
+# basamak (1-10 ms: 0,1 ms; 10-100 ms: 1 ms; ...); göreli hata en fazla %10
+LATENCY_BIN_SQL = """CASE
+    WHEN {rtt} < 1 THEN CAST({rtt} * 100 AS INTEGER)
+    WHEN {rtt} < 10 THEN 90 + CAST({rtt} * 10 AS INTEGER)
+    WHEN {rtt} < 100 THEN 180 + CAST({rtt} AS INTEGER)
+    WHEN {rtt} < 1000 THEN 270 + CAST({rtt} / 10 AS INTEGER)
+    ELSE 360 + CAST({rtt} / 100 AS INTEGER)
+END"""
+
+# Ham kayıtlardan saatlik gecikme histogramına (dakikalık özetle aynı satır aralığı)
+ROLLUP_LATENCY_SQL = f"""
+INSERT INTO latency_1h (bucket, device, bin, probes)
+SELECT CAST(ts / 3600 AS INTEGER) * 3600, device, {LATENCY_BIN_SQL.format(rtt='rtt')}, COUNT(*)
+FROM probes WHERE id > ? AND id <= ? AND rtt IS NOT NULL
+GROUP BY 1, device, 3
+ON CONFLICT(bucket, device, bin) DO UPDATE SET probes = probes + excluded.probes
+"""
+
+# Tamamlanmış dakikalardan saatlik özete
+ROLLUP_1H_SQL = """
+INSERT INTO rollup_1h (bucket, device, probes, ok, rtt_sum, rtt_min, rtt_max)
+SELECT (bucket / 3600) * 3600, device, SUM(probes), SUM(ok), SUM(rtt_sum), MIN(rtt_min), MAX(rtt_max)
+FROM rollup_1m WHERE bucket >= ? AND bucket < ?
+GROUP BY 1, device
+ON CONFLICT(bucket, device) DO UPDATE SET
+    probes = probes + excluded.probes,
+    ok = ok + excluded.ok,
+    rtt_sum = COALESCE(rtt_sum, 0) + COALESCE(excluded.rtt_sum, 0),
+    rtt_min = MIN(COALESCE(rtt_min, excluded.rtt_min), COALESCE(excluded.rtt_min, rtt_min)),
+    rtt_max = MAX(COALESCE(rtt_max, excluded.rtt_max), COALESCE(excluded.rtt_max, rtt_max))
+"""
+
+
+def latency_bin_bounds(index):
+    """Histogram diliminin (LATENCY_BIN_SQL) ms cinsinden alt ve üst sınırı"""
+    if index < 100:
+        return index / 100, (index + 1) / 100
+    decade = min((index - 10) // 90, 4)
+    step = 10.0 ** (decade - 2)
+    low = (index - 90 * decade) * step
+    return low, low + step
+
+
+class HistoryStore:
+    """Ping sonuçlarını arka plan thread'inde toplu olarak SQLite'a yazar.
+
+    Ham kayıtlar dakikalık ve saatlik özetlere, gecikmeler saatlik histograma
+    aktarılır; her katman kendi saklama süresinden eski kayıtları siler, böylece
+    disk kullanımı sınırlı kalır. Veritabanı hataları log ile bildirilir ve
+    writer çalışmaya devam eder: başarısız toplu yazma MAX_ATTEMPTS kez
+    denenip atılır, özetleme bir sonraki aralıkta yeniden denenir.
+    """
+
+    def __init__(self, path='history.db', batch_size=500, flush_interval=2.0,
+                 rollup_interval=60, raw_retention_days=2, minute_retention_days=30,
+                 hour_retention_days=400, max_pending=100000, log=None):
+        self.path = path
+        self.log = log  # log(mesaj) ile veritabanı hataları bildirilir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rollup_interval = rollup_interval
+        self.raw_retention = raw_retention_days * 86400
+        self.minute_retention = minute_retention_days * 86400
+        self.hour_retention = hour_retention_days * 86400
+        self.dropped = 0  # kuyruk dolduğu ya da yazma başarısız olduğu için kaybolan kayıt sayısı
+        self._last_error = None
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name='history-writer', daemon=True)
+        self._thread.start()
+
+    def record(self, ts, device, rtt):
+        """Bir ping sonucunu yazma kuyruğuna ekle (rtt None ise başarısız)"""
+        try:
+            self._queue.put_nowait((ts, device, 0 if rtt is None else 1, rtt))
+        except queue.Full:
+            self.dropped += 1
+
+    def rename_devices(self, mapping):
+        """Geçmişteki cihaz anahtarlarını değiştir (eski anahtar -> yeni anahtar)"""
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute('CREATE TEMP TABLE renames (old TEXT PRIMARY KEY, new TEXT NOT NULL)')
+                conn.executemany('INSERT INTO renames VALUES (?, ?)', mapping.items())
+                for table in ('probes', 'rollup_1m', 'rollup_1h', 'latency_1h'):
+                    conn.execute(f'UPDATE {table} SET device = (SELECT new FROM renames WHERE old = device) '
+                                 f'WHERE device IN (SELECT old FROM renames)')
+        finally:
+            conn.close()
+
+    def close(self, timeout=10):
+        """Bekleyen kayıtları yazıp writer thread'ini durdur"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def connect(self):
+        """Veritabanı bağlantısı aç ve şemayı hazırla"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _report(self, error):
+        """Veritabanı hatasını bildir; aynı hata art arda tekrarlanmaz"""
+        message = f"Geçmiş veritabanı hatası: {error}"
+        if message == self._last_error:
+            return
+        self._last_error = message
+        if self.log:
+            self.log(message)
+        else:
+            print(message)
+
+    def _run(self):
+        """Writer döngüsü: kayıtları topla, toplu yaz, periyodik özetle"""
+        conn = None
+        last_connect = None
+        batch = []
+        attempts = 0
+        last_flush = time.monotonic()
+        last_rollup = 0.0
+        stopping = False
+        try:
+            while not stopping:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                    while item is not _STOP:
+                        batch.append(item)
+                        if len(batch) >= self.batch_size:
+                            break
+                        item = self._queue.get_nowait()
+                    stopping = item is _STOP
+                except queue.Empty:
+                    pass
+
+                now = time.monotonic()
+                if conn is None and (stopping or last_connect is None
+                                     or now - last_connect >= RETRY_INTERVAL):
+                    last_connect = now
+                    try:
+                        conn = self.connect()
+                    except sqlite3.Error as e:
+                        self._report(e)
+                if conn is None:
+                    if len(batch) >= self._queue.maxsize:
+                        # Veritabanı açılamadığı sürece bellek sınırsız büyümesin
+                        self.dropped += len(batch)
+                        batch = []
+                    continue
+
+                if batch and (stopping or now - last_flush >= self.flush_interval
+                              or len(batch) >= self.batch_size and not attempts):
+                    try:
+                        with conn:
+                            conn.executemany(INSERT_SQL, batch)
+                    except sqlite3.IntegrityError as e:
+                        # Hatalı kayıt: geçerli olanlar tek tek yazılır, hatalılar atılır
+                        self._report(e)
+                        for row in batch:
+                            try:
+                                with conn:
+                                    conn.execute(INSERT_SQL, row)
+                            except sqlite3.Error:
+                                self.dropped += 1
+                        batch = []
+                        attempts = 0
+                        last_flush = now
+                    except sqlite3.Error as e:
+                        # Bir sonraki deneme flush_interval sonra; olmazsa kayıtlar atılır
+                        self._report(e)
+                        attempts += 1
+                        last_flush = now
+                        if attempts >= MAX_ATTEMPTS:
+                            self.dropped += len(batch)
+                            batch = []
+                            attempts = 0
+                    else:
+                        self._last_error = None
+                        batch = []
+                        attempts = 0
+                        last_flush = now
+
+                if stopping or now - last_rollup >= self.rollup_interval:
+                    last_rollup = now
+                    try:
+                        self.rollup(conn)
+                    except sqlite3.Error as e:
+                        self._report(e)
+        finally:
+            self.dropped += len(batch)
+            if conn is not None:
+                conn.close()
+
+    def _get_meta(self, conn, key, default=0):
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, conn, key, value):
+        conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def rollup(self, conn):
+        """Yeni ham kayıtları özetlere aktar ve saklama süresi dolanları sil"""
+        now = time.time()
+        with conn:
+            # Ham kayıtlar -> dakikalık özet (yalnızca henüz aktarılmamış satırlar)
+            done_rowid = int(self._get_meta(conn, 'rollup_1m_rowid'))
+            last_rowid = conn.execute('SELECT MAX(id) FROM probes').fetchone()[0] or 0
+            done_minute = int(self._get_meta(conn, 'rollup_1h_bucket'))
+            late_hours = []
+            if last_rowid > done_rowid:
+                conn.execute(ROLLUP_1M_SQL, (done_rowid, last_rowid))
+                conn.execute(ROLLUP_LATENCY_SQL, (done_rowid, last_rowid))
+                self._set_meta(conn, 'rollup_1m_rowid', last_rowid)
+                if done_minute:
+                    # Saatlik özete aktarılmış dakikalara düşen geç kayıtlar (ör. ajanın
+                    # sonradan gönderdiği sonuçlar); bu saatler yeniden özetlenir
+                    late_hours = [row[0] for row in conn.execute(
+                        'SELECT DISTINCT CAST(ts / 3600 AS INTEGER) * 3600 FROM probes '
+                        'WHERE id > ? AND id <= ? AND ts < ?', (done_rowid, last_rowid, done_minute))]
+
+            # Tamamlanmış dakikalar -> saatlik özet. Bir dakikalık pay bırakılır ki
+            # geç yazılan ham kayıtların çoğu saatlik özete aktarılmış dakikaya düşmesin
+            if not done_minute:
+                row = conn.execute('SELECT MIN(bucket) FROM rollup_1m').fetchone()
+                done_minute = row[0] or 0
+            closed_minute = int(now // 60) * 60 - 60
+            if done_minute and closed_minute > done_minute:
+                conn.execute(ROLLUP_1H_SQL, (done_minute, closed_minute))
+                self._set_meta(conn, 'rollup_1h_bucket', closed_minute)
+                done_minute = closed_minute
+
+            # Geç kayıt alan saatler dakikalık özetten baştan hesaplanır; dakikalık
+            # özetin saklama süresini aşan saatler eksik kalacağı için atlanır
+            oldest_hour = int((now - self.minute_retention) // 3600 + 1) * 3600
+            for hour in late_hours:
+                if hour < oldest_hour:
+                    continue
+                conn.execute('DELETE FROM rollup_1h WHERE bucket = ?', (hour,))
+                conn.execute(ROLLUP_1H_SQL, (hour, min(hour + 3600, done_minute)))
+
+            # Saklama süreleri
+            conn.execute('DELETE FROM probes WHERE ts < ? AND id <= ?',
+                         (now - self.raw_retention, last_rowid))
+            conn.execute('DELETE FROM rollup_1m WHERE bucket < ?', (now - self.minute_retention,))
+            conn.execute('DELETE FROM rollup_1h WHERE bucket < ?', (now - self.hour_retention,))
+            conn.execute('DELETE FROM latency_1h WHERE bucket < ?', (now - self.hour_retention,))
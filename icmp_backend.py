@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Ping komutu çalıştırmadan ICMP echo gönderen soket tabanlı pinger
+"""
+
+import os
+import select
+import socket
+import struct
+import threading
+import time
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+
+def icmp_checksum(data):
+    """RFC 1071 internet checksum hesapla"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class IcmpPinger:
+    """Tek bir ICMP soketi üzerinden çok sayıda eşzamanlı echo isteği yönetir.
+
+    Linux'ta yetki gerektirmeyen datagram ICMP soketi (net.ipv4.ping_group_range),
+    izin varsa raw soket kullanılır. Cevaplar id/sequence ile eşleştirilir;
+    soket açılamazsa kurucu OSError fırlatır ve çağıran ping komutuna döner.
+    family=AF_INET6 ile ICMPv6 echo kullanılır; IPv6 sağlama toplamını çekirdek hesaplar.
+    """
+
+    def __init__(self, family=socket.AF_INET):
+        self.family = family
+        if family == socket.AF_INET6:
+            self.request_type, self.reply_type = ICMPV6_ECHO_REQUEST, ICMPV6_ECHO_REPLY
+        else:
+            self.request_type, self.reply_type = ICMP_ECHO_REQUEST, ICMP_ECHO_REPLY
+        self.sock, self.raw = self._open_socket(family)
+        if self.raw:
+            # Raw sokette id'yi biz seçeriz, cevaplar tüm ICMP trafiğinden süzülür
+            self.ident = (os.getpid() ^ id(self)) & 0xFFFF
+        else:
+            # Datagram sokette çekirdek id alanını yerel port numarasıyla değiştirir
+            self.sock.bind(('', 0))
+            self.ident = self.sock.getsockname()[1] & 0xFFFF
+        self._lock = threading.Lock()
+        self._pending = {}  # sequence -> [event, hedef ip, gönderim zamanı, rtt]
+        self._next_seq = 0
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_replies, name='icmp-reader', daemon=True)
+        self._reader.start()
+
+    @staticmethod
+    def _open_socket(family):
+        """Önce yetkisiz datagram, olmazsa raw ICMP soketi aç"""
+        proto = socket.IPPROTO_ICMPV6 if family == socket.AF_INET6 else socket.IPPROTO_ICMP
+        try:
+            return socket.socket(family, socket.SOCK_DGRAM, proto), False
+        except OSError:
+            return socket.socket(family, socket.SOCK_RAW, proto), True
+
+    def _build_packet(self, seq):
+        """Echo request paketini oluştur"""
+        payload = struct.pack('!d', time.time()) + b'ping-monitor'
+        header = struct.pack('!BBHHH', self.request_type, 0, 0, self.ident, seq)
+        if self.family == socket.AF_INET6:
+            return header + payload
+        checksum = icmp_checksum(header + payload)
+        return struct.pack('!BBHHH', self.request_type, 0, checksum, self.ident, seq) + payload
+
+    def ping(self, ip, timeout):
+        """Echo gönder; cevap gelirse gecikmeyi saniye olarak, gelmezse None döndür"""
+        event = threading.Event()
+        with self._lock:
+            seq = self._next_seq
+            while seq in self._pending:
+                seq = (seq + 1) & 0xFFFF
+            self._next_seq = (seq + 1) & 0xFFFF
+            entry = [event, ip.split('%', 1)[0], 0.0, None]
+            self._pending[seq] = entry
+        try:
+            entry[2] = time.perf_counter()
+            self.sock.sendto(self._build_packet(seq), (ip, 0))
+            event.wait(timeout)
+            return entry[3]
+        finally:
+            with self._lock:
+                self._pending.pop(seq, None)
+
+    def _read_replies(self):
+        """Gelen ICMP paketlerini bekleyen isteklerle eşleştir"""
+        while not self._closed:
+            try:
+                ready, _, _ = select.select([self.sock], [], [], 1.0)
+                if not ready:
+                    continue
+                data, addr = self.sock.recvfrom(2048)
+            except OSError:
+                if self._closed:
+                    break
+                continue
+            received = time.perf_counter()
+
+            # IPv4 raw soket (ve macOS datagram soketi) IP başlığını da döndürür
+            if self.family == socket.AF_INET and data and data[0] >> 4 == 4:
+                data = data[(data[0] & 0x0F) * 4:]
+            if len(data) < 8:
+                continue
+            icmp_type, _, _, ident, seq = struct.unpack('!BBHHH', data[:8])
+            if icmp_type != self.reply_type or ident != self.ident:
+                continue
+
+            with self._lock:
+                entry = self._pending.get(seq)
+                if entry is None or entry[1] != addr[0].split('%', 1)[0]:
+                    continue
+                entry[3] = received - entry[2]
+                entry[0].set()
+
+    def close(self):
+        """Soketi kapat ve okuyucu thread'i durdur"""
+        self._closed = True
+        try:
+            self.sock.close()
+        except OSError:
+            pass
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - İzleme döngüsü ölçümleri ve Prometheus metin biçiminde metrik sunucusu
+"""
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from device_registry import STATUS_ONLINE, STATUS_OFFLINE, STATUS_UNREACHABLE
+
+# Saniye cinsinden süreler için varsayılan histogram sınırları
+TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Tarama süreleri (saniye)
+SWEEP_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800)
+# Gecikmeler (ms)
+RTT_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+# Toplu işlenen öğe sayıları
+SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def format_labels(labels):
+    """{'a': 'b'} -> '{a="b"}' (değerler kaçışlanır)"""
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Yalnızca artan sayaç"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=None):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        yield self.name + '_total', self.labels, self.value
+
+
+class Histogram:
+    """Sabit sınırlı histogram (toplam ve adetle birlikte)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=TIME_BUCKETS, labels=None):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            yield self.name + '_bucket', dict(self.labels or {}, le=format_value(bound)), cumulative
+        yield self.name + '_sum', self.labels, total
+        yield self.name + '_count', self.labels, count
+
+
+class Metrics:
+    """PingMonitor'ın sıcak yollarındaki sayaç ve histogramlar.
+
+    PingMonitor.metrics None ise hiçbir ölçüm yapılmaz; ölçüm noktaları yalnızca
+    bir None kontrolüne indirgenir. Cihaz ve kuyruk göstergeleri her okumada
+    monitörün kendisinden hesaplanır, izleme döngüsüne ek yük getirmez.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self.sweep_seconds = self.histogram(
+            'ping_monitor_sweep_seconds', "İzlenen tüm cihazların bir kez pinglenme süresi", SWEEP_BUCKETS)
+        self.schedule_lag = self.histogram(
+            'ping_monitor_schedule_lag_seconds', "Pingin planlanan zamandan ne kadar geç atıldığı")
+        self.probe_seconds = self.histogram(
+            'ping_monitor_probe_seconds', "Ping çağrısının süresi (zaman aşımları dahil)")
+        self.rtt_ms = self.histogram(
+            'ping_monitor_rtt_milliseconds', "Başarılı pinglerin gecikmesi", RTT_BUCKETS)
+        self.spawn_seconds = self.histogram(
+            'ping_monitor_subprocess_spawn_seconds', "ping komutunun başlatılma süresi")
+        self.results_batch = self.histogram(
+            'ping_monitor_results_batch_size', "Döngünün bir turda işlediği sonuç sayısı", SIZE_BUCKETS)
+        self.save_devices = self.histogram(
+            'ping_monitor_save_seconds', "Dosya kaydetme süresi", labels={'file': 'devices'})
+        self.save_state = self.histogram(
+            'ping_monitor_save_seconds', "Dosya kaydetme süresi", labels={'file': 'state'})
+        self.gui_flush = self.histogram(
+            'ping_monitor_gui_flush_seconds', "GUI tablo güncellemesinin süresi")
+        self.gui_batch = self.histogram(
+            'ping_monitor_gui_flush_size', "GUI'nin bir güncellemede işlediği cihaz sayısı", SIZE_BUCKETS)
+        self.probes_ok = self.counter(
+            'ping_monitor_probes', "Atılan ping sayısı", labels={'result': 'ok'})
+        self.probes_lost = self.counter(
+            'ping_monitor_probes', "Atılan ping sayısı", labels={'result': 'lost'})
+        self.probes_suppressed = self.counter(
+            'ping_monitor_probes', "Atılan ping sayısı", labels={'result': 'suppressed'})
+        self.status_changes = self.counter(
+            'ping_monitor_status_changes', "Cihaz durum değişikliği sayısı")
+        self.in_flight = 0      # döngü tarafından güncellenir
+        self._sweep_pending = set()    # geçerli taramada henüz pinglenmemiş cihazlar
+        self._sweep_generation = None  # bekleyenlerin eşitlendiği kayıt defteri sürümü
+        self._sweep_started = None
+
+    def counter(self, name, help_text, labels=None):
+        metric = Counter(name, help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, buckets=TIME_BUCKETS, labels=None):
+        metric = Histogram(name, help_text, buckets, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def probe_done(self, rtt, device_id, devices):
+        """Tamamlanan bir pingi say ve cihazı geçerli taramada pinglenmiş işaretle"""
+        if rtt is None:
+            self.probes_lost.inc()
+        else:
+            self.probes_ok.inc()
+            self.rtt_ms.observe(rtt)
+        self._sweep_visit(device_id, devices)
+
+    def probe_held(self, device_id, devices):
+        """Üst cihazı yüzünden pinglenmeyen cihazı say; tarama onu beklemez"""
+        self.probes_suppressed.inc()
+        self._sweep_visit(device_id, devices)
+
+    def _sweep_visit(self, device_id, devices):
+        """Tarama sınırlarını izle (devices: cihazların DeviceRegistry'si).
+
+        Tarama, başladığı anda izlenen ve erişilemez olmayan cihazların hepsi
+        pinglenince biter; cihaz aralıkları farklı olsa da süre gerçek bir turu
+        ölçer. Arada silinen cihazlar beklenmez, eklenenler sonraki taramaya girer.
+        """
+        pending = self._sweep_pending
+        pending.discard(device_id)
+        if pending and devices.generation != self._sweep_generation:
+            self._sweep_generation = devices.generation
+            pending = self._sweep_pending = {key for key in pending if key in devices}
+        if pending:
+            return
+        now = time.monotonic()
+        if self._sweep_started is not None:
+            self.sweep_seconds.observe(now - self._sweep_started)
+        self._sweep_started = now
+        self._sweep_generation = devices.generation
+        self._sweep_pending = {device.id for device in list(devices)
+                               if device.status != STATUS_UNREACHABLE}
+
+    def render(self, monitor=None):
+        """Tüm metrikleri Prometheus metin biçiminde döndür"""
+        families = {}
+        for metric in self._metrics:
+            families.setdefault(metric.name, []).append(metric)
+
+        lines = []
+        for name, metrics in families.items():
+            lines.append(f'# HELP {name} {metrics[0].help}')
+            lines.append(f'# TYPE {name} {metrics[0].kind}')
+            for metric in metrics:
+                for sample, labels, value in metric.samples():
+                    lines.append(f'{sample}{format_labels(labels)} {format_value(value)}')
+
+        if monitor is not None:
+            lines.extend(self.render_monitor(monitor))
+        return '\n'.join(lines) + '\n'
+
+    def render_monitor(self, monitor):
+        """Kuyruk, log ve cihaz göstergeleri"""
+        with monitor._cond:
+            devices = list(monitor.devices)
+            scheduled = len(monitor._schedule)
+            pending = len(monitor._results)
+        history = monitor.history
+
+        gauges = [
+            ('ping_monitor_devices', "İzlenen cihaz sayısı", len(devices)),
+            ('ping_monitor_in_flight', "Sonucu beklenen ping sayısı", self.in_flight),
+            ('ping_monitor_scheduled', "Zamanlayıcı kuyruğundaki kayıt sayısı", scheduled),
+            ('ping_monitor_results_pending', "İşlenmeyi bekleyen ping sonucu sayısı", pending),
+            ('ping_monitor_log_dropped', "Tampon dolduğu için atılan log satırı", monitor.log_dropped),
+            ('ping_monitor_history_dropped', "Kuyruk dolduğu için yazılamayan geçmiş kaydı",
+             history.dropped if history else 0),
+        ]
+        lines = []
+        for name, help_text, value in gauges:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+
+        lines.append('# HELP ping_monitor_device_up Cihaz çevrimiçi mi (1), çevrimdışı mı (0)')
+        lines.append('# TYPE ping_monitor_device_up gauge')
+        rtt_lines = ['# HELP ping_monitor_device_rtt_milliseconds Cihazın son ping gecikmesi',
+                     '# TYPE ping_monitor_device_rtt_milliseconds gauge']
+        for device in devices:
+            labels = format_labels({'id': device.id, 'name': device.name, 'ip': device.ip})
+            if device.status in (STATUS_ONLINE, STATUS_OFFLINE):
+                lines.append(f'ping_monitor_device_up{labels} {int(device.status == STATUS_ONLINE)}')
+            if device.last_rtt is not None:
+                rtt_lines.append(f'ping_monitor_device_rtt_milliseconds{labels} {device.last_rtt!r}')
+        return lines + rtt_lines
+
+
+class MetricsServer:
+    """/metrics adresinden metrikleri sunan küçük HTTP sunucusu (ayrı thread'de)"""
+
+    def __init__(self, monitor, host='127.0.0.1', port=9108):
+        metrics = monitor.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.render(monitor).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # her istek için konsola yazma
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address
+        self._thread = threading.Thread(target=self.server.serve_forever, name='metrics', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
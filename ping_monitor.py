@@ -9,597 +9,1275 @@ import threading
 import time
 import json
 import os
+import re
+import tempfile
+import heapq
+import random
+import shutil
+import socket
 from datetime import datetime
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import queue
+import argparse
+import sys
+import collections
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from icmp_backend import IcmpPinger
+from event_log import LogWriter, LOG_DEBUG, LOG_INFO, LOG_CHANGE, LOG_LEVELS, LOG_LEVEL_NAMES
+import device_cache
+from resolver import Resolver, DEFAULT_TTL, DEFAULT_NEGATIVE_TTL
+from history_store import HistoryStore
+from latency_stats import RollingLatency
+from device_registry import (Device, DeviceRegistry, expand_targets, read_device_file,
+                             normalize_host, valid_host, STATUS_NAMES,
+                             STATUS_UNKNOWN, STATUS_ONLINE, STATUS_OFFLINE, STATUS_UNREACHABLE)
 
-# Modern renk paleti
-class Colors:
-    PRIMARY = "#2E3440"      # Koyu gri
-    SECONDARY = "#3B4252"    # Orta gri
-    ACCENT = "#5E81AC"       # Mavi
-    SUCCESS = "#A3BE8C"      # Yeşil
-    WARNING = "#EBCB8B"       # Sarı
-    ERROR = "#BF616A"        # Kırmızı
-    TEXT = "#ECEFF4"         # Açık gri
-    BACKGROUND = "#1E1E1E"   # Çok koyu gri
-    CARD = "#2D3748"         # Kart rengi
-    BORDER = "#4A5568"       # Kenarlık rengi
+# Bu sayıdan fazla cihazı olan listeler girintisiz (tek satır) kaydedilir;
+# girintili JSON yazımı saf Python kodlayıcısıyla yapıldığından çok yavaştır
+PRETTY_JSON_LIMIT = 10000
+
+# ping çıktısındaki gecikme değeri ("time=12.3 ms", "süre<1ms" vb.)
+RTT_PATTERN = re.compile(r'[=<]\s*(\d+(?:[.,]\d+)?)\s*ms')
 
 class PingMonitor:
-    def __init__(self, gui_callback=None):
-        self.devices = []
+    def __init__(self, gui_callback=None, history_file='history.db',
+                 devices_file='devices.json', state_file=None, cache_file=None):
+        self.devices = DeviceRegistry()
         self.monitoring = False
         self.ping_interval = 30  # saniye
         self.ping_timeout = 5    # saniye
-        self.log_queue = queue.Queue()
-        self.gui_callback = gui_callback  # GUI güncelleme callback'i
+        self.ping_jitter = 0     # saniye, cihaz başına rastgele gecikme üst sınırı
+        self.max_concurrency = 32  # aynı anda en fazla kaç cihaza ping atılacağı
+        self.workers = 0  # 1'den büyükse cihazlar bu kadar işçi işlemine bölünür
+        self._shards = None  # çalışan ShardPool ya da Coordinator
+        # (adres, port) verilirse cihazlar pinglenmez, ajanlara dağıtılır
+        self.coordinator_address = None
+        self.cluster_token = None
+        self.ping_backend = 'auto'  # 'auto', 'socket' veya 'subprocess'
+        self.stats_windows = (300,)  # saniye, gecikme/kayıp istatistik pencereleri
+        
+        # Durum değişikliği doğrulaması: son confirm_window pingin en az
+        # confirm_failures'ı başarısızsa çevrimdışı, art arda recover_successes
+        # başarılı ping olursa çevrimiçi sayılır. Şüpheli sonuçtan sonra
+        # confirm_interval saniye içinde yeniden ping atılır.
+        self.confirm_failures = 3
+        self.confirm_window = 5
+        self.recover_successes = 1
+        self.confirm_interval = 2
+        
+        # Uyarlanabilir aralık: durumu backoff_after saniyeden uzun süredir
+        # değişmeyen cihazların aralığı bu süreyle orantılı olarak en fazla
+        # max_backoff katına kadar uzatılır
+        self.adaptive = True
+        self.backoff_after = 600
+        self.max_backoff = 4
+        self._icmp_pingers = {}  # adres ailesi (AF_INET/AF_INET6) -> IcmpPinger
+        self._probe_loop = None  # TCP/HTTP/DNS kontrollerinin asyncio döngüsü
+        self._icmp_failed = {}  # soketi açılamayan adres aileleri -> hata
+        self._icmp_lock = threading.Lock()
+        
+        # Ana bilgisayar adları pinglerden bağımsız, arka planda çözümlenip
+        # önbellekte tutulur (saniye cinsinden geçerlilik süreleri)
+        self.resolver = None
+        self.dns_ttl = DEFAULT_TTL
+        self.dns_negative_ttl = DEFAULT_NEGATIVE_TTL
+        
+        # Zamanlayıcı durumu: (zaman, sıra, cihaz anahtarı) öncelik kuyruğu
+        self._cond = threading.Condition()
+        self._schedule = []
+        self._entries = {}   # id(cihaz) -> [cihaz, sıra, planlanan zaman, ping sürüyor mu]
+        self._results = []   # tamamlanan pinglerin (anahtar, sıra, rtt) sonuçları
+        self._seq = 0
+        self._run_id = 0
+        # Cihazların "parents" alanından kurulan bağımlılık grafiği (yoksa None);
+        # kayıt defteri değişince izleme döngüsünde yeniden kurulur
+        self.topology = None
+        self._topology_generation = None
+        self._topology_warnings = set()
+        self.log_level = LOG_INFO
+        self.log_to_console = True
+        self._log_lock = threading.Lock()
+        self.log_buffer = collections.deque(maxlen=1000)  # sınırlı halka tampon
+        self.log_dropped = 0        # tampon dolduğu için atılan toplam satır
+        self._log_dropped_seen = 0  # drain_logs ile en son bildirilen değer
+        # Konsol ve JSON-lines olay günlüğü arka planda yazılır (ilk logda oluşturulur)
+        self.log_writer = None
+        self._log_closed = False
+        self.gui_callback = gui_callback  # GUI güncelleme callback'i, değişen cihazla çağrılır
+        # Pinglenmeden değişen durumlarda (erişilemez işareti) gui_callback yerine
+        # çağrılır; işçi ve ajanlar bunu ping sonucundan ayırmak için kullanır
+        self.status_callback = None
+        self.history_file = history_file  # None ise ping geçmişi tutulmaz
+        self.history = None
+        self.metrics = None  # Metrics nesnesi; None ise ölçüm yapılmaz
+        self.metrics_server = None
+        self.api_server = None
+        self.alerts = None  # AlertBus; durum değişikliği bildirimleri
+        # Her ping sonucu ve cihaz ekleme/silmede artar; okuyucular (ör. durum
+        # API'si) önbelleklerinin eskiyip eskimediğini buna bakarak anlar
+        self.version = 0
+        # Yalnızca durum değişikliğinde ve cihaz ekleme/silmede artar; ping
+        # sonuçlarından (gecikme, son ping zamanı) etkilenmeyen önbellekler için
+        self.state_version = 0
+        # Durum değişikliğinde (cihaz, eski durum, yeni durum, zaman) ile çağrılır
+        self.status_listeners = []
+        self.devices_file = devices_file  # kullanıcının düzenlediği cihaz listesi (None: yalnızca bellekte)
+        # Cihazların son durumları (varsayılan: devices.json -> devices_state.json)
+        if state_file is None and devices_file is not None:
+            state_file = os.path.splitext(devices_file)[0] + '_state.json'
+        self.state_file = state_file
+        # Hızlı açılış için ikili önbellek (varsayılan: devices.json -> devices.cache);
+        # cihaz ve durum dosyalarının imzasıyla doğrulanır, False verilirse kullanılmaz
+        if cache_file is None and devices_file is not None:
+            cache_file = os.path.splitext(devices_file)[0] + '.cache'
+        self.cache_file = cache_file or None
+        self.state_save_delay = 5  # saniye, durum değişikliği sonrası kayıt gecikmesi
+        self._state_dirty_since = None
+        self._legacy_history_keys = {}  # kimliği yeni atanan cihazlar: ip -> id
+        # Cihaz listesi okunamadıysa hata; bu durumda hiçbir dosya yazılmaz
+        self.devices_load_error = None
         self.load_devices()
         
     def load_devices(self):
-        """Cihaz listesini JSON dosyasından yükle"""
+        """Cihaz listesini ve son durumlarını yükle.
+
+        Cihaz ve durum dosyaları son kayıttan beri değişmediyse ikili önbellek
+        kullanılır; değilse cihaz listesi akışlı olarak okunur ve önbellek
+        yeniden yazılır.
+        """
+        if self.devices_file is None:
+            return  # yalnızca bellekte tutulan cihaz listesi
+        rows, state_valid = None, False
+        if self.cache_file:
+            rows, state_valid = device_cache.read_cache(self.cache_file, self.devices_file, self.state_file)
+        if rows is not None:
+            self.devices = DeviceRegistry.from_rows(rows)
+        else:
+            # Liste geçici kayıt defterine okunur; yalnızca dizinin tamamı
+            # okunabildiyse kullanılır, yarım kalan liste önbelleğe yazılmaz
+            devices = DeviceRegistry()
+            legacy_keys = {}
+            try:
+                if os.path.exists(self.devices_file) and os.path.getsize(self.devices_file):
+                    with open(self.devices_file, 'r', encoding='utf-8') as f:
+                        for data in device_cache.iter_json_array(f):
+                            self._load_device(devices, legacy_keys, data)
+            except Exception as e:
+                # Bozuk dosyanın üzerine boş ya da eksik liste yazılmasın
+                self.devices_load_error = e
+                print(f"Cihaz listesi yüklenirken hata: {e}; dosya düzeltilene kadar "
+                      f"cihaz listesi ve durumlar kaydedilmeyecek")
+                return
+            self.devices = devices
+            self._legacy_history_keys = legacy_keys
+            if legacy_keys:
+                self.save_devices()
+        
+        if not state_valid:
+            try:
+                state = {}
+                if self.state_file and os.path.exists(self.state_file):
+                    with open(self.state_file, 'r', encoding='utf-8') as f:
+                        state = json.load(f)
+                # Eski sürümlerde durum alanları devices.json içindeydi ve durum
+                # dosyası IP ile anahtarlanıyordu; bunlar da okunur
+                for device in self.devices:
+                    device.apply_state(state.get(device.id) or state.get(device.ip) or {})
+            except Exception as e:
+                print(f"Cihaz durumları yüklenirken hata: {e}")
+        if rows is None or not state_valid:
+            self.save_cache()
+    
+    @staticmethod
+    def _load_device(devices, legacy_keys, data):
+        """devices.json'daki bir kaydı kayıt defterine ekle"""
+        device = Device.from_dict(data)
+        had_id = bool(device.id)
+        if not devices.add(device):
+            print(f"Tekrarlanan cihaz atlandı: {device.name} ({device.ip})")
+        elif not had_id:
+            # Eski dosyalarda kimlik yoktu; geçmiş kayıtları IP ile tutuluyordu
+            legacy_keys[device.ip] = device.id
+    
+    def save_cache(self):
+        """Cihaz listesinin ve son durumların ikili önbelleğini yaz"""
+        if self.cache_file is None or self.devices_file is None or self.devices_load_error is not None:
+            return
         try:
-            if os.path.exists('devices.json'):
-                with open('devices.json', 'r', encoding='utf-8') as f:
-                    self.devices = json.load(f)
-            else:
-                self.devices = []
+            with self._cond:
+                rows = [device.to_row() for device in self.devices]
+            device_cache.write_cache(self.cache_file, rows, device_cache.file_signature(self.devices_file),
+                                     device_cache.file_signature(self.state_file) if self.state_file else None)
         except Exception as e:
-            print(f"Cihaz listesi yüklenirken hata: {e}")
-            self.devices = []
+            print(f"Cihaz önbelleği kaydedilirken hata: {e}")
+    
+    def write_json_atomic(self, path, data, indent=None):
+        """JSON'u geçici dosyaya yazıp yerine taşı; yarım kalan yazma dosyayı bozmaz"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                # json.dump parça parça yazar ve C kodlayıcısını kullanmaz; tek seferde kodla
+                f.write(json.dumps(data, ensure_ascii=False, indent=indent))
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp dosyayı 0600 açar; mevcut dosyanın izinlerini koru
+            mode = os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
     
     def save_devices(self):
-        """Cihaz listesini JSON dosyasına kaydet"""
+        """Cihaz listesini (yalnızca yapılandırma alanları) JSON dosyasına kaydet"""
+        if self.devices_file is None:
+            return
+        if self.devices_load_error is not None:
+            self.log_message(f"Cihaz listesi kaydedilmedi: {self.devices_file} okunamamıştı "
+                             f"({self.devices_load_error})", LOG_CHANGE)
+            return
         try:
-            with open('devices.json', 'w', encoding='utf-8') as f:
-                json.dump(self.devices, f, ensure_ascii=False, indent=2)
+            started = time.perf_counter()
+            with self._cond:
+                config = [device.to_config() for device in self.devices]
+            self.write_json_atomic(self.devices_file, config,
+                                   indent=2 if len(config) <= PRETTY_JSON_LIMIT else None)
+            if self.metrics is not None:
+                self.metrics.save_devices.observe(time.perf_counter() - started)
         except Exception as e:
             print(f"Cihaz listesi kaydedilirken hata: {e}")
+            return
+        self.save_cache()
+    
+    def mark_state_dirty(self):
+        """Durum dosyasının yeniden yazılması gerektiğini işaretle"""
+        if self._state_dirty_since is None:
+            self._state_dirty_since = time.monotonic()
+    
+    def save_state(self):
+        """Cihaz durumlarının anlık görüntüsünü kaydet"""
+        self._state_dirty_since = None
+        if self.state_file is None or self.devices_load_error is not None:
+            return
+        try:
+            started = time.perf_counter()
+            with self._cond:
+                state = {device.id: device.to_state() for device in self.devices}
+            self.write_json_atomic(self.state_file, state)
+            if self.metrics is not None:
+                self.metrics.save_state.observe(time.perf_counter() - started)
+        except Exception as e:
+            print(f"Cihaz durumları kaydedilirken hata: {e}")
+    
+    def get_icmp_pinger(self, family=socket.AF_INET):
+        """Adres ailesinin paylaşılan ICMP soketini ilk kullanımda aç.
+        
+        Soket açılamazsa 'auto' arka ucunda None döner (ping komutu kullanılır);
+        'socket' arka ucunda ping komutuna dönülmez, OSError yükseltilir.
+        """
+        if self.ping_backend == 'subprocess':
+            return None
+        pinger = self._icmp_pingers.get(family)
+        if pinger is None:
+            with self._icmp_lock:
+                pinger = self._icmp_pingers.get(family)
+                if pinger is None and family not in self._icmp_failed:
+                    try:
+                        pinger = self._icmp_pingers[family] = IcmpPinger(family)
+                    except OSError as e:
+                        self._icmp_failed[family] = e
+                        version = 'IPv6 ' if family == socket.AF_INET6 else ''
+                        if self.ping_backend == 'socket':
+                            self.log_message(f"❌ {version}ICMP soketi açılamadı, ping atılamıyor: {e}", LOG_CHANGE)
+                        else:
+                            self.log_message(f"{version}ICMP soketi açılamadı, ping komutu kullanılacak: {e}")
+        if pinger is None and self.ping_backend == 'socket':
+            raise OSError(f"ICMP soketi açılamadı: {self._icmp_failed[family]}")
+        return pinger
+    
+    def get_resolver(self):
+        """Ad çözümleme önbelleğini ilk kullanımda oluştur"""
+        if self.resolver is None:
+            with self._icmp_lock:
+                if self.resolver is None:
+                    self.resolver = Resolver(self.dns_ttl, self.dns_negative_ttl, log=self.log_message)
+        return self.resolver
+    
+    def get_probe_loop(self):
+        """Servis kontrolleri için paylaşılan asyncio döngüsünü ilk kullanımda başlat"""
+        if self._probe_loop is None:
+            with self._icmp_lock:
+                if self._probe_loop is None:
+                    from service_probes import ProbeLoop
+                    self._probe_loop = ProbeLoop()
+        return self._probe_loop
+    
+    def ping_device(self, ip, timeout=None):
+        """Belirtilen hedefe (IPv4/IPv6 adresi ya da ad) ping at, cevap gelirse gecikmeyi (ms) döndür"""
+        timeout = timeout or self.ping_timeout
+        deadline = time.monotonic() + timeout
+        # Adlar önbellekten çözümlenir; yalnızca ilk pingte çözümleme beklenir
+        address = self.get_resolver().resolve(ip, timeout)
+        if address is None:
+            return None  # çözümlenemedi; hata çözümleyici tarafından loglanır
+        # Çözümlemede geçen süre ping süresinden düşülür
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            return None
+        try:
+            pinger = self.get_icmp_pinger(socket.AF_INET6 if ':' in address else socket.AF_INET)
+        except OSError:
+            return None  # 'socket' arka ucu ve soket yok; hata açılışta loglandı
+        if pinger is None:
+            return self.ping_subprocess(address, timeout)
+        try:
+            rtt = pinger.ping(address, timeout)
+            return None if rtt is None else rtt * 1000
+        except Exception as e:
+            self.log_message(f"Ping hatası ({ip}): {e}", event='probe_error', ip=ip, error=str(e))
+            return None
     
-    def ping_device(self, ip):
-        """Belirtilen IP'ye ping at"""
+    def ping_subprocess(self, ip, timeout=None):
+        """Sistemin ping komutuyla ping at, cevap gelirse gecikmeyi (ms) döndür"""
+        timeout = timeout or self.ping_timeout
         try:
             # Windows için ping komutu
             if os.name == 'nt':
-                cmd = ['ping', '-n', '1', '-w', str(self.ping_timeout * 1000), ip]
+                cmd = ['ping', '-n', '1', '-w', str(int(timeout * 1000)), ip]
             else:
-                cmd = ['ping', '-c', '1', '-W', str(self.ping_timeout), ip]
+                # Eski iputils ve busybox IPv6 adresleri için ayrı ping6 komutu ister
+                program = 'ping6' if ':' in ip and shutil.which('ping6') else 'ping'
+                cmd = [program, '-c', '1', '-W', str(max(1, int(timeout))), ip]
+            
+            started = time.perf_counter()
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as process:
+                if self.metrics is not None:
+                    self.metrics.spawn_seconds.observe(time.perf_counter() - started)
+                try:
+                    stdout, _ = process.communicate(timeout=timeout + 2)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    raise
+            if process.returncode != 0:
+                return None
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.ping_timeout + 2)
-            return result.returncode == 0
+            match = RTT_PATTERN.search(stdout)
+            if match:
+                return float(match.group(1).replace(',', '.'))
+            return (time.perf_counter() - started) * 1000
         except Exception as e:
-            self.log_message(f"Ping hatası ({ip}): {e}")
-            return False
+            self.log_message(f"Ping hatası ({ip}): {e}", event='probe_error', ip=ip, error=str(e))
+            return None
     
-    def log_message(self, message):
-        """Log mesajını kuyruğa ekle"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        self.log_queue.put(log_entry)
-        print(log_entry)
+    def log_message(self, message, level=LOG_INFO, persist=True, **fields):
+        """Log mesajını halka tampona ve olay günlüğüne ekle.
+
+        fields olay günlüğü kaydına tipli alanlar olarak eklenir (event, device,
+        ip, rtt...). persist=False satırlar yalnızca gösterilir; ping sonuçları
+        ve durum değişiklikleri günlüğe ayrıca yapısal kayıt olarak yazılır.
+        """
+        if level < self.log_level and level < LOG_CHANGE:
+            return
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+        record = None
+        if persist:
+            record = {'ts': round(now, 3), 'level': LOG_LEVEL_NAMES.get(level, level),
+                      'event': 'message', 'message': message}
+            record.update(fields)
+        self.emit_log(f"[{timestamp}] {message}", record)
     
-    def monitor_devices(self):
-        """Cihazları izleme döngüsü"""
-        while self.monitoring:
-            for device in self.devices:
-                if not self.monitoring:
-                    break
-                
-                ip = device['ip']
-                name = device.get('name', ip)
-                previous_status = device.get('status', 'unknown')
-                
-                self.log_message(f"{name} ({ip}) ping atılıyor...")
-                is_online = self.ping_device(ip)
-                
-                device['last_check'] = datetime.now().isoformat()
-                new_status = 'online' if is_online else 'offline'
-                
-                # Durum değişikliği kontrolü
-                if previous_status != new_status:
-                    device['last_status_change'] = datetime.now().isoformat()
-                    status_change_text = "ÇEVRİMİÇİ" if is_online else "ÇEVRİMDIŞI"
-                    self.log_message(f"🔄 {name} ({ip}) DURUM DEĞİŞTİ: {status_change_text}")
-                else:
-                    status_text = "ÇEVRİMİÇİ" if is_online else "ÇEVRİMDIŞI"
-                    self.log_message(f"✅ {name} ({ip}): {status_text}")
-                
-                device['status'] = new_status
-                
-                # GUI'yi güncelle (her ping sonrasında) - thread-safe
-                if self.gui_callback:
-                    self.gui_callback()
-            
-            # Cihaz listesini kaydet
-            self.save_devices()
-            
-            # Bekleme süresi
-            for _ in range(self.ping_interval):
-                if not self.monitoring:
-                    break
-                time.sleep(1)
+    def emit_log(self, log_entry, record=None):
+        """Biçimlenmiş log satırını tampona ekle; konsola ve olay günlüğüne
+        arka plan yazıcısı yazar, böylece ping thread'leri stdout'ta beklemez"""
+        with self._log_lock:
+            # Tampon doluysa en eski satır düşer; okunmadan düşenler sayılır
+            if len(self.log_buffer) == self.log_buffer.maxlen:
+                self.log_dropped += 1
+            self.log_buffer.append((log_entry, record))
+        writer = self.log_writer
+        if writer is None and self.log_to_console:
+            writer = self.get_log_writer()
+        if writer is not None:
+            writer.write(log_entry if self.log_to_console else None, record)
+        elif self.log_to_console:
+            print(log_entry)  # monitör kapatıldıktan sonra
     
-    def start_monitoring(self):
-        """İzlemeyi başlat"""
-        if not self.monitoring:
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self.monitor_devices, daemon=True)
-            self.monitor_thread.start()
-            self.log_message("İzleme başlatıldı")
+    def write_event(self, record):
+        """Yapısal kaydı yalnızca olay günlüğüne yaz (günlük kapalıysa hiçbir şey yapmaz)"""
+        writer = self.log_writer
+        if writer is not None and writer.path:
+            writer.write(None, record)
     
-    def stop_monitoring(self):
-        """İzlemeyi durdur"""
-        self.monitoring = False
-        self.log_message("İzleme durduruldu")
+    def get_log_writer(self):
+        """Konsol yazıcısını ilk kullanımda başlat (monitör kapatıldıysa None)"""
+        if self.log_writer is None:
+            with self._log_lock:
+                if self.log_writer is None and not self._log_closed:
+                    self.log_writer = LogWriter(stream=sys.stdout)
+        return self.log_writer
     
-    def add_device(self, name, ip):
-        """Yeni cihaz ekle"""
-        device = {
-            'name': name,
-            'ip': ip,
-            'status': 'unknown',
-            'last_check': None,
-            'last_status_change': None
-        }
-        self.devices.append(device)
-        self.save_devices()
-        self.log_message(f"Yeni cihaz eklendi: {name} ({ip})")
+    def set_log_buffer_size(self, size):
+        """Log tamponunun kapasitesini değiştir (en yeni satırlar korunur)"""
+        with self._log_lock:
+            self.log_buffer = collections.deque(self.log_buffer, maxlen=max(1, size))
     
-    def remove_device(self, index):
-        """Cihaz sil"""
-        if 0 <= index < len(self.devices):
-            device = self.devices.pop(index)
-            self.save_devices()
-            self.log_message(f"Cihaz silindi: {device['name']} ({device['ip']})")
+    def drain_logs(self, records=False):
+        """Bekleyen log satırlarını ve son çağrıdan beri atılan satır sayısını döndür.
 
-class PingMonitorGUI:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("🔍 Ping Monitor - Cihaz İzleme Uygulaması")
-        self.root.geometry("1000x700")
-        self.root.configure(bg=Colors.BACKGROUND)
-        
-        # Modern tema ayarları
-        self.setup_theme()
-        
-        # Monitor'u GUI callback ile başlat
-        self.monitor = PingMonitor(gui_callback=self.update_display)
-        
-        self.setup_gui()
-        self.update_display()
-        self.process_log_queue()
+        records=True ise satırlar (satır, olay kaydı) çiftleri olarak döner; işçi
+        işlemleri ve ajanlar yapısal kayıtları ana monitöre böyle iletir.
+        """
+        with self._log_lock:
+            entries = list(self.log_buffer) if records else [entry for entry, _ in self.log_buffer]
+            self.log_buffer.clear()
+            dropped = self.log_dropped - self._log_dropped_seen
+            self._log_dropped_seen = self.log_dropped
+        return entries, dropped
     
-    def setup_theme(self):
-        """Modern tema ayarlarını yapılandır"""
-        style = ttk.Style()
-        
-        # Modern tema stilleri
-        style.theme_use('clam')
-        
-        # Ana frame stili
-        style.configure('Main.TFrame', 
-                       background=Colors.BACKGROUND,
-                       relief='flat')
-        
-        # Kart stili
-        style.configure('Card.TFrame',
-                       background=Colors.CARD,
-                       relief='flat',
-                       borderwidth=1)
-        
-        # Başlık stili
-        style.configure('Title.TLabel',
-                       background=Colors.CARD,
-                       foreground=Colors.TEXT,
-                       font=('Segoe UI', 14, 'bold'))
-        
-        # Buton stilleri
-        style.configure('Primary.TButton',
-                       background=Colors.ACCENT,
-                       foreground=Colors.TEXT,
-                       font=('Segoe UI', 10, 'bold'),
-                       relief='flat',
-                       borderwidth=0,
-                       focuscolor='none')
-        
-        style.map('Primary.TButton',
-                 background=[('active', Colors.SUCCESS),
-                           ('pressed', Colors.WARNING)])
-        
-        style.configure('Success.TButton',
-                       background=Colors.SUCCESS,
-                       foreground=Colors.PRIMARY,
-                       font=('Segoe UI', 10, 'bold'),
-                       relief='flat',
-                       borderwidth=0)
-        
-        style.configure('Error.TButton',
-                       background=Colors.ERROR,
-                       foreground=Colors.TEXT,
-                       font=('Segoe UI', 10, 'bold'),
-                       relief='flat',
-                       borderwidth=0)
-        
-        # Treeview stili
-        style.configure('Modern.Treeview',
-                       background=Colors.CARD,
-                       foreground=Colors.TEXT,
-                       fieldbackground=Colors.CARD,
-                       font=('Segoe UI', 9),
-                       relief='flat',
-                       borderwidth=0)
-        
-        style.configure('Modern.Treeview.Heading',
-                       background=Colors.PRIMARY,
-                       foreground=Colors.TEXT,
-                       font=('Segoe UI', 10, 'bold'),
-                       relief='flat')
-        
-        # Entry stili
-        style.configure('Modern.TEntry',
-                       background=Colors.SECONDARY,
-                       foreground='#000000',  # Siyah yazı rengi
-                       font=('Segoe UI', 10),
-                       relief='flat',
-                       borderwidth=1,
-                       insertcolor='#000000')
-        
-        # Label stili
-        style.configure('Modern.TLabel',
-                       background=Colors.CARD,
-                       foreground=Colors.TEXT,
-                       font=('Segoe UI', 9))
-        
-        # Spinbox stili
-        style.configure('Modern.TSpinbox',
-                       background=Colors.SECONDARY,
-                       foreground='#000000',  # Siyah yazı rengi
-                       font=('Segoe UI', 10),
-                       relief='flat',
-                       borderwidth=1)
-    
-    def setup_gui(self):
-        """GUI arayüzünü oluştur"""
-        # Ana frame
-        main_frame = ttk.Frame(self.root, style='Main.TFrame', padding="15")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Başlık
-        title_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="15")
-        title_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 15))
-        
-        title_label = ttk.Label(title_frame, text="🔍 Ping Monitor", style='Title.TLabel')
-        title_label.grid(row=0, column=0, sticky=tk.W)
-        
-        subtitle_label = ttk.Label(title_frame, text="Cihaz İzleme ve Durum Takip Sistemi", style='Modern.TLabel')
-        subtitle_label.grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
-        
-        # Kontrol paneli
-        control_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="15")
-        control_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 15))
-        
-        # Kontrol butonları
-        button_frame = ttk.Frame(control_frame, style='Card.TFrame')
-        button_frame.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
-        
-        self.start_btn = ttk.Button(button_frame, text="▶️ İzlemeyi Başlat", 
-                                   style='Success.TButton', command=self.start_monitoring)
-        self.start_btn.grid(row=0, column=0, padx=(0, 10))
-        
-        self.stop_btn = ttk.Button(button_frame, text="⏹️ İzlemeyi Durdur", 
-                                 style='Error.TButton', command=self.stop_monitoring, state='disabled')
-        self.stop_btn.grid(row=0, column=1, padx=10)
-        
-        # Ping aralığı ayarları
-        settings_frame = ttk.Frame(control_frame, style='Card.TFrame')
-        settings_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E))
-        
-        ttk.Label(settings_frame, text="⏱️ Ping Aralığı (saniye):", style='Modern.TLabel').grid(row=0, column=0, padx=(0, 10), sticky=tk.W)
-        self.interval_var = tk.StringVar(value=str(self.monitor.ping_interval))
-        interval_spin = ttk.Spinbox(settings_frame, from_=10, to=300, width=10, 
-                                  textvariable=self.interval_var, style='Modern.TSpinbox')
-        interval_spin.grid(row=0, column=1, padx=(0, 10))
-        
-        update_btn = ttk.Button(settings_frame, text="🔄 Güncelle", 
-                               style='Primary.TButton', command=self.update_interval)
-        update_btn.grid(row=0, column=2, padx=10)
-        
-        # Cihaz yönetimi
-        device_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="15")
-        device_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
-        
-        # Cihaz yönetimi başlığı
-        device_title = ttk.Label(device_frame, text="📱 Cihaz Yönetimi", style='Title.TLabel')
-        device_title.grid(row=0, column=0, columnspan=4, sticky=tk.W, pady=(0, 15))
-        
-        # Cihaz listesi
-        columns = ('Name', 'IP', 'Status', 'Last Check')
-        self.device_tree = ttk.Treeview(device_frame, columns=columns, show='headings', 
-                                       height=8, style='Modern.Treeview')
-        
-        # Sütun başlıkları
-        self.device_tree.heading('Name', text='📛 Cihaz Adı')
-        self.device_tree.heading('IP', text='🌐 IP Adresi')
-        self.device_tree.heading('Status', text='📊 Durum')
-        self.device_tree.heading('Last Check', text='⏰ Son Kontrol')
-        
-        # Sütun genişlikleri
-        self.device_tree.column('Name', width=150, anchor='w')
-        self.device_tree.column('IP', width=120, anchor='w')
-        self.device_tree.column('Status', width=120, anchor='center')
-        self.device_tree.column('Last Check', width=100, anchor='center')
-        
-        self.device_tree.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 15))
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(device_frame, orient=tk.VERTICAL, command=self.device_tree.yview)
-        scrollbar.grid(row=1, column=4, sticky=(tk.N, tk.S))
-        self.device_tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Cihaz ekleme formu
-        form_frame = ttk.Frame(device_frame, style='Card.TFrame')
-        form_frame.grid(row=2, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=(0, 10))
-        
-        ttk.Label(form_frame, text="📝 Cihaz Adı:", style='Modern.TLabel').grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
-        self.name_entry = ttk.Entry(form_frame, width=20, style='Modern.TEntry')
-        self.name_entry.grid(row=0, column=1, padx=(0, 20))
-        
-        ttk.Label(form_frame, text="🌐 IP Adresi:", style='Modern.TLabel').grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
-        self.ip_entry = ttk.Entry(form_frame, width=20, style='Modern.TEntry')
-        self.ip_entry.grid(row=0, column=3, padx=(0, 10))
+    def check_device(self, device, rtt):
+        """Ping sonucunu cihaza işle ve durum değişikliğini logla"""
+        is_online = rtt is not None
+        ip = device.target
+        name = device.name
+        now = time.time()
+        self.record_result(device, now, rtt)
         
-        # Butonlar
-        button_frame = ttk.Frame(device_frame, style='Card.TFrame')
-        button_frame.grid(row=3, column=0, columnspan=4, sticky=(tk.W, tk.E))
+        # Son confirm_window pingin başarısızlıkları bit maskesinde tutulur
+        window_mask = (1 << max(1, self.confirm_window)) - 1
+        device.recent_failures = ((device.recent_failures << 1) | (not is_online)) & window_mask
+        device.success_streak = device.success_streak + 1 if is_online else 0
+        failures = bin(device.recent_failures).count('1')
         
-        add_btn = ttk.Button(button_frame, text="➕ Cihaz Ekle", 
-                           style='Success.TButton', command=self.add_device)
-        add_btn.grid(row=0, column=0, padx=(0, 10))
+        # Tek bir kayıp paket durumu değiştirmez: çevrimdışı için son M pingin
+        # N'i, çevrimiçi için art arda recover_successes başarı gerekir
+        new_status = device.status
+        if device.status == STATUS_UNKNOWN:
+            new_status = STATUS_ONLINE if is_online else STATUS_OFFLINE
+        elif device.status == STATUS_ONLINE and failures >= self.confirm_failures:
+            new_status = STATUS_OFFLINE
+        elif device.status == STATUS_OFFLINE and device.success_streak >= self.recover_successes:
+            new_status = STATUS_ONLINE
+        elif device.status == STATUS_UNREACHABLE:
+            # Üst cihaz geri geldi; ilk ping sonuçları da aynı doğrulamadan geçer
+            if device.success_streak >= self.recover_successes:
+                new_status = STATUS_ONLINE
+            elif failures >= self.confirm_failures:
+                new_status = STATUS_OFFLINE
         
-        remove_btn = ttk.Button(button_frame, text="🗑️ Seçili Cihazı Sil", 
-                               style='Error.TButton', command=self.remove_device)
-        remove_btn.grid(row=0, column=1, padx=10)
+        # Durum değişikliği kontrolü
+        if device.status != new_status:
+            device.last_status_change = now
+            device.recent_failures = 0 if new_status == STATUS_ONLINE else device.recent_failures
+            status_change_text = "ÇEVRİMİÇİ" if new_status == STATUS_ONLINE else "ÇEVRİMDIŞI"
+            self.log_message(f"🔄 {name} ({ip}) DURUM DEĞİŞTİ: {status_change_text}", LOG_CHANGE,
+                             persist=False)
+        elif new_status == STATUS_ONLINE and not is_online:
+            self.log_message(f"⚠️ {name} ({ip}) yanıt vermedi, doğrulanıyor "
+                             f"({failures}/{self.confirm_failures})", persist=False)
+        elif new_status == STATUS_OFFLINE and is_online:
+            self.log_message(f"⚠️ {name} ({ip}) yanıt verdi, doğrulanıyor "
+                             f"({device.success_streak}/{self.recover_successes})", persist=False)
+        elif new_status == STATUS_UNREACHABLE:
+            self.log_message(f"⚠️ {name} ({ip}) {'yanıt verdi' if is_online else 'yanıt vermedi'}, doğrulanıyor",
+                             persist=False)
+        else:
+            status_text = f"ÇEVRİMİÇİ ({rtt:.1f} ms)" if is_online else "ÇEVRİMDIŞI"
+            self.log_message(f"✅ {name} ({ip}): {status_text}", persist=False)
         
-        # Log paneli
-        log_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="15")
-        log_frame.grid(row=2, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(10, 0))
-        
-        # Log başlığı
-        log_title = ttk.Label(log_frame, text="📋 Log Kayıtları", style='Title.TLabel')
-        log_title.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 15))
-        
-        # Log text alanı
-        self.log_text = tk.Text(log_frame, height=15, width=50, wrap=tk.WORD,
-                               bg=Colors.SECONDARY, fg=Colors.TEXT, 
-                               font=('Consolas', 9), relief='flat', borderwidth=0,
-                               insertbackground=Colors.TEXT, selectbackground=Colors.ACCENT)
-        log_scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=log_scrollbar.set)
-        
-        self.log_text.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        log_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
-        
-        # Log kontrol butonları
-        log_control_frame = ttk.Frame(log_frame, style='Card.TFrame')
-        log_control_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
-        
-        clear_btn = ttk.Button(log_control_frame, text="🗑️ Logları Temizle", 
-                               style='Error.TButton', command=self.clear_logs)
-        clear_btn.grid(row=0, column=0, padx=(0, 10))
-        
-        # Status göstergeleri
-        status_frame = ttk.Frame(log_control_frame, style='Card.TFrame')
-        status_frame.grid(row=0, column=1, sticky=tk.E)
-        
-        self.status_online = ttk.Label(status_frame, text="🟢 Çevrimiçi: 0", style='Modern.TLabel')
-        self.status_online.grid(row=0, column=0, padx=(0, 10))
-        
-        self.status_offline = ttk.Label(status_frame, text="🔴 Çevrimdışı: 0", style='Modern.TLabel')
-        self.status_offline.grid(row=0, column=1)
-        
-        # Alt bilgi (Footer)
-        footer_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="10")
-        footer_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(15, 0))
-        
-        footer_label = ttk.Label(footer_frame, text="© 2025 Süleyman Rüçhan Çakıllı Tarafından Geliştirilmektedir", 
-                                style='Modern.TLabel', font=('Segoe UI', 8))
-        footer_label.grid(row=0, column=0, sticky=tk.W)
-        
-        # Grid ağırlıkları
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(2, weight=1)
-        device_frame.columnconfigure(0, weight=1)
-        device_frame.rowconfigure(1, weight=1)
-        log_frame.columnconfigure(0, weight=1)
-        log_frame.rowconfigure(1, weight=1)
+        old_status = device.status
+        device.status = new_status
+        if old_status != new_status:
+            self.status_changed(device, old_status, new_status, now)
     
-    def start_monitoring(self):
-        """İzlemeyi başlat"""
-        try:
-            self.monitor.ping_interval = int(self.interval_var.get())
-            self.monitor.start_monitoring()
-            self.start_btn.config(state='disabled')
-            self.stop_btn.config(state='normal')
-            
-            # Başarı animasyonu
-            self.animate_button(self.start_btn, Colors.SUCCESS)
-            self.log_message("🚀 İzleme başlatıldı!")
-            
-        except ValueError:
-            messagebox.showerror("❌ Hata", "Geçerli bir ping aralığı girin!")
+    def record_result(self, device, timestamp, rtt):
+        """Ping sonucunu cihaza, geçmişe ve istatistiklere yaz"""
+        if self.history:
+            self.history.record(timestamp, device.id, rtt)
+        device.last_check = timestamp
+        device.last_rtt = rtt
+        self.record_latency(device, timestamp, rtt)
+        self.version += 1
+        writer = self.log_writer
+        if writer is not None and writer.path and self.log_level <= LOG_INFO:
+            record = {'ts': round(timestamp, 3), 'level': 'info', 'event': 'probe', 'device': device.id,
+                      'name': device.name, 'ip': device.ip,
+                      'rtt': None if rtt is None else round(rtt, 3)}
+            if device.type:
+                record['type'] = device.type
+            writer.write(None, record)
     
-    def stop_monitoring(self):
-        """İzlemeyi durdur"""
-        self.monitor.stop_monitoring()
-        self.start_btn.config(state='normal')
-        self.stop_btn.config(state='disabled')
-        
-        # Durdurma animasyonu
-        self.animate_button(self.stop_btn, Colors.ERROR)
-        self.log_message("⏹️ İzleme durduruldu!")
+    def status_changed(self, device, old_status, new_status, timestamp):
+        """Durum değişikliğini kaydet ve dinleyicilere bildir"""
+        self.state_version += 1
+        self.mark_state_dirty()
+        if self.metrics is not None:
+            self.metrics.status_changes.inc()
+        self.write_event({'ts': round(timestamp, 3), 'level': 'change', 'event': 'status',
+                          'device': device.id, 'name': device.name, 'ip': device.ip,
+                          'old': STATUS_NAMES[old_status], 'new': STATUS_NAMES[new_status]})
+        for listener in self.status_listeners:
+            try:
+                listener(device, old_status, new_status, timestamp)
+            except Exception as e:
+                self.log_message(f"Durum dinleyicisi hatası: {e}")
     
-    def update_interval(self):
-        """Ping aralığını güncelle"""
-        try:
-            new_interval = int(self.interval_var.get())
-            if 10 <= new_interval <= 300:
-                self.monitor.ping_interval = new_interval
-                messagebox.showinfo("✅ Başarılı", f"Ping aralığı {new_interval} saniye olarak güncellendi")
-                self.log_message(f"⚙️ Ping aralığı güncellendi: {new_interval} saniye")
-            else:
-                messagebox.showerror("❌ Hata", "Ping aralığı 10-300 saniye arasında olmalı!")
-        except ValueError:
-            messagebox.showerror("❌ Hata", "Geçerli bir sayı girin!")
-    
-    def add_device(self):
-        """Yeni cihaz ekle"""
-        name = self.name_entry.get().strip()
-        ip = self.ip_entry.get().strip()
+    def mark_unreachable(self, device, parent):
+        """Üst cihazı düştüğü için cihazı pinglemeden erişilemez olarak işaretle"""
+        old_status = device.status
+        now = time.time()
+        device.status = STATUS_UNREACHABLE
+        device.last_status_change = now
+        device.recent_failures = 0
+        device.success_streak = 0
+        self.version += 1
+        self.log_message(f"🔌 {device.name} ({device.target}) ERİŞİLEMİYOR: {parent.name} çevrimdışı",
+                         persist=False)
+        self.status_changed(device, old_status, STATUS_UNREACHABLE, now)
+        if self.status_callback is not None:
+            self.status_callback(device)
+        elif self.gui_callback:
+            self.gui_callback(device)
+    
+    def get_topology(self):
+        """Bağımlılık grafiği; cihaz listesi değiştiyse yeniden kurulur (kilit altında).
+        Hiçbir cihazın üst cihazı yoksa None."""
+        if self._topology_generation != self.devices.generation:
+            self._topology_generation = self.devices.generation
+            self.topology = None
+            if any(device.parents for device in self.devices):
+                from topology import Topology
+                self.topology = Topology(self.devices)
+                for warning in self.topology.warnings:
+                    if warning not in self._topology_warnings:
+                        self._topology_warnings.add(warning)
+                        self.log_message(f"⚠️ {warning}", LOG_CHANGE)
+        return self.topology
+    
+    def propagate_status(self, topology, device):
+        """Durumu değişen cihazın alt cihazlarını güncelle.
         
-        if not name or not ip:
-            messagebox.showerror("❌ Hata", "Cihaz adı ve IP adresi gerekli!")
+        Düşen cihazın tüm yolları kesilen alt cihazları (ve onların altındakiler)
+        pinglenmeden erişilemez sayılır; fırtına yerine tek bir log satırı yazılır.
+        Geri gelen cihazın alt cihazları hemen pinglenir.
+        """
+        if device.status == STATUS_ONLINE:
+            now = time.monotonic()
+            with self._cond:
+                for child_id in topology.dependents(device.id):
+                    entry = self._entries.get(child_id)
+                    if entry is not None and not entry[3]:
+                        self._schedule_device(entry[0], now)
+                self._cond.notify_all()
             return
-        
-        # Basit IP format kontrolü
-        if not self.is_valid_ip(ip):
-            messagebox.showerror("❌ Hata", "Geçerli bir IP adresi girin!")
+        if device.status not in (STATUS_OFFLINE, STATUS_UNREACHABLE):
             return
+        marked = 0
+        stack = list(topology.dependents(device.id))
+        while stack:
+            child = self.devices.get(stack.pop())
+            if child is None or child.status == STATUS_UNREACHABLE:
+                continue
+            state, parent = topology.check(child, self.devices)
+            if state != 'down':
+                continue
+            self.mark_unreachable(child, parent)
+            marked += 1
+            stack.extend(topology.dependents(child.id))
+        if marked:
+            self.log_message(f"🔌 {device.name} ({device.target}) erişilemiyor: "
+                             f"{marked} alt cihaz erişilemez olarak işaretlendi", LOG_CHANGE,
+                             event='unreachable', device=device.id, ip=device.ip, count=marked)
+    
+    def next_probe_delay(self, device):
+        """Cihazın bir sonraki pingine kadar beklenecek süre ve doğrulama pingi olup olmadığı"""
+        # Şüpheli bir değişiklik varsa hızlıca doğrula
+        if device.status == STATUS_ONLINE and device.recent_failures & 1:
+            return self.confirm_interval, True
+        if device.status == STATUS_OFFLINE and device.success_streak:
+            return self.confirm_interval, True
+        if device.status == STATUS_UNREACHABLE and (device.recent_failures or device.success_streak):
+            return self.confirm_interval, True
         
-        self.monitor.add_device(name, ip)
-        self.name_entry.delete(0, tk.END)
-        self.ip_entry.delete(0, tk.END)
-        self.update_display()
-        
-        # Başarı mesajı
-        self.log_message(f"✅ Yeni cihaz eklendi: {name} ({ip})")
-    
-    def remove_device(self):
-        """Seçili cihazı sil"""
-        selection = self.device_tree.selection()
-        if not selection:
-            messagebox.showwarning("⚠️ Uyarı", "Silinecek cihazı seçin!")
-            return
+        interval = self.device_interval(device)
+        if not self.adaptive or device.last_status_change is None:
+            return interval, False
         
-        item = self.device_tree.item(selection[0])
-        index = self.device_tree.index(selection[0])
-        device_name = item['values'][0]
+        # Uzun süredir durumu değişmeyen cihazlar daha seyrek pinglenir
+        stable_for = time.time() - device.last_status_change
+        factor = min(self.max_backoff, max(1.0, stable_for / self.backoff_after))
+        return interval * factor, False
+    
+    def record_latency(self, device, timestamp, rtt):
+        """Ping sonucunu cihazın kayan pencere istatistiklerine ekle"""
+        if device.stats is None:
+            device.stats = tuple(RollingLatency(window) for window in self.stats_windows)
+        for stats in device.stats:
+            stats.add(timestamp, rtt)
+    
+    def set_stats_windows(self, windows):
+        """İstatistik pencerelerini değiştir (birikmiş istatistikler sıfırlanır)"""
+        with self._cond:
+            self.stats_windows = tuple(windows)
+            for device in self.devices:
+                device.stats = None
+    
+    def get_device_stats(self, device_id, window=None):
+        """Cihazın gecikme istatistikleri: min/avg/max, p50/p95/p99 (ms), jitter (ms),
+        kayıp (%) ve pencere içindeki ping sayısı. Veri yoksa None.
         
-        if messagebox.askyesno("🗑️ Onay", f"'{device_name}' cihazını silmek istediğinizden emin misiniz?"):
-            self.monitor.remove_device(index)
-            self.update_display()
-            self.log_message(f"🗑️ Cihaz silindi: {device_name}")
+        window verilmezse ilk pencere kullanılır.
+        """
+        device = self.devices.get(device_id)
+        if device is None or device.stats is None:
+            return None
+        for stats in device.stats:
+            if window is None or stats.window == window:
+                return stats.summary(time.time())
+        return None
+    
+    def device_interval(self, device):
+        """Cihazın ping aralığı (cihaza özel yoksa genel aralık)"""
+        return device.interval or self.ping_interval
+    
+    def _schedule_device(self, device, when):
+        """Cihazı verilen zamanda pinglenecek şekilde kuyruğa ekle (kilit altında)"""
+        self._seq += 1
+        key = device.id
+        # Planlanan zaman jittersiz saklanır, böylece jitter sonraki periyotlara birikmez
+        self._entries[key] = [device, self._seq, when, False]
+        jitter = self.ping_jitter if device.jitter is None else device.jitter
+        if jitter:
+            when += random.uniform(0, jitter)
+        heapq.heappush(self._schedule, (when, self._seq, key))
     
-    def is_valid_ip(self, ip):
-        """IP adresi formatını kontrol et"""
+    def _rebuild_schedule(self):
+        """Tüm cihazları aralıklarına yayarak yeniden planla (kilit altında)"""
+        now = time.monotonic()
+        in_flight = {key: entry for key, entry in self._entries.items() if entry[3]}
+        self._schedule = []
+        self._entries = {}
+        count = len(self.devices)
+        devices = self.devices
+        topology = self.get_topology()
+        if topology is not None:
+            # Üst cihazlar alt cihazlarından önce pinglenir
+            devices = sorted(devices, key=lambda device: topology.depth.get(device.id, 0))
+        for index, device in enumerate(devices):
+            key = device.id
+            if key in in_flight:
+                # Sonucu bekleniyor; sonuç gelince kendi aralığıyla yeniden planlanır
+                self._entries[key] = in_flight[key]
+                continue
+            # Pingler toplu gitmesin diye her cihaz aralığın farklı bir noktasına düşer
+            self._schedule_device(device, now + self.device_interval(device) * index / count)
+        self._cond.notify_all()
+    
+    def set_ping_interval(self, seconds):
+        """Genel ping aralığını değiştir; çalışan zamanlayıcıya hemen yansır"""
+        with self._cond:
+            self.ping_interval = seconds
+            if self._shards is not None:
+                self._shards.set_interval(seconds)
+            elif self.monitoring:
+                self._rebuild_schedule()
+    
+    def _probe(self, ip, timeout):
+        """İşçi thread'inde ping at; ölçüm açıksa süresini kaydet"""
+        if self.metrics is None:
+            return self.ping_device(ip, timeout)
+        started = time.perf_counter()
         try:
-            parts = ip.split('.')
-            if len(parts) != 4:
-                return False
-            for part in parts:
-                if not 0 <= int(part) <= 255:
-                    return False
-            return True
-        except:
-            return False
-    
-    def update_display(self):
-        """Cihaz listesini güncelle"""
+            return self.ping_device(ip, timeout)
+        finally:
+            self.metrics.probe_seconds.observe(time.perf_counter() - started)
+    
+    async def _probe_service(self, device, timeout):
+        """TCP/HTTP/DNS kontrolünü asyncio döngüsünde çalıştır; ölçüm açıksa süresini kaydet"""
+        from service_probes import run_probe, probe_host
+        import asyncio
+        started = time.perf_counter()
+        timeout = timeout or self.ping_timeout
+        # Ad çözümleme ve kontrol aynı süre sınırını paylaşır
+        deadline = time.monotonic() + timeout
         try:
-            # Mevcut öğeleri temizle
-            for item in self.device_tree.get_children():
-                self.device_tree.delete(item)
-            
-            online_count = 0
-            offline_count = 0
-            
-            # Cihazları ekle
-            for device in self.monitor.devices:
-                status = device.get('status', 'unknown')
-                last_check = device.get('last_check', '')
+            try:
+                address = await asyncio.wait_for(
+                    self.get_resolver().resolve_async(probe_host(device)), timeout)
+            except asyncio.TimeoutError:
+                address = None
+            remaining = deadline - time.monotonic()
+            if address is None or remaining <= 0:
+                return None
+            return await run_probe(device, remaining, address)
+        except ValueError as e:
+            self.log_message(f"Ping hatası ({device.target}): {e}", event='probe_error',
+                             device=device.id, ip=device.ip, error=str(e))
+            return None
+        finally:
+            if self.metrics is not None:
+                self.metrics.probe_seconds.observe(time.perf_counter() - started)
+    
+    def _on_ping_done(self, run_id, key, seq, future):
+        """Ping tamamlandığında sonucu zamanlayıcı thread'ine ilet"""
+        try:
+            rtt = future.result()
+        except Exception:
+            rtt = None
+        with self._cond:
+            if run_id == self._run_id:
+                self._results.append((key, seq, rtt))
+                self._cond.notify_all()
+    
+    def monitor_devices(self):
+        """Cihazları izleme döngüsü"""
+        # Her cihazın bir sonraki ping zamanı öncelik kuyruğunda tutulur. Zamanı
+        # gelen pingler sınırlı bir iş parçacığı havuzuna verilir; sonuçlar bu
+        # thread'de işlenir ve GUI callback'i eskisi gibi her ping sonrası çağrılır.
+        # Sonraki zaman bir önceki planlanan zamana aralık eklenerek bulunur,
+        # böylece ping süresi periyoda eklenmez ve zamanlama kaymaz.
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_concurrency),
+                                      thread_name_prefix='ping')
+        queued = set()  # havuzda bekleyen ya da süren pingler; kapanışta iptal edilir
+        with self._cond:
+            run_id = self._run_id
+            self._results = []
+            self._entries = {}
+            self._rebuild_schedule()
+            hosts = [device.ip for device in self.devices]
+        # Adlar ilk pinglerden önce arka planda çözümlenmeye başlar
+        self.get_resolver().prefetch(hosts)
+        in_flight = 0
+        finished = []
+        held = []  # üst cihazı düştüğü ya da doğrulandığı için pinglenmeyenler
+        try:
+            while True:
+                due = []
+                with self._cond:
+                    # Sonucu işlenen cihazların bir sonraki pingini planla. Normalde
+                    # planlanan zaman + aralık (geride kaldıysa şimdi); doğrulama
+                    # pinglerinde ise şimdiden kısa bir süre sonrası.
+                    now = time.monotonic()
+                    for entry, _ in finished:
+                        device = entry[0]
+                        if self._entries.get(device.id) is not entry:
+                            continue  # bu arada silinmiş ya da yeniden planlanmış cihaz
+                        delay, confirming = self.next_probe_delay(device)
+                        if confirming:
+                            self._schedule_device(device, now + delay)
+                        else:
+                            self._schedule_device(device, max(entry[2] + delay, now))
+                    # Pinglenmeyenler: üst cihaz doğrulanıyorsa kısa süre sonra, düşmüşse
+                    # normal aralıkla (üst cihaz geri gelince hemen) yeniden denenir
+                    for entry, state, _ in held:
+                        device = entry[0]
+                        if self._entries.get(device.id) is not entry:
+                            continue
+                        if state == 'wait':
+                            self._schedule_device(device, now + self.confirm_interval)
+                        else:
+                            delay, _ = self.next_probe_delay(device)
+                            self._schedule_device(device, max(entry[2] + delay, now))
+                    
+                    while self.monitoring and run_id == self._run_id and not self._results:
+                        now = time.monotonic()
+                        wait = None
+                        if self._schedule and in_flight < self.max_concurrency:
+                            wait = self._schedule[0][0] - now
+                        if self._state_dirty_since is not None:
+                            save_wait = self._state_dirty_since + self.state_save_delay - now
+                            wait = save_wait if wait is None else min(wait, save_wait)
+                        if wait is not None and wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    if not self.monitoring or run_id != self._run_id:
+                        break
+                    
+                    results, self._results = self._results, []
+                    metrics = self.metrics
+                    if metrics is not None and results:
+                        metrics.results_batch.observe(len(results))
+                    finished = []
+                    for key, seq, rtt in results:
+                        in_flight -= 1
+                        entry = self._entries.get(key)
+                        if entry is None or entry[1] != seq:
+                            continue  # bu arada silinmiş cihaz
+                        finished.append((entry, rtt))
+                    
+                    now = time.monotonic()
+                    topology = self.get_topology()
+                    held = []
+                    while (self._schedule and self._schedule[0][0] <= now
+                           and in_flight + len(due) < self.max_concurrency):
+                        when, seq, key = heapq.heappop(self._schedule)
+                        entry = self._entries.get(key)
+                        if entry is None or entry[1] != seq:
+                            continue  # silinmiş ya da yeniden planlanmış cihaz
+                        if topology is not None:
+                            state, parent = topology.check(entry[0], self.devices)
+                            if state is not None:
+                                held.append((entry, state, parent))
+                                continue
+                        entry[3] = True
+                        due.append(entry)
+                        if metrics is not None:
+                            metrics.schedule_lag.observe(now - when)
                 
-                if last_check:
-                    try:
-                        dt = datetime.fromisoformat(last_check)
-                        last_check = dt.strftime("%H:%M:%S")
-                    except:
-                        pass
+                for entry, rtt in finished:
+                    device = entry[0]
+                    old_status = device.status
+                    self.check_device(device, rtt)
+                    if metrics is not None:
+                        metrics.probe_done(rtt, device.id, self.devices)
+                    
+                    # GUI'ye değişen cihazı bildir (GUI bunu kendi thread'inde işler)
+                    if self.gui_callback:
+                        self.gui_callback(device)
+                    if topology is not None and device.status != old_status:
+                        self.propagate_status(topology, device)
                 
-                # Status sayacı
-                if status == 'online':
-                    online_count += 1
-                    status_text = "🟢 ÇEVRİMİÇİ"
-                elif status == 'offline':
-                    offline_count += 1
-                    status_text = "🔴 ÇEVRİMDIŞI"
-                else:
-                    status_text = "⚪ BİLİNMİYOR"
+                for entry, state, parent in held:
+                    if metrics is not None:
+                        metrics.probe_held(entry[0].id, self.devices)
+                    if state == 'down' and entry[0].status != STATUS_UNREACHABLE:
+                        self.mark_unreachable(entry[0], parent)
                 
-                self.device_tree.insert('', 'end', values=(
-                    device.get('name', ''),
-                    device.get('ip', ''),
-                    status_text,
-                    last_check
-                ))
-            
-            # Status göstergelerini güncelle
-            self.status_online.config(text=f"🟢 Çevrimiçi: {online_count}")
-            self.status_offline.config(text=f"🔴 Çevrimdışı: {offline_count}")
-            
-        except Exception as e:
-            # GUI güncelleme hatası
-            pass
+                for device, seq, _, _ in due:
+                    self.log_message(f"{device.name} ({device.target}) ping atılıyor...", LOG_DEBUG)
+                    if device.type and device.type != 'icmp':
+                        # Servis kontrolleri thread kullanmadan asyncio döngüsünde çalışır
+                        future = self.get_probe_loop().submit(self._probe_service(device, device.timeout))
+                    else:
+                        future = executor.submit(self._probe, device.ip, device.timeout)
+                        queued.add(future)
+                        future.add_done_callback(queued.discard)
+                    future.add_done_callback(
+                        lambda f, k=device.id, s=seq: self._on_ping_done(run_id, k, s, f))
+                    in_flight += 1
+                if metrics is not None:
+                    metrics.in_flight = in_flight
+                
+                # Durum değiştiyse, değişiklikler birikince tek seferde kaydet
+                if (self._state_dirty_since is not None
+                        and time.monotonic() - self._state_dirty_since >= self.state_save_delay):
+                    self.save_state()
+        finally:
+            # Henüz başlamamış pingler iptal edilir (cancel_futures Python 3.9+)
+            for future in list(queued):
+                future.cancel()
+            executor.shutdown(wait=False)
+            self.save_state()
     
-    def process_log_queue(self):
-        """Log kuyruğunu işle"""
+    def monitor_shards(self):
+        """Çok işlemli ya da dağıtık izleme: cihazlar işçi işlemlerine veya ajanlara
+        bölünür, sonuçlar burada işlenir"""
+        with self._cond:
+            run_id = self._run_id
+            try:
+                if self.coordinator_address:
+                    from cluster import Coordinator
+                    self._shards = Coordinator(self, *self.coordinator_address, token=self.cluster_token)
+                else:
+                    from sharding import ShardPool
+                    self._shards = ShardPool(self, self.workers)
+            except OSError as e:
+                self.log_message(f"Koordinatör başlatılamadı: {e}", LOG_CHANGE)
+                return
         try:
-            while True:
-                log_entry = self.monitor.log_queue.get_nowait()
-                self.log_text.insert(tk.END, log_entry + "\n")
-                self.log_text.see(tk.END)
-        except queue.Empty:
+            self._shards.run(run_id)
+        finally:
+            with self._cond:
+                self._shards = None
+    
+    def start_monitoring(self):
+        """İzlemeyi başlat; 'socket' arka ucunda ICMP soketi açılamazsa OSError"""
+        if self.ping_backend == 'socket' and not self.coordinator_address:
+            self.get_icmp_pinger()
+        with self._cond:
+            if self.monitoring:
+                return
+            self.monitoring = True
+            self._run_id += 1
+        if self.history is None and self.history_file:
+            try:
+                self.history = HistoryStore(self.history_file, log=self.log_message)
+                if self._legacy_history_keys:
+                    self.history.rename_devices(self._legacy_history_keys)
+                    self._legacy_history_keys = {}
+            except Exception as e:
+                self.log_message(f"Ping geçmişi açılamadı: {e}")
+        if self.workers > 1 or self.coordinator_address:
+            self.monitor_thread = threading.Thread(target=self.monitor_shards, daemon=True)
+        else:
+            self.monitor_thread = threading.Thread(target=self.monitor_devices, daemon=True)
+        self.monitor_thread.start()
+        self.log_message("İzleme başlatıldı")
+    
+    def stop_monitoring(self):
+        """İzlemeyi durdur"""
+        with self._cond:
+            self.monitoring = False
+            self._cond.notify_all()
+        self.log_message("İzleme durduruldu")
+    
+    def close(self):
+        """İzlemeyi durdur, durum ve geçmiş kayıtlarını diske yaz"""
+        if self.monitoring:
+            self.stop_monitoring()
+        # İzleme thread'i çıkarken durum dosyasını kaydeder; bitmesini bekle
+        thread = getattr(self, 'monitor_thread', None)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        # Son durumlar kaydedildi; bir sonraki açılış önbellekten yapılır
+        self.save_cache()
+        if self.alerts:
+            self.alerts.close()
+            self.alerts = None
+        if self.history:
+            self.history.close()
+            self.history = None
+        if self._probe_loop:
+            self._probe_loop.close()
+            self._probe_loop = None
+        with self._icmp_lock:
+            pingers, self._icmp_pingers = self._icmp_pingers, {}
+        for pinger in pingers.values():
+            pinger.close()
+        if self.resolver:
+            self.resolver.close()
+            self.resolver = None
+        if self.metrics_server:
+            self.metrics_server.close()
+            self.metrics_server = None
+        if self.api_server:
+            self.api_server.close()
+            self.api_server = None
+        # Son olarak kuyruktaki log satırlarını yaz; sonraki loglar doğrudan konsola gider
+        with self._log_lock:
+            writer, self.log_writer = self.log_writer, None
+            self._log_closed = True
+        if writer is not None:
+            writer.close()
+    
+    def enable_metrics(self, port=None, host='127.0.0.1'):
+        """Ölçümleri aç; port verilirse /metrics adresinden HTTP ile sun"""
+        from metrics import Metrics, MetricsServer
+        if self.metrics is None:
+            self.metrics = Metrics()
+        if port is not None and self.metrics_server is None:
+            self.metrics_server = MetricsServer(self, host, port)
+            self.log_message(f"Metrikler: http://{host}:{self.metrics_server.address[1]}/metrics")
+        return self.metrics
+    
+    def enable_api(self, port, host='127.0.0.1'):
+        """Salt okunur JSON durum API'sini başlat"""
+        from status_api import StatusAPI
+        if self.api_server is None:
+            self.api_server = StatusAPI(self, host, port)
+            self.log_message(f"Durum API'si: http://{host}:{self.api_server.address[1]}/api/devices")
+        return self.api_server
+    
+    def enable_event_log(self, path, max_bytes=None, rotate_interval=None, backups=None):
+        """Olayları JSON-lines dosyasına yaz; dosya boyut ve süreye göre döndürülür"""
+        import event_log
+        with self._log_lock:
+            old = self.log_writer
+            self.log_writer = LogWriter(
+                path, sys.stdout,
+                event_log.MAX_BYTES if max_bytes is None else max_bytes,
+                event_log.ROTATE_INTERVAL if rotate_interval is None else rotate_interval,
+                event_log.BACKUPS if backups is None else backups)
+        if old is not None:
+            old.close()
+        self.log_message(f"Olay günlüğü: {path}")
+        return self.log_writer
+    
+    def enable_alerts(self, webhooks=(), commands=(), smtp=None, mail_from=None, mail_to=(),
+                      coalesce_delay=None, rate_limit=None):
+        """Durum değişikliklerini webhook, komut ve e-postayla bildir"""
+        import alerts
+        if self.alerts is None:
+            sinks = alerts.build_sinks(webhooks, commands, smtp, mail_from, mail_to)
+            self.alerts = alerts.AlertBus(
+                self, sinks,
+                alerts.COALESCE_DELAY if coalesce_delay is None else coalesce_delay,
+                alerts.RATE_LIMIT if rate_limit is None else rate_limit)
+            self.log_message(f"Bildirimler: {', '.join(sink.name for sink in sinks)}")
+        return self.alerts
+    
+    def add_device(self, name, ip, **options):
+        """Yeni cihaz ekle; hedef zaten kayıtlıysa None döndür.
+
+        Hedef IPv4/IPv6 adresi ya da ana bilgisayar adı olabilir; geçersizse ValueError.
+        """
+        if not valid_host(ip):
+            raise ValueError(f"Geçersiz hedef: {ip}")
+        ip = normalize_host(ip)
+        device = Device.from_dict(dict(options, name=name, ip=ip))
+        with self._cond:
+            if not self.devices.add(device):
+                self.log_message(f"Cihaz zaten kayıtlı: {device.target}")
+                return None
+            self.version += 1
+            self.state_version += 1
+            if self._shards is not None:
+                self._shards.add([device])
+            elif self.monitoring:
+                # Yeni cihaza hemen ping at
+                self._schedule_device(device, time.monotonic())
+                self._cond.notify_all()
+                self.get_resolver().prefetch((device.ip,))
+        self.save_devices()
+        self.log_message(f"Yeni cihaz eklendi: {name} ({ip})", event='device_added',
+                         device=device.id, name=name, ip=ip)
+        return device
+    
+    def import_devices(self, devices):
+        """Cihaz sözlüklerini toplu ekle; kayıtlı IP'ler atlanır, liste bir kez kaydedilir"""
+        added = []
+        skipped = 0
+        invalid = 0
+        with self._cond:
+            for data in devices:
+                data = dict(data)
+                data.pop('id', None)
+                if not valid_host(str(data.get('ip') or '')):
+                    invalid += 1
+                    continue
+                data['ip'] = normalize_host(data['ip'])
+                device = Device.from_dict(data)
+                if self.devices.add(device):
+                    added.append(device)
+                else:
+                    skipped += 1
+            self.version += 1
+            self.state_version += 1
+            if self._shards is not None and added:
+                self._shards.add(added)
+            elif self.monitoring and added:
+                # Yeni cihazların pingleri aynı anda gitmesin, aralığa yayılsın
+                now = time.monotonic()
+                for index, device in enumerate(added):
+                    self._schedule_device(device, now + self.device_interval(device) * index / len(added))
+                self._cond.notify_all()
+                self.get_resolver().prefetch(device.ip for device in added)
+        if added:
+            self.save_devices()
+        message = f"{len(added)} cihaz içe aktarıldı ({skipped} tekrarlanan atlandı)"
+        if invalid:
+            message += f", {invalid} geçersiz hedef atlandı"
+        self.log_message(message)
+        return added
+    
+    def import_targets(self, spec, name=None, **options):
+        """CIDR, IP aralığı, tek IP ya da ana bilgisayar adı ifadesindeki hedefleri ekle"""
+        devices = [dict(options, name=f"{name} {ip}" if name else ip, ip=ip)
+                   for ip in expand_targets(spec)]
+        return self.import_devices(devices)
+    
+    def import_file(self, path):
+        """CSV ya da JSON dosyasındaki cihazları ekle"""
+        return self.import_devices(read_device_file(path))
+    
+    def remove_device(self, device_id):
+        """Cihaz sil"""
+        with self._cond:
+            device = self.devices.remove(device_id)
+            if device is None:
+                return
+            self._entries.pop(device_id, None)
+            self.version += 1
+            self.state_version += 1
+            if self._shards is not None:
+                self._shards.remove([device_id])
+        self.save_devices()
+        self.log_message(f"Cihaz silindi: {device.name} ({device.ip})", event='device_removed',
+                         device=device.id, name=device.name, ip=device.ip)
+
+def confirm_spec(text):
+    """"N/M" doğrulama ifadesini (N, M) olarak ayrıştır"""
+    failures, _, window = text.partition('/')
+    try:
+        failures = int(failures)
+        window = int(window or failures)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Geçersiz doğrulama ifadesi: {text}")
+    if not 1 <= failures <= window:
+        raise argparse.ArgumentTypeError(f"N 1 ile M arasında olmalı: {text}")
+    return failures, window
+
+
+def parse_args(argv=None):
+    """Komut satırı argümanlarını ayrıştır"""
+    parser = argparse.ArgumentParser(description="Ping Monitor - Cihaz İzleme Uygulaması")
+    parser.add_argument('--headless', action='store_true',
+                        help="GUI olmadan servis (daemon) modunda çalış")
+    parser.add_argument('--devices', default='devices.json', help="Cihaz listesi dosyası")
+    parser.add_argument('--state', default=None, help="Cihaz durum dosyası")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Cihaz listesinin ikili önbelleğini (devices.cache) kullanma")
+    parser.add_argument('--history', default='history.db', help="Ping geçmişi veritabanı")
+    parser.add_argument('--no-history', action='store_true', help="Ping geçmişini kaydetme")
+    parser.add_argument('--interval', type=int, default=30, help="Ping aralığı (saniye)")
+    parser.add_argument('--timeout', type=float, default=5, help="Ping zaman aşımı (saniye)")
+    parser.add_argument('--concurrency', type=int, default=32, help="Aynı anda en fazla ping sayısı")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Cihazları bu kadar işçi işlemine böl (çok çekirdekli mod, varsayılan: kapalı)")
+    parser.add_argument('--coordinator', type=int, metavar='PORT',
+                        help="Koordinatör modu: cihazları bu porttan bağlanan ajanlara dağıt")
+    parser.add_argument('--coordinator-host', default='127.0.0.1',
+                        help="Koordinatörün dinleyeceği adres (varsayılan: 127.0.0.1)")
+    parser.add_argument('--agent', metavar='URL',
+                        help="Ajan modu: cihaz listesini bu koordinatörden al (ör. http://merkez:8765)")
+    parser.add_argument('--agent-name', help="Ajan adı (varsayılan: bilgisayar adı)")
+    parser.add_argument('--cluster-token', help="Koordinatör ile ajanlar arasındaki ortak parola")
+    parser.add_argument('--backend', choices=('auto', 'socket', 'subprocess'), default='auto',
+                        help="Ping yöntemi")
+    parser.add_argument('--dns-ttl', type=float, default=DEFAULT_TTL, metavar='SANİYE',
+                        help=f"Çözümlenen adların önbellekte kalma süresi (varsayılan {DEFAULT_TTL})")
+    parser.add_argument('--dns-negative-ttl', type=float, default=DEFAULT_NEGATIVE_TTL, metavar='SANİYE',
+                        help="Çözümlenemeyen adların yeniden denenmesine kadar geçen süre "
+                             f"(varsayılan {DEFAULT_NEGATIVE_TTL})")
+    parser.add_argument('--log-level', choices=tuple(LOG_LEVELS), default='info', help="Log seviyesi")
+    parser.add_argument('--log-file', metavar='DOSYA',
+                        help="Olayları JSON-lines olarak bu dosyaya yaz (ör. events.jsonl, varsayılan: kapalı)")
+    parser.add_argument('--log-max-size', type=float, default=50, metavar='MB',
+                        help="Olay günlüğü bu boyuta ulaşınca yeni dosyaya geç (varsayılan 50)")
+    parser.add_argument('--log-rotate', type=float, default=24, metavar='SAAT',
+                        help="Olay günlüğünü en geç bu sürede bir yeni dosyaya geç (varsayılan 24)")
+    parser.add_argument('--log-backups', type=int, default=14, metavar='N',
+                        help="Saklanacak eski (gzip ile sıkıştırılmış) günlük dosyası sayısı (varsayılan 14)")
+    parser.add_argument('--confirm', type=confirm_spec, default=(3, 5), metavar='N/M',
+                        help="Çevrimdışı saymak için son M pingin en az N'i başarısız olmalı (varsayılan 3/5)")
+    parser.add_argument('--no-adaptive', action='store_true',
+                        help="Durumu uzun süredir değişmeyen cihazların aralığını uzatma")
+    parser.add_argument('--metrics-port', type=int,
+                        help="Metrikleri bu porttan Prometheus biçiminde sun (varsayılan: kapalı)")
+    parser.add_argument('--metrics-host', default='127.0.0.1',
+                        help="Metrik sunucusunun dinleyeceği adres (varsayılan: 127.0.0.1)")
+    parser.add_argument('--api-port', type=int,
+                        help="Salt okunur JSON durum API'sini bu portta aç (varsayılan: kapalı)")
+    parser.add_argument('--api-host', default='127.0.0.1',
+                        help="Durum API'sinin dinleyeceği adres (varsayılan: 127.0.0.1)")
+    parser.add_argument('--webhook', dest='webhooks', action='append', default=[], metavar='URL',
+                        help="Durum değişikliklerini bu adrese JSON olarak POST et (birden çok kez verilebilir)")
+    parser.add_argument('--alert-command', dest='alert_commands', action='append', default=[],
+                        metavar='KOMUT', help="Durum değişikliğinde çalıştırılacak komut; bildirim JSON "
+                                              "olarak standart girdiden verilir (birden çok kez verilebilir)")
+    parser.add_argument('--mail-to', action='append', default=[], metavar='ADRES',
+                        help="Durum değişikliklerini bu adrese e-postayla gönder (birden çok kez verilebilir)")
+    parser.add_argument('--mail-from', help="Bildirim e-postalarının gönderen adresi")
+    parser.add_argument('--smtp', default='localhost:25', metavar='SUNUCU[:PORT]',
+                        help="E-posta için SMTP sunucusu (varsayılan: localhost:25)")
+    parser.add_argument('--alert-delay', type=float, default=10, metavar='SANİYE',
+                        help="Bu süre içindeki değişiklikleri tek bildirimde topla (varsayılan 10)")
+    parser.add_argument('--alert-rate', type=int, default=6, metavar='N',
+                        help="Kanal başına dakikada en fazla bildirim (varsayılan 6, 0: sınırsız)")
+    parser.add_argument('--stats-window', dest='stats_windows', type=int, action='append',
+                        metavar='SANİYE', help="Gecikme/kayıp istatistik penceresi (varsayılan 300, "
+                                               "birden çok kez verilebilir)")
+    parser.add_argument('--import', dest='imports', action='append', default=[], metavar='KAYNAK',
+                        help="Başlarken cihaz ekle: CIDR, IP aralığı, CSV ya da JSON dosyası "
+                             "(birden çok kez verilebilir)")
+    return parser.parse_args(argv)
+
+def create_monitor(args, gui_callback=None):
+    """Argümanlara göre yapılandırılmış PingMonitor oluştur"""
+    monitor = PingMonitor(gui_callback=gui_callback,
+                          history_file=None if args.no_history else args.history,
+                          devices_file=args.devices, state_file=args.state,
+                          cache_file=False if args.no_cache else None)
+    monitor.ping_interval = args.interval
+    monitor.ping_timeout = args.timeout
+    monitor.max_concurrency = args.concurrency
+    monitor.workers = args.workers
+    if args.coordinator is not None:
+        monitor.coordinator_address = (args.coordinator_host, args.coordinator)
+    monitor.cluster_token = args.cluster_token
+    monitor.ping_backend = args.backend
+    monitor.dns_ttl = args.dns_ttl
+    monitor.dns_negative_ttl = args.dns_negative_ttl
+    monitor.log_level = LOG_LEVELS[args.log_level]
+    if args.log_file:
+        try:
+            monitor.enable_event_log(args.log_file, int(args.log_max_size * 1024 ** 2),
+                                     args.log_rotate * 3600, args.log_backups)
+        except OSError as e:
+            monitor.log_message(f"Olay günlüğü açılamadı: {e}")
+    monitor.confirm_failures, monitor.confirm_window = args.confirm
+    monitor.adaptive = not args.no_adaptive
+    if args.stats_windows:
+        monitor.set_stats_windows(args.stats_windows)
+    if args.metrics_port is not None:
+        try:
+            monitor.enable_metrics(args.metrics_port, args.metrics_host)
+        except OSError as e:
+            monitor.log_message(f"Metrik sunucusu açılamadı: {e}")
+    if args.api_port is not None:
+        try:
+            monitor.enable_api(args.api_port, args.api_host)
+        except OSError as e:
+            monitor.log_message(f"Durum API'si açılamadı: {e}")
+    if args.webhooks or args.alert_commands or args.mail_to:
+        monitor.enable_alerts(args.webhooks, args.alert_commands, args.smtp, args.mail_from,
+                              args.mail_to, args.alert_delay, args.alert_rate)
+    for source in args.imports:
+        try:
+            if os.path.isfile(source):
+                monitor.import_file(source)
+            else:
+                monitor.import_targets(source)
+        except (OSError, ValueError) as e:
+            monitor.log_message(f"İçe aktarma hatası ({source}): {e}")
+    return monitor
+
+def run_headless(args):
+    """GUI olmadan izle; SIGINT/SIGTERM gelince düzgünce kapan"""
+    monitor = create_monitor(args)
+    # Loglar yalnızca konsola yazılır, tamponda biriktirmeye gerek yok
+    monitor.set_log_buffer_size(1)
+    stop_event = threading.Event()
+    
+    def handle_signal(signum, frame):
+        stop_event.set()
+    
+    for name in ('SIGINT', 'SIGTERM', 'SIGHUP'):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), handle_signal)
+    
+    monitor.log_message(f"Servis modu: {len(monitor.devices)} cihaz izlenecek ({args.devices})")
+    try:
+        monitor.start_monitoring()
+    except OSError as e:
+        monitor.log_message(f"İzleme başlatılamadı: {e}", LOG_CHANGE)
+        monitor.close()
+        return 1
+    try:
+        while not stop_event.wait(1):
             pass
-        
-        # Her 100ms'de bir kontrol et
-        self.root.after(100, self.process_log_queue)
-    
-    def clear_logs(self):
-        """Log kayıtlarını temizle"""
-        self.log_text.delete(1.0, tk.END)
-        self.log_message("🗑️ Log kayıtları temizlendi!")
-    
-    def animate_button(self, button, color):
-        """Buton animasyonu"""
-        original_color = button.cget('background')
-        button.configure(background=color)
-        self.root.after(200, lambda: button.configure(background=original_color))
-    
-    def log_message(self, message):
-        """Log mesajını ekle"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)
-    
-    def run(self):
-        """Uygulamayı çalıştır"""
-        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-        self.root.mainloop()
-    
-    def on_closing(self):
-        """Uygulama kapatılırken"""
-        if self.monitor.monitoring:
-            self.monitor.stop_monitoring()
-        self.root.destroy()
+    finally:
+        monitor.close()
+    return 0
 
-def main():
+def main(argv=None):
     """Ana fonksiyon"""
+    args = parse_args(argv)
+    if args.agent:
+        from cluster import run_agent
+        return run_agent(args)
+    if args.headless:
+        return run_headless(args)
+    
     print("Ping Monitor uygulaması başlatılıyor...")
-    app = PingMonitorGUI()
+    # tkinter yalnızca GUI modunda yüklenir
+    from ping_monitor_gui import PingMonitorGUI
+    app = PingMonitorGUI(args)
     app.run()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
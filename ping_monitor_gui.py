@@ -0,0 +1,983 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - tkinter tabanlı grafik arayüz
+"""
+
+import bisect
+import ipaddress
+import re
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog, filedialog
+
+from event_log import LOG_DEBUG, LOG_INFO, LOG_CHANGE
+from ping_monitor import create_monitor, parse_args
+from device_registry import (STATUS_UNKNOWN, STATUS_ONLINE, STATUS_OFFLINE, STATUS_UNREACHABLE,
+                             format_clock, normalize_host, valid_host)
+
+# Durum kodlarının tablodaki karşılıkları
+STATUS_TEXTS = ("⚪ BİLİNMİYOR", "🟢 ÇEVRİMİÇİ", "🔴 ÇEVRİMDIŞI", "🟠 ERİŞİLEMİYOR")
+
+# Durum filtresi seçenekleri
+STATUS_FILTERS = {'Tümü': None, 'Çevrimiçi': STATUS_ONLINE,
+                  'Çevrimdışı': STATUS_OFFLINE, 'Erişilemiyor': STATUS_UNREACHABLE,
+                  'Bilinmiyor': STATUS_UNKNOWN}
+
+# Log penceresinde tutulacak en fazla satır sayısı
+LOG_MAX_LINES = 2000
+
+# GUI cihaz tablosunu en fazla bu sıklıkta yeniler (ms)
+DISPLAY_REFRESH_MS = 250
+
+# Sıralama ya da durum filtresi değişen değerlere bağlıysa görünüm en fazla bu sıklıkta yeniden sıralanır (ms)
+VIEW_REBUILD_MS = 1000
+
+# Arama kutusuna yazmayı bitirdikten sonra filtreleme için beklenen süre (ms)
+SEARCH_DELAY_MS = 200
+
+# Fare tekerleğinin bir adımında kaydırılan satır sayısı
+WHEEL_ROWS = 3
+
+# IP öneki gibi görünen arama metni (yalnızca IP dizininden aranır)
+IP_PREFIX = re.compile(r'[0-9a-f]*[.:][0-9a-f.:]*')
+
+def format_ms(value):
+    """Milisaniye değerini tablo için biçimlendir"""
+    if value is None:
+        return ''
+    return f"{value:.1f} ms" if value < 100 else f"{value:.0f} ms"
+
+def ip_sort_key(ip):
+    """IP adreslerini sayısal, diğer hedefleri alfabetik sırala"""
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return (1, 0, ip)
+    return (0, address.version, int(address))
+
+def name_grams(name):
+    """Küçük harfli adın üçlü harf grupları; üç harften kısa adlarda adın kendisi"""
+    if len(name) < 3:
+        return {name}
+    return {name[index:index + 3] for index in range(len(name) - 2)}
+
+def stats_key(name):
+    def key(device, now):
+        stats = device.stats[0].summary(now) if device.stats else None
+        return None if stats is None else stats.get(name)
+    return key
+
+# Sıralanabilir sütunlar: sütun -> (anahtar fonksiyonu, değer ping sonuçlarıyla değişir mi)
+SORT_KEYS = {
+    'Name': (lambda device, now: device.name.casefold(), False),
+    'IP': (lambda device, now: ip_sort_key(device.ip), False),
+    'Status': (lambda device, now: device.status, True),
+    'Last Check': (lambda device, now: device.last_check, True),
+    'RTT': (lambda device, now: device.last_rtt, True),
+    'Avg': (stats_key('avg'), True),
+    'P95': (stats_key('p95'), True),
+    'Jitter': (stats_key('jitter'), True),
+    'Loss': (stats_key('loss'), True),
+}
+
+class DeviceListModel:
+    """Cihaz tablosunun verisi: filtre dizinleri, sıralı görünüm ve durum sayaçları.
+
+    Tablo yalnızca ekranda görünen satırları çizer; hangi cihazların hangi
+    sırayla gösterileceğini bu sınıf tutar. Durum sayaçları her ping sonucunda
+    artırılıp azaltılır, yenilemelerde tüm liste yeniden sayılmaz.
+    """
+    
+    def __init__(self):
+        self.devices = {}         # kimlik -> cihaz (ekleme sırasıyla)
+        self.counts = [0] * len(STATUS_TEXTS)  # durum koduna göre cihaz sayısı
+        self.view = []            # filtreden geçen cihaz kimlikleri, gösterim sırasıyla
+        self.search = ''
+        self.status_filter = None
+        self.sort_column = None
+        self.sort_reverse = False
+        self._status = {}         # kimlik -> sayaçlarda sayılan durum
+        self._indexed = {}        # kimlik -> dizine eklenen (ad, ip)
+        self._names = {}          # kimlik -> küçük harfli ad
+        self._grams = {}          # küçük harfli addaki üçlü harf grubu -> kimlikler
+        self._by_status = [set() for _ in STATUS_TEXTS]  # durum kodu -> kimlikler
+        self._by_ip = []          # (küçük harfli ip, kimlik) sıralı; IP öneki araması için
+        self._order = {}          # kimlik -> ekleme sırası
+        self._next_order = 0
+    
+    def sync(self, devices):
+        """Monitördeki cihaz listesiyle eşitle; eklenen ya da silinen varsa True"""
+        current = {}
+        added = []
+        removed = set()
+        for device in devices:
+            current[device.id] = device
+            if self._indexed.get(device.id) != (device.name, device.ip):
+                if device.id in self.devices:
+                    self._unindex(device.id)
+                    removed.add(device.id)
+                added.append(device)
+            else:
+                self.devices[device.id] = device
+                self.update(device)
+        for device_id in [device_id for device_id in self.devices if device_id not in current]:
+            self._unindex(device_id)
+            removed.add(device_id)
+        
+        # IP dizini toplu güncellenir (binlerce cihaz tek tek eklenirken yavaşlamasın)
+        if removed:
+            self._by_ip = [item for item in self._by_ip if item[1] not in removed]
+        for device in added:
+            self._index(device)
+        if added:
+            self._by_ip.extend((device.ip.casefold(), device.id) for device in added)
+            self._by_ip.sort()
+        return bool(added or removed)
+    
+    def _index(self, device):
+        device_id = device.id
+        self.devices[device_id] = device
+        self._indexed[device_id] = (device.name, device.ip)
+        name = self._names[device_id] = device.name.casefold()
+        grams = self._grams
+        for gram in name_grams(name):
+            ids = grams.get(gram)
+            if ids is None:
+                grams[gram] = {device_id}
+            else:
+                ids.add(device_id)
+        self._order[device_id] = self._next_order
+        self._next_order += 1
+        self._status[device_id] = device.status
+        self._by_status[device.status].add(device_id)
+        self.counts[device.status] += 1
+    
+    def _unindex(self, device_id):
+        del self._indexed[device_id]
+        del self.devices[device_id]
+        grams = self._grams
+        for gram in name_grams(self._names.pop(device_id)):
+            ids = grams[gram]
+            ids.discard(device_id)
+            if not ids:
+                del grams[gram]
+        del self._order[device_id]
+        status = self._status.pop(device_id)
+        self._by_status[status].discard(device_id)
+        self.counts[status] -= 1
+    
+    def update(self, device):
+        """Ping sonucunu sayaçlara işle; cihazın durumu değiştiyse True"""
+        old_status = self._status.get(device.id)
+        if old_status is None or old_status == device.status:
+            return False
+        self.counts[old_status] -= 1
+        self.counts[device.status] += 1
+        self._by_status[old_status].discard(device.id)
+        self._by_status[device.status].add(device.id)
+        self._status[device.id] = device.status
+        return True
+    
+    def _name_matches(self, text):
+        """Adında arama metni geçen kimlikler (üçlü harf grubu dizininden)"""
+        grams = self._grams
+        if len(text) < 3:
+            # Kısa metin, adın en az bir üçlü grubunun (ya da kısa adın) içindedir;
+            # dizin anahtarları cihaz sayısıyla değil harf çeşitliliğiyle büyür
+            matches = set()
+            for gram, ids in grams.items():
+                if text in gram:
+                    matches |= ids
+            return matches
+        postings = sorted((grams.get(gram, ()) for gram in name_grams(text)), key=len)
+        matches = set(postings[0])
+        for ids in postings[1:]:
+            if not matches:
+                break
+            matches &= ids
+        if len(text) > 3:
+            # Üçlü grupların hepsi adda geçse de sıraları tutmayabilir
+            names = self._names
+            matches = {device_id for device_id in matches if text in names[device_id]}
+        return matches
+    
+    def _matches(self):
+        """Arama metnine ve durum filtresine uyan kimlikler (ekleme sırasıyla)"""
+        text = self.search.strip().casefold()
+        selected = None if self.status_filter is None else self._by_status[self.status_filter]
+        if not text:
+            if selected is None:
+                return list(self.devices)
+            return sorted(selected, key=self._order.__getitem__)
+        # IP öneki: sıralı dizinde ikili arama
+        by_ip = self._by_ip
+        index = bisect.bisect_left(by_ip, (text,))
+        matches = set()
+        while index < len(by_ip) and by_ip[index][0].startswith(text):
+            matches.add(by_ip[index][1])
+            index += 1
+        if not IP_PREFIX.fullmatch(text):
+            matches |= self._name_matches(text)
+        if selected is not None:
+            matches &= selected
+        return sorted(matches, key=self._order.__getitem__)
+    
+    def rebuild(self):
+        """Filtre ve sıralamayı uygulayıp görünümü yeniden oluştur"""
+        view = self._matches()
+        if self.sort_column is not None:
+            key, _ = SORT_KEYS[self.sort_column]
+            devices = self.devices
+            now = time.time()
+            # Değeri olmayanlar (ör. henüz pinglenmemiş) her iki yönde de sonda
+            keyed = [(key(devices[device_id], now), device_id) for device_id in view]
+            present = [item for item in keyed if item[0] is not None]
+            present.sort(key=lambda item: item[0], reverse=self.sort_reverse)
+            view = [device_id for _, device_id in present]
+            view.extend(device_id for value, device_id in keyed if value is None)
+        self.view = view
+        return view
+
+# Modern renk paleti
+class Colors:
+    PRIMARY = "#2E3440"      # Koyu gri
+    SECONDARY = "#3B4252"    # Orta gri
+    ACCENT = "#5E81AC"       # Mavi
+    SUCCESS = "#A3BE8C"      # Yeşil
+    WARNING = "#EBCB8B"       # Sarı
+    ERROR = "#BF616A"        # Kırmızı
+    TEXT = "#ECEFF4"         # Açık gri
+    BACKGROUND = "#1E1E1E"   # Çok koyu gri
+    CARD = "#2D3748"         # Kart rengi
+    BORDER = "#4A5568"       # Kenarlık rengi
+
+class PingMonitorGUI:
+    def __init__(self, args=None):
+        self.root = tk.Tk()
+        self.root.title("🔍 Ping Monitor - Cihaz İzleme Uygulaması")
+        self.root.geometry("1000x700")
+        self.root.configure(bg=Colors.BACKGROUND)
+        
+        # Modern tema ayarları
+        self.setup_theme()
+        
+        # Monitor thread'inden gelen güncellemeler burada biriktirilir ve
+        # Tk ana döngüsünde toplu olarak uygulanır
+        self._pending_lock = threading.Lock()
+        self._pending_devices = {}
+        
+        # Tabloda yalnızca görünen satırlar kadar öğe vardır; kaydırınca
+        # aynı öğelere sıradaki cihazların değerleri yazılır
+        self.model = DeviceListModel()
+        self._rows = {}      # Treeview satır id -> gösterilen değerler
+        self._slots = {}     # Treeview satır id -> gösterilen cihaz kimliği
+        self._visible = {}   # cihaz kimliği -> Treeview satır id
+        self._offset = 0     # görünümde ilk görünen satırın sırası
+        self._selected_id = None
+        self._view_dirty = False
+        self._view_built = 0.0
+        self._search_job = None
+        
+        # Monitor'u GUI callback ile başlat
+        self.monitor = create_monitor(args or parse_args([]), gui_callback=self.on_device_update)
+        
+        self.setup_gui()
+        self.update_display()
+        self.process_log_queue()
+        self.flush_device_updates()
+    
+    def setup_theme(self):
+        """Modern tema ayarlarını yapılandır"""
+        style = ttk.Style()
+        
+        # Modern tema stilleri
+        style.theme_use('clam')
+        
+        # Ana frame stili
+        style.configure('Main.TFrame', 
+                       background=Colors.BACKGROUND,
+                       relief='flat')
+        
+        # Kart stili
+        style.configure('Card.TFrame',
+                       background=Colors.CARD,
+                       relief='flat',
+                       borderwidth=1)
+        
+        # Başlık stili
+        style.configure('Title.TLabel',
+                       background=Colors.CARD,
+                       foreground=Colors.TEXT,
+                       font=('Segoe UI', 14, 'bold'))
+        
+        # Buton stilleri
+        style.configure('Primary.TButton',
+                       background=Colors.ACCENT,
+                       foreground=Colors.TEXT,
+                       font=('Segoe UI', 10, 'bold'),
+                       relief='flat',
+                       borderwidth=0,
+                       focuscolor='none')
+        
+        style.map('Primary.TButton',
+                 background=[('active', Colors.SUCCESS),
+                           ('pressed', Colors.WARNING)])
+        
+        style.configure('Success.TButton',
+                       background=Colors.SUCCESS,
+                       foreground=Colors.PRIMARY,
+                       font=('Segoe UI', 10, 'bold'),
+                       relief='flat',
+                       borderwidth=0)
+        
+        style.configure('Error.TButton',
+                       background=Colors.ERROR,
+                       foreground=Colors.TEXT,
+                       font=('Segoe UI', 10, 'bold'),
+                       relief='flat',
+                       borderwidth=0)
+        
+        # Treeview stili
+        style.configure('Modern.Treeview',
+                       background=Colors.CARD,
+                       foreground=Colors.TEXT,
+                       fieldbackground=Colors.CARD,
+                       font=('Segoe UI', 9),
+                       relief='flat',
+                       borderwidth=0)
+        
+        style.configure('Modern.Treeview.Heading',
+                       background=Colors.PRIMARY,
+                       foreground=Colors.TEXT,
+                       font=('Segoe UI', 10, 'bold'),
+                       relief='flat')
+        
+        # Entry stili
+        style.configure('Modern.TEntry',
+                       background=Colors.SECONDARY,
+                       foreground='#000000',  # Siyah yazı rengi
+                       font=('Segoe UI', 10),
+                       relief='flat',
+                       borderwidth=1,
+                       insertcolor='#000000')
+        
+        # Label stili
+        style.configure('Modern.TLabel',
+                       background=Colors.CARD,
+                       foreground=Colors.TEXT,
+                       font=('Segoe UI', 9))
+        
+        # Spinbox stili
+        style.configure('Modern.TSpinbox',
+                       background=Colors.SECONDARY,
+                       foreground='#000000',  # Siyah yazı rengi
+                       font=('Segoe UI', 10),
+                       relief='flat',
+                       borderwidth=1)
+    
+    def setup_gui(self):
+        """GUI arayüzünü oluştur"""
+        # Ana frame
+        main_frame = ttk.Frame(self.root, style='Main.TFrame', padding="15")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Başlık
+        title_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="15")
+        title_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 15))
+        
+        title_label = ttk.Label(title_frame, text="🔍 Ping Monitor", style='Title.TLabel')
+        title_label.grid(row=0, column=0, sticky=tk.W)
+        
+        subtitle_label = ttk.Label(title_frame, text="Cihaz İzleme ve Durum Takip Sistemi", style='Modern.TLabel')
+        subtitle_label.grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        
+        # Kontrol paneli
+        control_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="15")
+        control_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 15))
+        
+        # Kontrol butonları
+        button_frame = ttk.Frame(control_frame, style='Card.TFrame')
+        button_frame.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        self.start_btn = ttk.Button(button_frame, text="▶️ İzlemeyi Başlat", 
+                                   style='Success.TButton', command=self.start_monitoring)
+        self.start_btn.grid(row=0, column=0, padx=(0, 10))
+        
+        self.stop_btn = ttk.Button(button_frame, text="⏹️ İzlemeyi Durdur", 
+                                 style='Error.TButton', command=self.stop_monitoring, state='disabled')
+        self.stop_btn.grid(row=0, column=1, padx=10)
+        
+        # Ping aralığı ayarları
+        settings_frame = ttk.Frame(control_frame, style='Card.TFrame')
+        settings_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E))
+        
+        ttk.Label(settings_frame, text="⏱️ Ping Aralığı (saniye):", style='Modern.TLabel').grid(row=0, column=0, padx=(0, 10), sticky=tk.W)
+        self.interval_var = tk.StringVar(value=str(self.monitor.ping_interval))
+        interval_spin = ttk.Spinbox(settings_frame, from_=10, to=300, width=10, 
+                                  textvariable=self.interval_var, style='Modern.TSpinbox')
+        interval_spin.grid(row=0, column=1, padx=(0, 10))
+        
+        update_btn = ttk.Button(settings_frame, text="🔄 Güncelle", 
+                               style='Primary.TButton', command=self.update_interval)
+        update_btn.grid(row=0, column=2, padx=10)
+        
+        # Cihaz yönetimi
+        device_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="15")
+        device_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
+        
+        # Cihaz yönetimi başlığı
+        device_title = ttk.Label(device_frame, text="📱 Cihaz Yönetimi", style='Title.TLabel')
+        device_title.grid(row=0, column=0, columnspan=4, sticky=tk.W, pady=(0, 15))
+        
+        # Arama ve durum filtresi
+        filter_frame = ttk.Frame(device_frame, style='Card.TFrame')
+        filter_frame.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Label(filter_frame, text="🔎 Ara (ad ya da IP):", style='Modern.TLabel').grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', self.schedule_search)
+        search_entry = ttk.Entry(filter_frame, width=25, textvariable=self.search_var, style='Modern.TEntry')
+        search_entry.grid(row=0, column=1, padx=(0, 20))
+        
+        ttk.Label(filter_frame, text="📊 Durum:", style='Modern.TLabel').grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
+        self.status_filter_var = tk.StringVar(value='Tümü')
+        status_box = ttk.Combobox(filter_frame, textvariable=self.status_filter_var,
+                                  values=list(STATUS_FILTERS), state='readonly', width=12)
+        status_box.grid(row=0, column=3, padx=(0, 20))
+        status_box.bind('<<ComboboxSelected>>', self.apply_filter)
+        
+        self.view_count = ttk.Label(filter_frame, text="", style='Modern.TLabel')
+        self.view_count.grid(row=0, column=4, sticky=tk.W)
+        
+        # Cihaz listesi
+        columns = ('Name', 'IP', 'Status', 'Last Check', 'RTT', 'Avg', 'P95', 'Jitter', 'Loss')
+        self.device_tree = ttk.Treeview(device_frame, columns=columns, show='headings', 
+                                       height=8, style='Modern.Treeview', selectmode='browse')
+        
+        # Sütun başlıkları (tıklayınca sıralanır)
+        self.column_titles = {'Name': '📛 Cihaz Adı', 'IP': '🌐 IP Adresi', 'Status': '📊 Durum',
+                              'Last Check': '⏰ Son Kontrol', 'RTT': '⚡ Gecikme', 'Avg': 'Ort.',
+                              'P95': 'p95', 'Jitter': 'Jitter', 'Loss': 'Kayıp'}
+        for column, title in self.column_titles.items():
+            self.device_tree.heading(column, text=title, command=lambda c=column: self.sort_by(c))
+        
+        # Sütun genişlikleri
+        self.device_tree.column('Name', width=150, anchor='w')
+        self.device_tree.column('IP', width=120, anchor='w')
+        self.device_tree.column('Status', width=120, anchor='center')
+        self.device_tree.column('Last Check', width=100, anchor='center')
+        for column in ('RTT', 'Avg', 'P95', 'Jitter', 'Loss'):
+            self.device_tree.column(column, width=70, anchor='e')
+        
+        self.device_tree.grid(row=2, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 15))
+        
+        # Scrollbar tablonun kendisini değil görünümdeki konumu kaydırır
+        self.device_scrollbar = ttk.Scrollbar(device_frame, orient=tk.VERTICAL, command=self.on_scroll)
+        self.device_scrollbar.grid(row=2, column=4, sticky=(tk.N, tk.S))
+        
+        self.device_tree.bind('<Configure>', self.on_tree_resize)
+        self.device_tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.device_tree.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.device_tree.bind('<Button-4>', self.on_mouse_wheel)
+        self.device_tree.bind('<Button-5>', self.on_mouse_wheel)
+        self.device_tree.bind('<Up>', lambda event: self.move_selection(-1))
+        self.device_tree.bind('<Down>', lambda event: self.move_selection(1))
+        self.device_tree.bind('<Prior>', lambda event: self.move_selection(-len(self._slots)))
+        self.device_tree.bind('<Next>', lambda event: self.move_selection(len(self._slots)))
+        self.device_tree.bind('<Home>', lambda event: self.move_selection(-len(self.model.view)))
+        self.device_tree.bind('<End>', lambda event: self.move_selection(len(self.model.view)))
+        self._resize_rows(8)
+        
+        # Cihaz ekleme formu
+        form_frame = ttk.Frame(device_frame, style='Card.TFrame')
+        form_frame.grid(row=3, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Label(form_frame, text="📝 Cihaz Adı:", style='Modern.TLabel').grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        self.name_entry = ttk.Entry(form_frame, width=20, style='Modern.TEntry')
+        self.name_entry.grid(row=0, column=1, padx=(0, 20))
+        
+        ttk.Label(form_frame, text="🌐 IP / Ad:", style='Modern.TLabel').grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
+        self.ip_entry = ttk.Entry(form_frame, width=20, style='Modern.TEntry')
+        self.ip_entry.grid(row=0, column=3, padx=(0, 10))
+        
+        # Butonlar
+        button_frame = ttk.Frame(device_frame, style='Card.TFrame')
+        button_frame.grid(row=4, column=0, columnspan=4, sticky=(tk.W, tk.E))
+        
+        add_btn = ttk.Button(button_frame, text="➕ Cihaz Ekle", 
+                           style='Success.TButton', command=self.add_device)
+        add_btn.grid(row=0, column=0, padx=(0, 10))
+        
+        remove_btn = ttk.Button(button_frame, text="🗑️ Seçili Cihazı Sil", 
+                               style='Error.TButton', command=self.remove_device)
+        remove_btn.grid(row=0, column=1, padx=10)
+        
+        range_btn = ttk.Button(button_frame, text="🧮 Aralık Ekle",
+                               style='Primary.TButton', command=self.import_range)
+        range_btn.grid(row=0, column=2, padx=10)
+        
+        import_btn = ttk.Button(button_frame, text="📥 Dosyadan İçe Aktar",
+                                style='Primary.TButton', command=self.import_file)
+        import_btn.grid(row=0, column=3, padx=10)
+        
+        # Log paneli
+        log_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="15")
+        log_frame.grid(row=2, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(10, 0))
+        
+        # Log başlığı
+        log_title = ttk.Label(log_frame, text="📋 Log Kayıtları", style='Title.TLabel')
+        log_title.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 15))
+        
+        # Log text alanı
+        self.log_text = tk.Text(log_frame, height=15, width=50, wrap=tk.WORD,
+                               bg=Colors.SECONDARY, fg=Colors.TEXT, 
+                               font=('Consolas', 9), relief='flat', borderwidth=0,
+                               insertbackground=Colors.TEXT, selectbackground=Colors.ACCENT)
+        log_scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
+        self.log_text.configure(yscrollcommand=log_scrollbar.set)
+        
+        self.log_text.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        log_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        
+        # Log kontrol butonları
+        log_control_frame = ttk.Frame(log_frame, style='Card.TFrame')
+        log_control_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        clear_btn = ttk.Button(log_control_frame, text="🗑️ Logları Temizle", 
+                               style='Error.TButton', command=self.clear_logs)
+        clear_btn.grid(row=0, column=0, padx=(0, 10))
+        
+        # Log seviyesi seçimi
+        self.log_level_names = {'Ayrıntılı': LOG_DEBUG, 'Normal': LOG_INFO,
+                                'Yalnızca Değişiklikler': LOG_CHANGE}
+        self.log_level_var = tk.StringVar(value='Normal')
+        log_level_box = ttk.Combobox(log_control_frame, textvariable=self.log_level_var,
+                                     values=list(self.log_level_names), state='readonly', width=20)
+        log_level_box.grid(row=0, column=1, padx=(0, 10))
+        log_level_box.bind('<<ComboboxSelected>>', self.update_log_level)
+        
+        # Status göstergeleri
+        status_frame = ttk.Frame(log_control_frame, style='Card.TFrame')
+        status_frame.grid(row=0, column=2, sticky=tk.E)
+        
+        self.status_online = ttk.Label(status_frame, text="🟢 Çevrimiçi: 0", style='Modern.TLabel')
+        self.status_online.grid(row=0, column=0, padx=(0, 10))
+        
+        self.status_offline = ttk.Label(status_frame, text="🔴 Çevrimdışı: 0", style='Modern.TLabel')
+        self.status_offline.grid(row=0, column=1)
+        
+        # Alt bilgi (Footer)
+        footer_frame = ttk.Frame(main_frame, style='Card.TFrame', padding="10")
+        footer_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(15, 0))
+        
+        footer_label = ttk.Label(footer_frame, text="© 2025 Süleyman Rüçhan Çakıllı Tarafından Geliştirilmektedir", 
+                                style='Modern.TLabel', font=('Segoe UI', 8))
+        footer_label.grid(row=0, column=0, sticky=tk.W)
+        
+        # Grid ağırlıkları
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(2, weight=1)
+        device_frame.columnconfigure(0, weight=1)
+        device_frame.rowconfigure(2, weight=1)
+        log_frame.columnconfigure(0, weight=1)
+        log_frame.rowconfigure(1, weight=1)
+    
+    def start_monitoring(self):
+        """İzlemeyi başlat"""
+        try:
+            self.monitor.ping_interval = int(self.interval_var.get())
+            self.monitor.start_monitoring()
+            self.start_btn.config(state='disabled')
+            self.stop_btn.config(state='normal')
+            
+            # Başarı animasyonu
+            self.animate_button(self.start_btn, Colors.SUCCESS)
+            self.log_message("🚀 İzleme başlatıldı!")
+            
+        except ValueError:
+            messagebox.showerror("❌ Hata", "Geçerli bir ping aralığı girin!")
+        except OSError as e:
+            messagebox.showerror("❌ Hata", f"İzleme başlatılamadı: {e}")
+    
+    def stop_monitoring(self):
+        """İzlemeyi durdur"""
+        self.monitor.stop_monitoring()
+        self.start_btn.config(state='normal')
+        self.stop_btn.config(state='disabled')
+        
+        # Durdurma animasyonu
+        self.animate_button(self.stop_btn, Colors.ERROR)
+        self.log_message("⏹️ İzleme durduruldu!")
+    
+    def update_interval(self):
+        """Ping aralığını güncelle"""
+        try:
+            new_interval = int(self.interval_var.get())
+            if 10 <= new_interval <= 300:
+                self.monitor.set_ping_interval(new_interval)
+                messagebox.showinfo("✅ Başarılı", f"Ping aralığı {new_interval} saniye olarak güncellendi")
+                self.log_message(f"⚙️ Ping aralığı güncellendi: {new_interval} saniye")
+            else:
+                messagebox.showerror("❌ Hata", "Ping aralığı 10-300 saniye arasında olmalı!")
+        except ValueError:
+            messagebox.showerror("❌ Hata", "Geçerli bir sayı girin!")
+    
+    def add_device(self):
+        """Yeni cihaz ekle"""
+        name = self.name_entry.get().strip()
+        ip = self.ip_entry.get().strip()
+        
+        if not name or not ip:
+            messagebox.showerror("❌ Hata", "Cihaz adı ve adresi gerekli!")
+            return
+        
+        # IPv4, IPv6 ya da ana bilgisayar adı (ör. sunucu.example.com)
+        if not valid_host(ip):
+            messagebox.showerror("❌ Hata", "Geçerli bir IP adresi ya da ana bilgisayar adı girin!")
+            return
+        
+        ip = normalize_host(ip)
+        if self.monitor.add_device(name, ip) is None:
+            messagebox.showerror("❌ Hata", f"{ip} adresi zaten listede!")
+            return
+        self.name_entry.delete(0, tk.END)
+        self.ip_entry.delete(0, tk.END)
+        self.update_display()
+        
+        # Başarı mesajı
+        self.log_message(f"✅ Yeni cihaz eklendi: {name} ({ip})")
+    
+    def remove_device(self):
+        """Seçili cihazı sil"""
+        device = self.model.devices.get(self._selected_id)
+        if device is None:
+            messagebox.showwarning("⚠️ Uyarı", "Silinecek cihazı seçin!")
+            return
+        
+        device_id = device.id
+        device_name = device.name
+        
+        if messagebox.askyesno("🗑️ Onay", f"'{device_name}' cihazını silmek istediğinizden emin misiniz?"):
+            self.monitor.remove_device(device_id)
+            self.update_display()
+            self.log_message(f"🗑️ Cihaz silindi: {device_name}")
+    
+    def import_range(self):
+        """CIDR ya da IP aralığındaki tüm adresleri ekle"""
+        spec = simpledialog.askstring(
+            "🧮 Aralık Ekle",
+            "CIDR (192.168.1.0/24) ya da IP aralığı (192.168.1.10-192.168.1.50) girin:",
+            parent=self.root)
+        if not spec:
+            return
+        try:
+            added = self.monitor.import_targets(spec, name=self.name_entry.get().strip() or None)
+        except ValueError as e:
+            messagebox.showerror("❌ Hata", f"Geçersiz aralık: {e}")
+            return
+        self.update_display()
+        self.log_message(f"✅ {len(added)} cihaz eklendi: {spec}")
+    
+    def import_file(self):
+        """CSV ya da JSON dosyasındaki cihazları içe aktar"""
+        path = filedialog.askopenfilename(
+            title="📥 Cihaz Dosyası Seç",
+            filetypes=[("Cihaz listeleri", "*.csv *.json *.txt"), ("Tüm dosyalar", "*.*")])
+        if not path:
+            return
+        try:
+            added = self.monitor.import_file(path)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("❌ Hata", f"Dosya içe aktarılamadı: {e}")
+            return
+        self.update_display()
+        self.log_message(f"✅ {len(added)} cihaz içe aktarıldı")
+    
+    def on_device_update(self, device):
+        """Monitor thread'inden çağrılır; Tk'ya dokunmadan değişikliği biriktirir"""
+        with self._pending_lock:
+            self._pending_devices[device.id] = device
+    
+    def flush_device_updates(self):
+        """Biriken cihaz değişikliklerini Tk thread'inde tek seferde uygula"""
+        with self._pending_lock:
+            pending, self._pending_devices = self._pending_devices, {}
+        
+        started = time.perf_counter()
+        try:
+            model = self.model
+            counts = list(model.counts)
+            for device in pending.values():
+                if device.id not in model.devices:
+                    # Başka yoldan (ör. koordinatör) eklenmiş cihaz
+                    self._view_dirty = model.sync(list(self.monitor.devices)) or self._view_dirty
+                if model.update(device) and model.status_filter is not None:
+                    self._view_dirty = True
+            if pending and model.sort_column is not None and SORT_KEYS[model.sort_column][1]:
+                self._view_dirty = True
+            
+            if self._view_dirty and time.monotonic() - self._view_built >= VIEW_REBUILD_MS / 1000:
+                self.rebuild_view()
+            else:
+                for device in pending.values():
+                    self.update_row(device)
+            if model.counts != counts:
+                self.update_status_counts()
+        except Exception:
+            # GUI güncelleme hatası
+            pass
+        metrics = self.monitor.metrics
+        if metrics is not None and pending:
+            metrics.gui_flush.observe(time.perf_counter() - started)
+            metrics.gui_batch.observe(len(pending))
+        
+        self.root.after(DISPLAY_REFRESH_MS, self.flush_device_updates)
+    
+    def device_row_values(self, device):
+        """Cihazın tabloda gösterilecek değerleri"""
+        last_check = format_clock(device.last_check) if device.last_check else ''
+        
+        # Gecikme istatistikleri ilk istatistik penceresinden
+        stats = device.stats[0].summary(time.time()) if device.stats else None
+        if stats is None:
+            stats = {}
+        loss = stats.get('loss')
+        return (device.name, device.target, STATUS_TEXTS[device.status], last_check,
+                format_ms(device.last_rtt), format_ms(stats.get('avg')), format_ms(stats.get('p95')),
+                format_ms(stats.get('jitter')), '' if loss is None else f"%{loss:.0f}")
+    
+    def update_row(self, device):
+        """Görünen bir cihaz satırını güncelle, yalnızca değişen hücrelere dokun"""
+        iid = self._visible.get(device.id)
+        if iid is None:
+            return  # ekranda olmayan cihaz
+        
+        old_values = self._rows.get(iid)
+        values = self.device_row_values(device)
+        if values == old_values:
+            return
+        for column, old_value, value in zip(self.device_tree['columns'], old_values, values):
+            if value != old_value:
+                self.device_tree.set(iid, column, value)
+        self._rows[iid] = values
+    
+    def update_status_counts(self):
+        """Çevrimiçi/çevrimdışı sayaçlarını güncelle (sayaçlar modelde tutulur)"""
+        counts = self.model.counts
+        self.status_online.config(text=f"🟢 Çevrimiçi: {counts[STATUS_ONLINE]}")
+        self.status_offline.config(text=f"🔴 Çevrimdışı: {counts[STATUS_OFFLINE]}")
+    
+    def update_display(self):
+        """Cihaz listesini modelle eşitle; eklenen ya da silinen varsa görünümü yenile"""
+        try:
+            if self.model.sync(list(self.monitor.devices)) or self._view_dirty:
+                self.rebuild_view()
+            else:
+                self.render_view()
+            self.update_status_counts()
+            
+        except Exception as e:
+            # GUI güncelleme hatası
+            pass
+    
+    def rebuild_view(self):
+        """Filtre ve sıralamayı uygula, görünen satırları yeniden çiz"""
+        view = self.model.rebuild()
+        self._view_dirty = False
+        self._view_built = time.monotonic()
+        total = len(self.model.devices)
+        self.view_count.config(text=f"{len(view)} / {total} cihaz" if len(view) != total else f"{total} cihaz")
+        self.render_view()
+        # Satır yüksekliği ancak satırlar çizildikten sonra ölçülebilir
+        self.root.after_idle(self.on_tree_resize)
+    
+    def render_view(self):
+        """Görünümde _offset'ten başlayan cihazları tablodaki satırlara yaz"""
+        view = self.model.view
+        devices = self.model.devices
+        slots = list(self._slots)
+        self._offset = max(0, min(self._offset, len(view) - len(slots)))
+        
+        self._visible = {}
+        for index, iid in enumerate(slots):
+            position = self._offset + index
+            if position >= len(view):
+                # Görünüm tablodan kısa: boş satırları gizle
+                if self._slots[iid] is not None:
+                    self.device_tree.detach(iid)
+                    self._slots[iid] = None
+                    self._rows[iid] = None
+                continue
+            device_id = view[position]
+            device = devices[device_id]
+            if self._slots[iid] is None:
+                self.device_tree.move(iid, '', index)
+            self._slots[iid] = device_id
+            self._visible[device_id] = iid
+            values = self.device_row_values(device)
+            if values != self._rows.get(iid):
+                self.device_tree.item(iid, values=values)
+                self._rows[iid] = values
+        
+        # Seçim cihaza bağlıdır; kaydırınca satırla birlikte hareket eder
+        selected = self._visible.get(self._selected_id)
+        if selected is None:
+            if self.device_tree.selection():
+                self.device_tree.selection_set(())
+        elif self.device_tree.selection() != (selected,):
+            self.device_tree.selection_set(selected)
+        
+        if view:
+            self.device_scrollbar.set(self._offset / len(view),
+                                      min(1.0, (self._offset + len(slots)) / len(view)))
+        else:
+            self.device_scrollbar.set(0.0, 1.0)
+    
+    def _resize_rows(self, count):
+        """Tablodaki satır öğesi sayısını görünen satır sayısına eşitle"""
+        count = max(1, count)
+        while len(self._slots) < count:
+            iid = f'row{len(self._slots)}'
+            self.device_tree.insert('', 'end', iid=iid)
+            self.device_tree.detach(iid)
+            self._slots[iid] = None
+            self._rows[iid] = None
+        while len(self._slots) > count:
+            iid = f'row{len(self._slots) - 1}'
+            del self._slots[iid]
+            del self._rows[iid]
+            self.device_tree.delete(iid)
+    
+    def on_tree_resize(self, event=None):
+        """Tablo yüksekliği değişince satır öğelerini yeniden boyutlandır"""
+        first = next(iter(self._slots), None)
+        box = self.device_tree.bbox(first) if first and self._slots[first] is not None else ''
+        if not box:
+            return  # satır yüksekliği henüz ölçülemiyor
+        _, top, _, row_height = box
+        count = (self.device_tree.winfo_height() - top) // row_height
+        if count != len(self._slots):
+            self._resize_rows(count)
+            self.render_view()
+    
+    def scroll_to(self, offset):
+        self._offset = int(offset)
+        self.render_view()
+    
+    def on_scroll(self, action, amount, unit=None):
+        """Scrollbar komutları: moveto oran | scroll adım units/pages"""
+        if action == 'moveto':
+            self.scroll_to(float(amount) * len(self.model.view))
+        else:
+            step = int(amount) * (len(self._slots) if unit == 'pages' else 1)
+            self.scroll_to(self._offset + step)
+    
+    def on_mouse_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_to(self._offset - WHEEL_ROWS)
+        else:
+            self.scroll_to(self._offset + WHEEL_ROWS)
+        return 'break'
+    
+    def on_select(self, event=None):
+        selection = self.device_tree.selection()
+        if selection:
+            self._selected_id = self._slots.get(selection[0])
+    
+    def move_selection(self, step):
+        """Seçimi görünümde step satır kaydır, gerekirse tabloyu kaydır"""
+        view = self.model.view
+        if not view:
+            return 'break'
+        try:
+            index = view.index(self._selected_id)
+        except ValueError:
+            index = self._offset - (1 if step > 0 else 0)
+        index = max(0, min(len(view) - 1, index + step))
+        self._selected_id = view[index]
+        if index < self._offset:
+            self._offset = index
+        elif index >= self._offset + len(self._slots):
+            self._offset = index - len(self._slots) + 1
+        self.render_view()
+        self.device_tree.focus(self._visible[self._selected_id])
+        return 'break'
+    
+    def schedule_search(self, *args):
+        """Yazma bitince filtrele (her tuşta değil)"""
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(SEARCH_DELAY_MS, self.apply_filter)
+    
+    def apply_filter(self, event=None):
+        self._search_job = None
+        self.model.search = self.search_var.get()
+        self.model.status_filter = STATUS_FILTERS.get(self.status_filter_var.get())
+        self._offset = 0
+        self.rebuild_view()
+    
+    def sort_by(self, column):
+        """Sütuna göre sırala; aynı sütuna tekrar tıklanınca yönü değiştir"""
+        model = self.model
+        if model.sort_column == column:
+            model.sort_reverse = not model.sort_reverse
+        else:
+            model.sort_column = column
+            model.sort_reverse = False
+        for name, title in self.column_titles.items():
+            if name == column:
+                title += ' ▼' if model.sort_reverse else ' ▲'
+            self.device_tree.heading(name, text=title)
+        self.rebuild_view()
+    
+    def process_log_queue(self):
+        """Biriken log satırlarını tek seferde pencereye ekle"""
+        entries, dropped = self.monitor.drain_logs()
+        if dropped:
+            entries.insert(0, f"⚠️ Log tamponu doldu, {dropped} satır atlandı")
+        
+        if entries:
+            self.log_text.insert(tk.END, "\n".join(entries) + "\n")
+            
+            # Pencerede yalnızca son LOG_MAX_LINES satırı tut
+            line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+            if line_count > LOG_MAX_LINES:
+                self.log_text.delete('1.0', f'{line_count - LOG_MAX_LINES + 1}.0')
+            self.log_text.see(tk.END)
+        
+        # Her 100ms'de bir kontrol et
+        self.root.after(100, self.process_log_queue)
+    
+    def update_log_level(self, event=None):
+        """Seçilen log seviyesini monitöre uygula"""
+        self.monitor.log_level = self.log_level_names.get(self.log_level_var.get(), LOG_INFO)
+    
+    def clear_logs(self):
+        """Log kayıtlarını temizle"""
+        self.log_text.delete(1.0, tk.END)
+        self.log_message("🗑️ Log kayıtları temizlendi!")
+    
+    def animate_button(self, button, color):
+        """Buton animasyonu"""
+        original_color = button.cget('background')
+        button.configure(background=color)
+        self.root.after(200, lambda: button.configure(background=original_color))
+    
+    def log_message(self, message):
+        """Log mesajını ekle"""
+        self.monitor.log_message(message)
+    
+    def run(self):
+        """Uygulamayı çalıştır"""
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.mainloop()
+    
+    def on_closing(self):
+        """Uygulama kapatılırken"""
+        self.monitor.close()
+        self.root.destroy()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Ana bilgisayar adları için süreli, arka planda yenilenen DNS önbelleği
+"""
+
+import asyncio
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_TTL = 300          # saniye, başarılı çözümlemelerin geçerlilik süresi
+DEFAULT_NEGATIVE_TTL = 30  # saniye, çözümlenemeyen adların yeniden denenmesine kadar
+REFRESH_AHEAD = 0.8        # TTL'in bu oranı dolunca kayıt arka planda yenilenir
+MAX_WORKERS = 8            # aynı anda en fazla çözümleme
+
+
+def looks_like_ip(host):
+    """Çözümleme gerektirmeyen (IP adresi gibi görünen) hedefleri hızlıca ayır"""
+    return ':' in host or host.replace('.', '').isdigit()
+
+
+class Resolver:
+    """Ping iş parçacıklarının DNS beklememesi için ad -> adres önbelleği.
+
+    Çözümlemeler (getaddrinfo) küçük bir thread havuzunda eşzamanlı yapılır.
+    Kayıt TTL'in REFRESH_AHEAD oranı dolunca arka planda yenilenir, bu sırada
+    eski adres kullanılmaya devam eder. Yenileme başarısız olursa eski adres
+    bir TTL daha kullanılır (serve-stale); hiç çözümlenemeyen adlar
+    negative_ttl süresince başarısız sayılır ve DNS'e yeniden sorulmaz.
+    getaddrinfo kayıtların TTL'ini döndürmediğinden süreler yapılandırmadan gelir.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 max_workers=MAX_WORKERS, log=None):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_workers = max_workers
+        self.log = log  # log(mesaj) ile adres değişiklikleri ve hatalar bildirilir
+        # Çözümlemenin done-callback'i kilit altında da çağrılabildiğinden yeniden girilebilir
+        self._lock = threading.RLock()
+        # ad -> [adres ya da None, son geçerlilik zamanı, yenileme zamanı, hata]
+        self._cache = {}
+        self._pending = {}  # ad -> çözümlemenin Future'ı
+        self._executor = None  # yalnızca ad çözümlemesi gerekince oluşturulur
+        self._closed = False
+
+    def _lookup(self, host):
+        """Önbellekteki adresi döndür; gerekirse çözümlemeyi başlat.
+
+        (adres, None): kullanılabilir (None ise çözümlenemedi);
+        (None, future): ad ilk kez soruluyor, sonuç bekleniyor.
+        """
+        now = time.monotonic()
+        entry = self._cache.get(host)
+        if entry is not None and (entry[2] is None or now < entry[2]):
+            return entry[0], None  # taze kayıt ya da süresiz IP adresi
+        with self._lock:
+            entry = self._cache.get(host)
+            if entry is None:
+                address = self._literal(host)
+                if address is not None:
+                    self._cache[host] = [address, None, None, None]
+                    return address, None
+            elif entry[2] is None:
+                return entry[0], None
+            future = self._pending.get(host)
+            if future is None or future.cancelled():
+                future = self._start(host)
+            if entry is None:
+                return None, future
+            # Yenileme sürerken eski adres süresi dolana kadar, başarılı bir adresse
+            # bir TTL daha (serve-stale) kullanılır
+            if now < entry[1] or entry[0] is not None and now < entry[1] + self.ttl:
+                return entry[0], None
+            return None, None
+
+    @staticmethod
+    def _literal(host):
+        if not looks_like_ip(host):
+            return None
+        try:
+            return str(ipaddress.ip_address(host))
+        except ValueError:
+            return None
+
+    def _start(self, host):
+        """Çözümlemeyi arka planda başlat (kilit altında çağrılır)"""
+        if self._closed:
+            future = Future()
+            future.set_result(None)
+            return future
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='resolver')
+        future = self._executor.submit(self._resolve, host)
+        self._pending[host] = future
+        future.add_done_callback(lambda done: self._forget(host, done))
+        return future
+
+    def _forget(self, host, future):
+        """Biten (ya da iptal edilen) çözümlemeyi bekleyenlerden çıkar"""
+        with self._lock:
+            if self._pending.get(host) is future:
+                del self._pending[host]
+
+    def _resolve(self, host):
+        """İşçi thread'inde adı çözümle ve önbelleğe yaz"""
+        error = None
+        address = None
+        try:
+            infos = socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_DGRAM,
+                                       0, socket.AI_ADDRCONFIG)
+            address = infos[0][4][0] if infos else None
+        except (OSError, UnicodeError) as e:
+            error = str(e)
+        now = time.monotonic()
+        message = None
+        with self._lock:
+            self._pending.pop(host, None)
+            old = self._cache.get(host)
+            if address is not None:
+                self._cache[host] = [address, now + self.ttl, now + self.ttl * REFRESH_AHEAD, None]
+                if old is not None and old[0] is not None and old[0] != address:
+                    message = f"DNS: {host} adresi değişti: {old[0]} -> {address}"
+                elif old is not None and old[0] is None:
+                    message = f"DNS: {host} çözümlendi: {address}"
+            elif old is not None and old[0] is not None and now < old[1] + self.ttl:
+                # Eski adresi kullanmaya devam et, kısa süre sonra yeniden dene
+                old[2] = now + self.negative_ttl
+                old[3] = error
+                message = f"DNS: {host} yenilenemedi, eski adres kullanılıyor: {error}"
+            else:
+                self._cache[host] = [None, now + self.negative_ttl, now + self.negative_ttl, error]
+                if old is None or old[3] != error:
+                    message = f"DNS: {host} çözümlenemedi: {error or 'adres yok'}"
+        if message and self.log:
+            self.log(message)
+        return address
+
+    def resolve(self, host, timeout=None):
+        """Adresi önbellekten döndür; ad ilk kez soruluyorsa en fazla timeout bekle"""
+        address, future = self._lookup(host)
+        if future is None:
+            return address
+        try:
+            return future.result(timeout)
+        except Exception:
+            return None
+
+    async def resolve_async(self, host):
+        """resolve'un asyncio sürümü; ilk çözümleme olay döngüsünü bloklamaz"""
+        address, future = self._lookup(host)
+        if future is None:
+            return address
+        # Future birden çok bekleyenle paylaşılır; birinin zaman aşımı (iptal)
+        # çözümlemeyi iptal etmesin
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def prefetch(self, hosts):
+        """Adları önceden, arka planda çözümle (IP adresleri atlanır)"""
+        for host in hosts:
+            if not looks_like_ip(host) and host not in self._cache:
+                self._lookup(host)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def close(self):
+        """Bekleyen çözümlemeleri bırak ve thread havuzunu kapat"""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+            pending = list(self._pending.values())
+        # Kuyrukta bekleyen çözümlemeler iptal edilir (cancel_futures Python 3.9+)
+        for future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - TCP, HTTP(S) ve DNS servis kontrolleri (asyncio, engellemesiz)
+"""
+
+import asyncio
+import random
+import ssl
+import struct
+import threading
+import time
+from urllib.parse import urlsplit
+
+# devices.json'daki "type" alanının alabileceği değerler
+PROBE_TYPES = ('icmp', 'tcp', 'http', 'https', 'dns')
+
+DNS_RECORD_TYPES = {'A': 1, 'NS': 2, 'CNAME': 5, 'SOA': 6, 'PTR': 12, 'MX': 15, 'TXT': 16, 'AAAA': 28}
+DNS_RCODES = {1: 'FORMERR', 2: 'SERVFAIL', 3: 'NXDOMAIN', 4: 'NOTIMP', 5: 'REFUSED'}
+
+HTTP_MAX_HEADER = 64 * 1024
+
+
+class ProbeError(Exception):
+    """Hedef yanıt verdi ama kontrol başarısız (ör. HTTP 500, DNS SERVFAIL)"""
+
+
+class ProbeLoop:
+    """Servis kontrollerini tek bir arka plan thread'indeki asyncio döngüsünde çalıştırır.
+
+    submit() concurrent.futures.Future döndürür; bu sayede kontroller ICMP
+    pingleriyle aynı zamanlayıcıya bağlanır ama her kontrol için thread gerekmez.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name='probe-loop', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            # Süren kontrolleri iptal edip bitmelerini bekle
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    def submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def close(self):
+        if self._thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(5)
+
+
+def default_url(device):
+    scheme = 'https' if device.type == 'https' else 'http'
+    host = f'[{device.ip}]' if ':' in device.ip else device.ip
+    port = f':{device.port}' if device.port else ''
+    return f'{scheme}://{host}{port}/'
+
+
+def probe_host(device):
+    """Kontrolün bağlanacağı ana bilgisayar (HTTP'de URL'deki ad, diğerlerinde cihaz adresi)"""
+    url = (device.extra or {}).get('url')
+    if device.type in ('http', 'https') and url:
+        return urlsplit(url).hostname or device.ip
+    return device.ip
+
+
+async def run_probe(device, timeout, address=None):
+    """Cihazın tipine göre kontrolü çalıştır; süre (ms) ya da başarısızsa None döndür.
+
+    address verilirse probe_host(device) yerine bu (önceden çözümlenmiş) adrese
+    bağlanılır. Bağlantı hataları ve zaman aşımı None olarak döner; yapılandırma
+    hataları ValueError fırlatır.
+    """
+    probe_type = device.type or 'icmp'
+    extra = device.extra or {}
+    try:
+        if probe_type == 'tcp':
+            if not device.port:
+                raise ValueError("tcp kontrolü için port gerekli")
+            return await asyncio.wait_for(tcp_probe(address or device.ip, int(device.port)), timeout)
+        if probe_type in ('http', 'https'):
+            return await asyncio.wait_for(
+                http_probe(extra.get('url') or default_url(device), extra.get('expect'),
+                           str(extra.get('verify', True)).lower() not in ('false', '0', 'no'),
+                           address), timeout)
+        if probe_type == 'dns':
+            return await asyncio.wait_for(
+                dns_probe(address or device.ip, extra.get('query', '.'), extra.get('record', 'A'),
+                          int(device.port or 53)), timeout)
+    except (OSError, asyncio.TimeoutError, ProbeError, EOFError):
+        return None
+    raise ValueError(f"Bilinmeyen kontrol tipi: {probe_type}")
+
+
+async def tcp_probe(host, port):
+    """TCP bağlantısı kurulana kadar geçen süre (ms)"""
+    started = time.perf_counter()
+    _, writer = await asyncio.open_connection(host, port)
+    rtt = (time.perf_counter() - started) * 1000
+    writer.close()
+    return rtt
+
+
+def expected_status(status, expect):
+    """HTTP durum kodu beklenen mi (varsayılan: 2xx ve 3xx)"""
+    if expect is None:
+        return 200 <= status < 400
+    if isinstance(expect, str):
+        expect = expect.split(',')
+    elif isinstance(expect, int):
+        expect = [expect]
+    return any(str(status) == str(code).strip() for code in expect)
+
+
+async def http_probe(url, expect=None, verify=True, address=None):
+    """HTTP isteği gönderip durum satırı gelene kadar geçen süre (ms).
+
+    address verilirse URL'deki ad yerine bu adrese bağlanılır; Host başlığı ve
+    TLS sunucu adı yine URL'den alınır.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError(f"Geçersiz URL: {url}")
+    context = None
+    if parts.scheme == 'https':
+        context = ssl.create_default_context()
+        if not verify:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+    port = parts.port or (443 if context else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    host_header = parts.netloc.rsplit('@', 1)[-1]
+
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(
+        address or parts.hostname, port, ssl=context,
+        server_hostname=parts.hostname if context and address else None, limit=HTTP_MAX_HEADER)
+    try:
+        writer.write((f'GET {path} HTTP/1.1\r\nHost: {host_header}\r\n'
+                      f'User-Agent: PingMonitor\r\nAccept: */*\r\nConnection: close\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+        status_line = await reader.readline()
+        rtt = (time.perf_counter() - started) * 1000
+    finally:
+        writer.close()
+    fields = status_line.split()
+    if len(fields) < 2 or not fields[0].startswith(b'HTTP/') or not fields[1].isdigit():
+        raise ProbeError(f"Geçersiz HTTP yanıtı: {status_line[:80]!r}")
+    if not expected_status(int(fields[1]), expect):
+        raise ProbeError(f"HTTP {int(fields[1])}")
+    return rtt
+
+
+def build_dns_query(name, record_type, ident):
+    """Tek sorulu, özyinelemeli DNS sorgu paketi"""
+    qtype = DNS_RECORD_TYPES.get(str(record_type).upper())
+    if qtype is None:
+        raise ValueError(f"Desteklenmeyen DNS kayıt tipi: {record_type}")
+    labels = [label for label in name.rstrip('.').encode('idna').split(b'.') if label]
+    qname = b''.join(bytes([len(label)]) + label for label in labels) + b'\0'
+    return struct.pack('!HHHHHH', ident, 0x0100, 1, 0, 0, 0) + qname + struct.pack('!HH', qtype, 1)
+
+
+class _DnsProtocol(asyncio.DatagramProtocol):
+    def __init__(self, ident, future):
+        self.ident = ident
+        self.future = future
+
+    def datagram_received(self, data, addr):
+        if len(data) >= 12 and struct.unpack_from('!H', data)[0] == self.ident and not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+async def dns_probe(server, name='.', record_type='A', port=53):
+    """DNS sunucusuna UDP sorgusu gönderip yanıt süresini (ms) ölç"""
+    loop = asyncio.get_running_loop()
+    ident = random.getrandbits(16)
+    query = build_dns_query(name, record_type, ident)
+    future = loop.create_future()
+    started = time.perf_counter()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _DnsProtocol(ident, future), remote_addr=(server, port))
+    try:
+        transport.sendto(query)
+        response = await future
+        rtt = (time.perf_counter() - started) * 1000
+    finally:
+        transport.close()
+    flags = struct.unpack_from('!H', response, 2)[0]
+    rcode = flags & 0x0F
+    if not flags & 0x8000 or rcode:
+        raise ProbeError(f"DNS {DNS_RCODES.get(rcode, rcode)}")
+    return rtt
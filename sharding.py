@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Cihazları birden çok işleme bölerek izleme (çok çekirdekli mod)
+"""
+
+import collections
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+import zlib
+
+from device_registry import Device
+
+# Ana monitörden işçilere kopyalanan ayarlar
+WORKER_SETTINGS = ('ping_interval', 'ping_timeout', 'ping_jitter', 'ping_backend',
+                   'confirm_failures', 'confirm_window', 'recover_successes', 'confirm_interval',
+                   'adaptive', 'backoff_after', 'max_backoff', 'log_level',
+                   'dns_ttl', 'dns_negative_ttl')
+
+FLUSH_INTERVAL = 0.25  # saniye, işçilerin sonuç gönderme aralığı
+STOP_TIMEOUT = 5       # saniye, işçilerin kapanmasını bekleme süresi
+
+
+def shard_of(device_id, count):
+    """Cihazın atandığı işçi (kimliğin kararlı özetine göre)"""
+    return zlib.crc32(device_id.encode()) % count
+
+
+def device_payload(device):
+    """İşçiye gönderilen cihaz: yapılandırma ve son durum"""
+    data = device.to_config()
+    data.update(device.to_state())
+    return data
+
+
+def probe_delta(device):
+    """Ping sonucu demeti: (kimlik, zaman, rtt, durum, durum değişim zamanı)"""
+    return (device.id, device.last_check, device.last_rtt, device.status, device.last_status_change)
+
+
+def status_delta(device):
+    """Pingsiz durum değişikliği demeti; zaman ve rtt None, geçmişe yazılmaz"""
+    return (device.id, None, None, device.status, device.last_status_change)
+
+
+def _add_devices(monitor, payloads):
+    """Kimlikleri koruyarak cihazları işçinin monitörüne ekle ve zamanla"""
+    with monitor._cond:
+        added = []
+        for data in payloads:
+            device = Device.from_dict(data)
+            if monitor.devices.add(device):
+                added.append(device)
+        if monitor.monitoring:
+            now = time.monotonic()
+            for index, device in enumerate(added):
+                monitor._schedule_device(device, now + monitor.device_interval(device) * index / len(added))
+            monitor._cond.notify_all()
+
+
+def shard_worker(settings, concurrency, payloads, results, commands, ping_device=None):
+    """İşçi işlemi: kendi cihaz dilimini kendi zamanlayıcısıyla izler.
+
+    Her ping sonucu (kimlik, zaman, rtt, durum, durum değişim zamanı) demeti
+    olarak biriktirilir ve FLUSH_INTERVAL aralıklarla loglarla birlikte toplu
+    gönderilir. Pinglenmeden erişilemez işaretlenen cihazlar zamanı ve rtt'si
+    None olan yalnızca durum demetiyle bildirilir. Geçmiş, istatistik ve
+    dosyalar ana işlemde tutulur.
+    """
+    from ping_monitor import PingMonitor
+
+    # Ctrl+C ana işleme gelir; işçiler "stop" komutuyla kapanır
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    pending = collections.deque()
+
+    def on_device_update(device):
+        pending.append(probe_delta(device))
+
+    def on_status_update(device):
+        pending.append(status_delta(device))
+
+    monitor = PingMonitor(gui_callback=on_device_update, history_file=None, devices_file=None)
+    monitor.status_callback = on_status_update
+    for name, value in settings.items():
+        setattr(monitor, name, value)
+    monitor.max_concurrency = concurrency
+    monitor.stats_windows = ()  # istatistikler ana işlemde hesaplanır
+    monitor.log_to_console = False
+    if ping_device is not None:
+        monitor.ping_device = ping_device
+    _add_devices(monitor, payloads)
+    monitor.start_monitoring()
+    monitor.drain_logs()  # "İzleme başlatıldı" satırları ana işlemde zaten var
+
+    stopping = threading.Event()
+
+    def flush():
+        batch = [pending.popleft() for _ in range(len(pending))]
+        logs, _ = monitor.drain_logs(records=True)
+        if batch or logs:
+            results.put((batch, logs))
+
+    def flusher():
+        while not stopping.wait(FLUSH_INTERVAL):
+            flush()
+
+    thread = threading.Thread(target=flusher, daemon=True)
+    thread.start()
+    try:
+        while True:
+            command, argument = commands.get()
+            if command == 'stop':
+                break
+            if command == 'add':
+                _add_devices(monitor, argument)
+            elif command == 'remove':
+                with monitor._cond:
+                    for device_id in argument:
+                        monitor.devices.remove(device_id)
+                        monitor._entries.pop(device_id, None)
+            elif command == 'interval':
+                monitor.set_ping_interval(argument)
+    finally:
+        stopping.set()
+        thread.join()
+        monitor.close()
+        flush()
+        results.put(None)
+
+
+def apply_results(monitor, batch, logs):
+    """İşçiden gelen sonuç demetlerini ve log satırlarını ana monitörün cihazlarına işle"""
+    metrics = monitor.metrics
+    for entry in logs:
+        monitor.emit_log(*entry)
+    for device_id, timestamp, rtt, status, last_status_change in batch:
+        device = monitor.devices.get(device_id)
+        if device is None:
+            continue  # bu arada silinmiş cihaz
+        if timestamp is None:
+            # Yalnızca durum: ping atılmadı (ör. üst cihaz düştüğü için erişilemez)
+            timestamp = last_status_change or time.time()
+            if metrics is not None:
+                metrics.probe_held(device_id, monitor.devices)
+        else:
+            monitor.record_result(device, timestamp, rtt)
+            if metrics is not None:
+                metrics.probe_done(rtt, device_id, monitor.devices)
+        old_status = device.status
+        device.status = status
+        device.last_status_change = last_status_change
+        if old_status != status:
+            monitor.status_changed(device, old_status, status, timestamp)
+        if monitor.gui_callback:
+            monitor.gui_callback(device)
+
+
+class ShardPool:
+    """Cihazları işçi işlemlerine dağıtır ve sonuçlarını ana monitöre işler.
+
+    Ana monitörün run() çağıran thread'i, tek işlemli moddaki izleme döngüsünün
+    yerini alır: işçilerden gelen sonuçları cihazlara, geçmişe, istatistiklere
+    ve GUI'ye aktarır; böylece GUI, API ve kalıcılık aynı cihaz listesini görür.
+    """
+
+    def __init__(self, monitor, workers):
+        self.monitor = monitor
+        self.workers = workers
+        context = multiprocessing.get_context('spawn')
+        self._context = context
+        self.results = context.Queue()
+        self.commands = [context.Queue() for _ in range(workers)]
+        self.processes = []
+        self._assigned = {}   # cihaz kimliği -> işçi
+        self._grouped = False  # son atamada bağımlılık kümesi var mıydı
+
+    def _assign(self):
+        """Cihaz -> işçi eşlemesi (kilit altında çağrılır).
+
+        Bağımlılıkla bağlı cihazlar aynı işçiye düşer; üst cihaz kontrolleri
+        ve erişilemez işaretleri işçinin kendi cihazlarıyla yapılabilir.
+        """
+        from topology import dependency_groups
+        groups = dependency_groups(self.monitor.devices)
+        self._grouped = bool(groups)
+        return {device.id: shard_of(groups.get(device.id, device.id), self.workers)
+                for device in self.monitor.devices}
+
+    def start(self):
+        monitor = self.monitor
+        settings = {name: getattr(monitor, name) for name in WORKER_SETTINGS}
+        concurrency = max(1, -(-monitor.max_concurrency // self.workers))
+        # ping_device örnek üzerinde değiştirildiyse (ör. ölçümlerdeki sahte ağ)
+        # işçiler de aynısını kullanır; seçilebilir olması gerekir
+        ping_device = vars(monitor).get('ping_device')
+        shards = [[] for _ in range(self.workers)]
+        with monitor._cond:
+            self._assigned = self._assign()
+            for device in monitor.devices:
+                shards[self._assigned[device.id]].append(device_payload(device))
+        for index, payloads in enumerate(shards):
+            process = self._context.Process(
+                target=shard_worker, name=f'ping-shard-{index}', daemon=True,
+                args=(settings, concurrency, payloads, self.results, self.commands[index], ping_device))
+            process.start()
+            self.processes.append(process)
+        monitor.log_message(f"{self.workers} işçi işlemi başlatıldı")
+
+    def add(self, devices):
+        """Yeni cihazları ilgili işçilere gönder (monitör kilidi altında).
+
+        Yeni cihazlar bağımlılık kümelerini birleştirdiyse kümesi başka işçiye
+        düşen mevcut cihazlar eski işçiden silinip yenisine taşınır.
+        """
+        monitor = self.monitor
+        if not self._grouped and not any(device.parents for device in devices):
+            assigned = {device.id: shard_of(device.id, self.workers) for device in devices}
+        else:
+            assigned = self._assign()
+        shards = collections.defaultdict(list)
+        removed = collections.defaultdict(list)
+        new_ids = {device.id for device in devices}
+        for device_id, index in assigned.items():
+            old_index = self._assigned.get(device_id)
+            if device_id in new_ids or old_index is None:
+                shards[index].append(device_payload(monitor.devices.get(device_id)))
+            elif old_index != index:
+                removed[old_index].append(device_id)
+                shards[index].append(device_payload(monitor.devices.get(device_id)))
+        self._assigned.update(assigned)
+        for index, ids in removed.items():
+            self.commands[index].put(('remove', ids))
+        for index, payloads in shards.items():
+            self.commands[index].put(('add', payloads))
+
+    def remove(self, device_ids):
+        shards = collections.defaultdict(list)
+        for device_id in device_ids:
+            index = self._assigned.pop(device_id, None)
+            shards[shard_of(device_id, self.workers) if index is None else index].append(device_id)
+        for index, ids in shards.items():
+            self.commands[index].put(('remove', ids))
+
+    def set_interval(self, seconds):
+        for commands in self.commands:
+            commands.put(('interval', seconds))
+
+    def apply(self, batch, logs):
+        apply_results(self.monitor, batch, logs)
+
+    def run(self, run_id):
+        """Sonuç döngüsü; izleme durdurulunca işçileri kapatır"""
+        monitor = self.monitor
+        self.start()
+        try:
+            while monitor.monitoring and run_id == monitor._run_id:
+                try:
+                    item = self.results.get(timeout=FLUSH_INTERVAL)
+                except queue.Empty:
+                    item = None
+                if item is not None:
+                    self.apply(*item)
+                if (monitor._state_dirty_since is not None
+                        and time.monotonic() - monitor._state_dirty_since >= monitor.state_save_delay):
+                    monitor.save_state()
+        finally:
+            self.stop()
+            monitor.save_state()
+
+    def stop(self):
+        """İşçileri durdur, son sonuçlarını işle"""
+        for commands in self.commands:
+            commands.put(('stop', None))
+        running = len(self.processes)
+        deadline = time.monotonic() + STOP_TIMEOUT
+        while running and time.monotonic() < deadline:
+            try:
+                item = self.results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is None:
+                running -= 1
+            else:
+                self.apply(*item)
+        for process in self.processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Ping geçmişinden cihaz ve grup bazında erişilebilirlik (SLA) raporu
+"""
+
+import argparse
+import csv
+import html
+import itertools
+import json
+import os
+import pathlib
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+from device_cache import iter_json_array
+from history_store import LATENCY_BIN_SQL, latency_bin_bounds
+
+HOUR = 3600
+MIN_FAILURES = 3          # kesinti sayılması için art arda en az bu kadar başarısız ping
+PERCENTILES = (50, 90, 95, 99)
+DEVICE_CHUNK = 500        # ayrıntı sorgularında IN listesine konan en fazla cihaz (+60 dakika)
+DEFAULT_DAYS = 30
+
+# Saatlik özetten toplamlar (saat sayısı izlenen süreyi verir)
+HOUR_TOTALS_SQL = """
+SELECT device, SUM(probes), SUM(ok), SUM(rtt_sum), MIN(rtt_min), MAX(rtt_max), COUNT(*)
+FROM rollup_1h WHERE bucket >= ? AND bucket < ? GROUP BY device
+"""
+# Saatlik özette başarısız ping içeren cihazlar
+HOUR_FAILED_SQL = "SELECT device, probes, ok FROM rollup_1h WHERE bucket = ? AND ok < probes"
+
+# Saat tamamlanmamış ya da rapor sınırında kalan bloklar: cihaz başına toplamlar
+BLOCK_SQL = {
+    'minute': """SELECT device, SUM(probes), SUM(ok), SUM(rtt_sum), MIN(rtt_min), MAX(rtt_max)
+                 FROM rollup_1m WHERE bucket >= ? AND bucket < ? GROUP BY device""",
+    'raw': """SELECT device, COUNT(*), SUM(ok), SUM(rtt), MIN(rtt), MAX(rtt)
+              FROM probes WHERE ts >= ? AND ts < ? GROUP BY device""",
+}
+
+# Kesinti aranan bloklar için ayrıntılı örnekler: (cihaz, zaman, süre, ping, başarılı).
+# Dakikalar tek tek verilir ki (bucket, device) birincil anahtarında doğrudan aransın
+SAMPLE_SQL = {
+    'minute': """SELECT device, bucket, 60, probes, ok FROM rollup_1m
+                 WHERE bucket IN ({minutes}) AND device IN ({devices}) ORDER BY bucket""",
+    'raw': """SELECT device, ts, 0, 1, ok FROM probes
+              WHERE ts >= ? AND ts < ? AND device IN ({devices}) ORDER BY ts""",
+}
+
+# Gecikme histogramı: (cihaz, dilim, ping sayısı). Dakikalık özetlerde dakika ortalaması kullanılır
+HISTOGRAM_SQL = {
+    'hour': """SELECT device, bin, SUM(probes) FROM latency_1h
+               WHERE bucket >= ? AND bucket < ? GROUP BY device, bin""",
+    'minute': f"""SELECT device, {LATENCY_BIN_SQL.format(rtt='(rtt_sum / ok)')}, SUM(ok) FROM rollup_1m
+                  WHERE bucket >= ? AND bucket < ? AND ok > 0 AND rtt_sum IS NOT NULL GROUP BY device, 2""",
+    'raw': f"""SELECT device, {LATENCY_BIN_SQL.format(rtt='rtt')}, COUNT(*) FROM probes
+               WHERE ts >= ? AND ts < ? AND rtt IS NOT NULL GROUP BY device, 2""",
+}
+
+COLUMNS = ('scope', 'id', 'name', 'ip', 'group', 'devices', 'probes', 'uptime', 'loss', 'outages',
+           'downtime', 'longest_outage', 'mttr', 'mtbf', 'rtt_avg', 'rtt_min', 'rtt_max') + \
+    tuple(f'p{p}' for p in PERCENTILES)
+
+
+def _round(value, digits):
+    return None if value is None else round(value, digits)
+
+
+class DeviceStats:
+    """Bir cihazın (ya da cihaz grubunun) rapor dönemindeki birikmiş değerleri"""
+
+    __slots__ = ('probes', 'ok', 'rtt_sum', 'rtt_min', 'rtt_max', 'monitored', 'outages',
+                 'downtime', 'longest', 'histogram', 'open_start', 'open_failures', 'deferred')
+
+    def __init__(self):
+        self.probes = 0
+        self.ok = 0
+        self.rtt_sum = 0.0
+        self.rtt_min = None
+        self.rtt_max = None
+        self.monitored = 0.0   # saniye, verisi olan blokların toplam süresi
+        self.outages = 0
+        self.downtime = 0.0
+        self.longest = 0.0
+        self.histogram = {}    # gecikme dilimi -> ping sayısı
+        self.open_start = None  # süren kesintinin başlangıcı
+        self.open_failures = 0
+        self.deferred = None   # kesinti başlangıcı olabilecek, henüz ayrıntısı okunmamış blok
+
+    def add(self, probes, ok, rtt_sum, rtt_min, rtt_max, monitored):
+        self.probes += probes
+        self.ok += ok
+        self.monitored += monitored
+        if rtt_sum is not None:
+            self.rtt_sum += rtt_sum
+        if rtt_min is not None and (self.rtt_min is None or rtt_min < self.rtt_min):
+            self.rtt_min = rtt_min
+        if rtt_max is not None and (self.rtt_max is None or rtt_max > self.rtt_max):
+            self.rtt_max = rtt_max
+
+    def scan(self, samples, min_failures):
+        """Zamana göre sıralı (zaman, süre, ping, başarılı) örneklerinde kesintileri bul.
+
+        Özet örneklerinde (dakika, saat) pinglerin sırası bilinmediğinden
+        başarısız pinglerin, kesinti başlarken örneğin sonunda, biterken
+        başında olduğu varsayılır.
+        """
+        for t, span, probes, ok in samples:
+            failed = probes - ok
+            if self.open_start is not None:
+                self.open_failures += failed
+                if ok:
+                    self.close_outage(t + span * failed / probes, min_failures)
+            elif failed:
+                self.open_start = t + span * ok / probes
+                self.open_failures = failed
+
+    def close_outage(self, end, min_failures):
+        """Süren kesintiyi end zamanında bitir; yeterince uzun değilse sayma"""
+        if self.open_failures >= min_failures:
+            duration = max(0.0, end - self.open_start)
+            self.outages += 1
+            self.downtime += duration
+            self.longest = max(self.longest, duration)
+        self.open_start = None
+        self.open_failures = 0
+
+    def merge(self, other):
+        """Grup toplamı için başka bir kaydı ekle"""
+        self.add(other.probes, other.ok, other.rtt_sum, other.rtt_min, other.rtt_max, other.monitored)
+        self.outages += other.outages
+        self.downtime += other.downtime
+        self.longest = max(self.longest, other.longest)
+        for index, count in other.histogram.items():
+            self.histogram[index] = self.histogram.get(index, 0) + count
+
+    def percentiles(self, percents=PERCENTILES):
+        """Histogramdan yüzdelikler (dilim içinde doğrusal ara değer)"""
+        values = [None] * len(percents)
+        total = sum(self.histogram.values())
+        if not total:
+            return values
+        targets = sorted((percent * total / 100, position) for position, percent in enumerate(percents))
+        next_target = 0
+        seen = 0
+        for index in sorted(self.histogram):
+            count = self.histogram[index]
+            low, high = latency_bin_bounds(index)
+            while next_target < len(targets) and seen + count >= targets[next_target][0]:
+                target, position = targets[next_target]
+                values[position] = low + (high - low) * max(0.0, target - seen) / count
+                next_target += 1
+            seen += count
+        return values
+
+    def metrics(self):
+        """Rapor satırındaki ölçümler (süreler saniye, gecikmeler ms)"""
+        uptime = loss = rtt_avg = mttr = mtbf = None
+        if self.monitored:
+            uptime = max(0.0, 100 * (1 - self.downtime / self.monitored))
+        if self.probes:
+            loss = 100 * (self.probes - self.ok) / self.probes
+        if self.ok:
+            rtt_avg = self.rtt_sum / self.ok
+        if self.outages:
+            mttr = self.downtime / self.outages
+            mtbf = max(0.0, self.monitored - self.downtime) / self.outages
+        # Verisi olmayan cihazda kesinti alanları boş bırakılır
+        outages, downtime, longest = (self.outages, self.downtime, self.longest) if self.monitored else (None,) * 3
+        row = {'probes': self.probes, 'uptime': _round(uptime, 4), 'loss': _round(loss, 4),
+               'outages': outages, 'downtime': _round(downtime, 1),
+               'longest_outage': _round(longest, 1), 'mttr': _round(mttr, 1),
+               'mtbf': _round(mtbf, 1), 'rtt_avg': _round(rtt_avg, 2),
+               'rtt_min': _round(self.rtt_min, 2), 'rtt_max': _round(self.rtt_max, 2)}
+        for percent, value in zip(PERCENTILES, self.percentiles()):
+            row[f'p{percent}'] = _round(value, 2)
+        return row
+
+
+class SlaReport:
+    """Geçmiş veritabanından cihaz başına erişilebilirlik hesaplar.
+
+    Dönem saatlik bloklara bölünür. Tamamlanmış saatlerin toplamları ve
+    gecikme histogramları saatlik özetlerden SQL ile tek seferde alınır;
+    ayrıntıya (dakikalık özetler, özetlenmemiş son saatte ham kayıtlar)
+    yalnızca kesinti olabilecek cihaz-saatleri için inilir. Art arda min_failures pingi
+    tutmayan tekil kayıplar kesinti sayılmaz, yalnızca kayıp oranına girer.
+    Böylece ham kayıtların ya da dakikaların tamamı Python'a taşınmaz.
+    """
+
+    def __init__(self, conn, min_failures=MIN_FAILURES):
+        self.conn = conn
+        self.min_failures = min_failures
+        self.stats = {}
+        self._active = set()  # süren kesintisi ya da bekleyen bloğu olan cihazlar
+        tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if not {'probes', 'rollup_1m', 'rollup_1h', 'meta'} <= tables:
+            raise ValueError("Ping geçmişi veritabanı değil")
+        self.has_latency = 'latency_1h' in tables
+        row = conn.execute("SELECT value FROM meta WHERE key = 'rollup_1h_bucket'").fetchone()
+        self.hour_done = row[0] if row else 0  # bu zamandan önceki dakikalar saatlik özette
+        self.raw_from = conn.execute('SELECT MIN(ts) FROM probes').fetchone()[0]
+        self.minute_from = conn.execute('SELECT MIN(bucket) FROM rollup_1m').fetchone()[0]
+
+    def blocks(self, start, end):
+        """[start, end) aralığını (başlangıç, bitiş, kaynak) saat bloklarına böl"""
+        lo = start
+        while lo < end:
+            hi = min(end, (lo // HOUR + 1) * HOUR)
+            if hi - lo == HOUR and hi <= self.hour_done:
+                source = 'hour'
+            elif self.raw_from is not None and lo >= self.raw_from:
+                source = 'raw'
+            else:
+                source = 'minute'
+            yield lo, hi, source
+            lo = hi
+
+    def _detail_source(self, lo, source):
+        """Bloğun kesinti ayrıntısının okunacağı katman (yoksa None).
+
+        Dakikalık özetler (zaman, cihaz) anahtarıyla okunur; ham kayıtlarda cihaz
+        indeksi olmadığından yalnızca özete aktarılmamış son saatlerde kullanılır.
+        """
+        if source == 'raw':
+            return 'raw'
+        if self.minute_from is not None and lo >= self.minute_from:
+            return 'minute'
+        return None
+
+    def _device(self, device):
+        stats = self.stats.get(device)
+        if stats is None:
+            stats = self.stats[device] = DeviceStats()
+        return stats
+
+    def _samples(self, source, lo, hi, devices):
+        """Cihazların bloktaki ayrıntılı örnekleri: cihaz -> [(zaman, süre, ping, başarılı)]"""
+        if source == 'minute':
+            bounds = list(range(lo, hi, 60))
+            minutes = ','.join('?' * len(bounds))
+        else:
+            bounds = [lo, hi]
+            minutes = None
+        samples = {}
+        for index in range(0, len(devices), DEVICE_CHUNK):
+            chunk = devices[index:index + DEVICE_CHUNK]
+            sql = SAMPLE_SQL[source].format(minutes=minutes, devices=','.join('?' * len(chunk)))
+            for device, t, span, probes, ok in self.conn.execute(sql, (*bounds, *chunk)):
+                samples.setdefault(device, []).append((t, span, probes, ok))
+        return samples
+
+    def _process_block(self, lo, hi, source):
+        if source == 'hour':
+            failed_rows = self.conn.execute(HOUR_FAILED_SQL, (lo,)).fetchall()
+        else:
+            failed_rows = []
+            for device, probes, ok, rtt_sum, rtt_min, rtt_max in self.conn.execute(BLOCK_SQL[source], (lo, hi)):
+                self._device(device).add(probes, ok, rtt_sum, rtt_min, rtt_max, hi - lo)
+                if ok < probes:
+                    failed_rows.append((device, probes, ok))
+
+        min_failures = self.min_failures
+        detail = self._detail_source(lo, source)
+        active, self._active = self._active, set()
+        drill = []
+        summaries = {}
+        for device, probes, ok in failed_rows:
+            stats = self._device(device)
+            active.discard(device)
+            failed = probes - ok
+            summary = ((lo, hi - lo, probes, ok),)
+            if detail is None:
+                stats.scan(summary, min_failures)
+            elif stats.deferred is not None:
+                # Önceki bloğun sonundaki hatalar bu blokta sürüyor olabilir
+                prev_lo, prev_hi, prev_detail, prev_summary = stats.deferred
+                stats.deferred = None
+                samples = self._samples(prev_detail, prev_lo, prev_hi, [device]).get(device, prev_summary)
+                stats.scan(samples, min_failures)
+                drill.append(device)
+            elif stats.open_start is not None or failed >= min_failures:
+                drill.append(device)
+            else:
+                # Tek başına kesinti sayılmayacak kadar az hata; sonraki blokta da
+                # hata varsa ayrıntısı okunur
+                stats.deferred = (lo, hi, detail, summary)
+            summaries[device] = summary
+
+        if drill:
+            samples = self._samples(detail, lo, hi, drill)
+            for device in drill:
+                self.stats[device].scan(samples.get(device, summaries[device]), min_failures)
+
+        for device in summaries:
+            stats = self.stats[device]
+            if stats.open_start is not None or stats.deferred is not None:
+                self._active.add(device)
+        # Bu blokta hatası olmayan (ya da verisi olmayan) cihazların kesintisi blok başında biter
+        for device in active:
+            stats = self.stats[device]
+            stats.deferred = None
+            if stats.open_start is not None:
+                stats.close_outage(lo, min_failures)
+
+    def _add_totals(self, lo, hi):
+        for device, probes, ok, rtt_sum, rtt_min, rtt_max, hours in self.conn.execute(HOUR_TOTALS_SQL, (lo, hi)):
+            self._device(device).add(probes, ok, rtt_sum, rtt_min, rtt_max, hours * HOUR)
+
+    def _add_histogram(self, source, lo, hi):
+        if source == 'hour' and not self.has_latency:
+            return
+        for device, index, count in self.conn.execute(HISTOGRAM_SQL[source], (lo, hi)):
+            stats = self.stats.get(device)
+            if stats is not None:
+                stats.histogram[index] = stats.histogram.get(index, 0) + count
+
+    def run(self, start, end):
+        """Dönemi hesapla; cihaz anahtarı -> DeviceStats döndürür"""
+        blocks = list(self.blocks(start, end))
+        # Aynı kaynaktan gelen ardışık bloklar için toplamlar ve histogram tek sorguda
+        for source, group in itertools.groupby(blocks, key=lambda block: block[2]):
+            group = list(group)
+            lo, hi = group[0][0], group[-1][1]
+            if source == 'hour':
+                self._add_totals(lo, hi)
+            for block in group:
+                self._process_block(*block)
+            self._add_histogram(source, lo, hi)
+        for device in self._active:
+            stats = self.stats[device]
+            stats.deferred = None
+            if stats.open_start is not None:
+                stats.close_outage(end, self.min_failures)
+        self._active = set()
+        return self.stats
+
+
+def open_history(path):
+    """Geçmiş veritabanını salt okunur aç; sorgular tek bir tutarlı görüntüden okunur"""
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Geçmiş veritabanı bulunamadı: {path}")
+    uri = pathlib.Path(path).resolve().as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, timeout=30, isolation_level=None)
+    conn.execute('BEGIN')
+    return conn
+
+
+def read_devices(path, group_by='group'):
+    """devices.json'dan cihaz anahtarı -> (ad, IP, grup)"""
+    devices = {}
+    if not path or not os.path.isfile(path):
+        return devices
+    with open(path, 'r', encoding='utf-8') as f:
+        for data in iter_json_array(f):
+            key = data.get('id') or data.get('ip')
+            if key:
+                group = data.get(group_by)
+                devices[key] = (data.get('name') or data.get('ip'), data.get('ip'),
+                                None if group in (None, '') else str(group))
+    return devices
+
+
+def build_report(stats, devices, start, end, min_failures=MIN_FAILURES):
+    """Cihaz, grup ve toplam satırlarından oluşan rapor sözlüğü"""
+    rows = []
+    groups = {}
+    total = DeviceStats()
+    for key in set(stats) | set(devices):
+        name, ip, group = devices.get(key, (key, None, None))
+        device_stats = stats.get(key) or DeviceStats()
+        row = {'id': key, 'name': name, 'ip': ip, 'group': group}
+        row.update(device_stats.metrics())
+        rows.append(row)
+        total.merge(device_stats)
+        if group is not None:
+            members = groups.setdefault(group, [DeviceStats(), 0])
+            members[0].merge(device_stats)
+            members[1] += 1
+
+    def order(row):
+        # En düşük erişilebilirlik önce, verisi olmayanlar sonda
+        return row['uptime'] is None, row['uptime'] or 0, str(row['name'])
+
+    rows.sort(key=order)
+    group_rows = []
+    for name, (group_stats, count) in groups.items():
+        row = {'name': name, 'devices': count}
+        row.update(group_stats.metrics())
+        group_rows.append(row)
+    group_rows.sort(key=order)
+    total_row = {'name': 'Tümü', 'devices': len(rows)}
+    total_row.update(total.metrics())
+    return {'from': datetime.fromtimestamp(start).isoformat(timespec='minutes'),
+            'to': datetime.fromtimestamp(end).isoformat(timespec='minutes'),
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'min_failures': min_failures,
+            'devices': rows, 'groups': group_rows, 'total': total_row}
+
+
+def write_json(report, f):
+    json.dump(report, f, ensure_ascii=False, indent=2)
+    f.write('\n')
+
+
+def write_csv(report, f):
+    """Tek tablo: scope sütunu device, group ya da all"""
+    writer = csv.DictWriter(f, COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    for scope, rows in (('device', report['devices']), ('group', report['groups']),
+                        ('all', [report['total']])):
+        for row in rows:
+            writer.writerow(dict(row, scope=scope))
+
+
+def format_duration(seconds):
+    """Süreyi okunur metne çevir (ör. 2 sa 05 dk)"""
+    if seconds is None:
+        return ''
+    seconds = int(round(seconds))
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days} g {hours} sa"
+    if hours:
+        return f"{hours} sa {minutes:02d} dk"
+    if minutes:
+        return f"{minutes} dk {seconds:02d} sn"
+    return f"{seconds} sn"
+
+
+def _cell(value, digits=None):
+    if value is None:
+        return ''
+    if digits is not None:
+        return f"{value:.{digits}f}"
+    return html.escape(str(value))
+
+
+HTML_STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin-bottom: 2em; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: right; }
+th { background: #f0f0f0; }
+td.text { text-align: left; }
+tr.bad td { background: #fde2e2; }
+tr.warn td { background: #fff4d6; }
+"""
+
+
+def write_html(report, f, target=99.9):
+    """Tek dosyalık HTML rapor; hedefin altındaki satırlar renklendirilir"""
+    percent_headers = ''.join(f'<th>p{p} ms</th>' for p in PERCENTILES)
+    headers = ('<th>Erişilebilirlik %</th><th>Kayıp %</th><th>Kesinti</th><th>Toplam kesinti</th>'
+               '<th>En uzun</th><th>MTTR</th><th>MTBF</th><th>Ort. ms</th>' + percent_headers)
+
+    def cells(row):
+        values = [_cell(row['uptime'], 3), _cell(row['loss'], 3), _cell(row['outages']),
+                  format_duration(row['downtime']), format_duration(row['longest_outage']),
+                  format_duration(row['mttr']), format_duration(row['mtbf']), _cell(row['rtt_avg'], 2)]
+        values += [_cell(row[f'p{p}'], 2) for p in PERCENTILES]
+        return ''.join(f'<td>{value}</td>' for value in values)
+
+    def row_class(row):
+        if row['uptime'] is None or row['uptime'] >= target:
+            return ''
+        return ' class="bad"' if row['uptime'] < target - 1 else ' class="warn"'
+
+    title = f"Erişilebilirlik Raporu {report['from']} - {report['to']}"
+    out = ['<!DOCTYPE html>', '<html lang="tr"><head><meta charset="utf-8">',
+           f'<title>{html.escape(title)}</title><style>{HTML_STYLE}</style></head><body>',
+           f'<h1>{html.escape(title)}</h1>',
+           f"<p>Oluşturulma: {html.escape(report['generated'])}. Kesinti: art arda en az "
+           f"{report['min_failures']} başarısız ping. Hedef: %{target}.</p>",
+           '<h2>Özet</h2><table>', f'<tr><th>Kapsam</th><th>Cihaz</th>{headers}</tr>']
+    total = report['total']
+    out.append(f'<tr{row_class(total)}><td class="text">{_cell(total["name"])}</td>'
+               f'<td>{total["devices"]}</td>{cells(total)}</tr>')
+    for row in report['groups']:
+        out.append(f'<tr{row_class(row)}><td class="text">{_cell(row["name"])}</td>'
+                   f'<td>{row["devices"]}</td>{cells(row)}</tr>')
+    out += ['</table>', '<h2>Cihazlar</h2><table>',
+            f'<tr><th>Cihaz</th><th>IP / Ad</th><th>Grup</th>{headers}</tr>']
+    for row in report['devices']:
+        out.append(f'<tr{row_class(row)}><td class="text">{_cell(row["name"])}</td>'
+                   f'<td class="text">{_cell(row["ip"])}</td><td class="text">{_cell(row["group"])}</td>'
+                   f'{cells(row)}</tr>')
+    out += ['</table>', '</body></html>']
+    f.write('\n'.join(out) + '\n')
+
+
+WRITERS = {'csv': write_csv, 'json': write_json, 'html': write_html}
+
+
+def parse_time(text):
+    """Yerel saatle "YYYY-MM-DD" ya da "YYYY-MM-DD HH:MM" -> epoch"""
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Geçersiz tarih: {text}")
+
+
+def month_range(text):
+    """"YYYY-MM" ayının başlangıç ve bitişi (epoch)"""
+    try:
+        first = datetime.strptime(text, '%Y-%m')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Geçersiz ay: {text} (YYYY-AA bekleniyor)")
+    following = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first.timestamp(), following.timestamp()
+
+
+def parse_args(argv=None):
+    """Komut satırı argümanlarını ayrıştır"""
+    parser = argparse.ArgumentParser(description="Ping Monitor - Erişilebilirlik (SLA) raporu")
+    parser.add_argument('--history', default='history.db', help="Ping geçmişi veritabanı")
+    parser.add_argument('--devices', default='devices.json', help="Cihaz adları ve grupları için cihaz listesi")
+    period = parser.add_mutually_exclusive_group()
+    period.add_argument('--month', type=month_range, metavar='YYYY-AA', help="Raporlanacak ay")
+    period.add_argument('--days', type=float, help=f"Son N gün (varsayılan {DEFAULT_DAYS})")
+    parser.add_argument('--from', dest='start', type=parse_time, metavar='TARİH',
+                        help="Başlangıç (YYYY-AA-GG [SS:DD], yerel saat)")
+    parser.add_argument('--to', dest='end', type=parse_time, metavar='TARİH',
+                        help="Bitiş (varsayılan: şimdi)")
+    parser.add_argument('--group-by', default='group', metavar='ALAN',
+                        help="Cihazları devices.json'daki bu alana göre grupla (varsayılan: group)")
+    parser.add_argument('--min-failures', type=int, default=MIN_FAILURES, metavar='N',
+                        help=f"Kesinti sayılması için art arda başarısız ping sayısı (varsayılan {MIN_FAILURES})")
+    parser.add_argument('--target', type=float, default=99.9, metavar='YÜZDE',
+                        help="HTML raporunda işaretlenecek erişilebilirlik hedefi (varsayılan 99.9)")
+    parser.add_argument('--format', choices=tuple(WRITERS),
+                        help="Çıktı biçimi (varsayılan: dosya uzantısından, yoksa csv)")
+    parser.add_argument('-o', '--output', help="Çıktı dosyası (varsayılan: standart çıktı)")
+    args = parser.parse_args(argv)
+    if args.month and (args.start is not None or args.end is not None):
+        parser.error("--month ile --from/--to birlikte kullanılamaz")
+    if args.format is None:
+        extension = os.path.splitext(args.output or '')[1].lower().lstrip('.')
+        args.format = extension if extension in WRITERS else 'csv'
+    return args
+
+
+def report_period(args, now=None):
+    """Argümanlardan dakikaya yuvarlanmış (başlangıç, bitiş); bitiş şimdiyi geçmez"""
+    now = time.time() if now is None else now
+    if args.month:
+        start, end = args.month
+    else:
+        end = args.end if args.end is not None else now
+        start = args.start if args.start is not None else end - (args.days or DEFAULT_DAYS) * 86400
+    start, end = int(start // 60 * 60), int(min(end, now) // 60 * 60)
+    return start, end
+
+
+def main(argv=None):
+    """Ana fonksiyon"""
+    args = parse_args(argv)
+    start, end = report_period(args)
+    if start >= end:
+        print("Rapor dönemi boş", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    try:
+        conn = open_history(args.history)
+        try:
+            stats = SlaReport(conn, args.min_failures).run(start, end)
+        finally:
+            conn.close()
+        devices = read_devices(args.devices, args.group_by)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Rapor oluşturulamadı: {e}", file=sys.stderr)
+        return 1
+    report = build_report(stats, devices, start, end, args.min_failures)
+    writer = WRITERS[args.format]
+    options = {'target': args.target} if args.format == 'html' else {}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            writer(report, f, **options)
+    else:
+        writer(report, sys.stdout, **options)
+    print(f"Rapor: {len(report['devices'])} cihaz, {time.perf_counter() - started:.2f} sn",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
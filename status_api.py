@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Salt okunur JSON durum API'si (asyncio HTTP sunucusu)
+"""
+
+import asyncio
+import collections
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from device_registry import (STATUS_NAMES, STATUS_UNKNOWN, STATUS_ONLINE, STATUS_OFFLINE,
+                             STATUS_UNREACHABLE)
+
+MAX_WAIT = 60            # saniye, uzun yoklamada en fazla bekleme
+KEEPALIVE_TIMEOUT = 30   # saniye, boştaki bağlantının kapatılma süresi
+SSE_HEARTBEAT = 15       # saniye, olay akışında boş satır aralığı
+MAX_HEADERS = 100
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 431: 'Request Header Fields Too Large',
+           503: 'Service Unavailable'}
+
+# Sürüm sayaçları her işlem başlangıcında sıfırdan başlar; ETag'lere eklenen işleme
+# özgü önek, yeniden başlatmadan önce alınmış bir ETag'in yanlışlıkla 304 almasını önler
+ETAG_PREFIX = os.urandom(4).hex()
+
+
+def encode_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class Snapshot:
+    """Cihaz durumlarının değişmez anlık görüntüsü; yanıt gövdeleri önceden kodlanır.
+
+    Yalnızca durum değişikliğinde ve cihaz ekleme/silmede yeniden oluşturulur;
+    ETag de buna bağlıdır, böylece ping sonuçları istemci önbelleklerini bozmaz.
+    """
+
+    __slots__ = ('version', 'change_seq', 'created', 'etag', 'devices', 'devices_body', 'summary_body')
+
+    def __init__(self, version, change_seq, rows):
+        self.version = version
+        self.change_seq = change_seq
+        self.created = time.monotonic()
+        self.etag = f'"{ETAG_PREFIX}-{version}-{change_seq}"'
+        generated = time.time()
+        self.devices = {}
+        counts = [0] * len(STATUS_NAMES)
+        for device_id, name, ip, status, last_status_change in rows:
+            counts[status] += 1
+            self.devices[device_id] = {
+                'id': device_id, 'name': name, 'ip': ip, 'status': STATUS_NAMES[status],
+                'last_status_change': last_status_change,
+            }
+        self.devices_body = encode_json({'version': version, 'generated': generated,
+                                         'devices': list(self.devices.values())})
+        self.summary_body = encode_json({
+            'version': version, 'generated': generated, 'total': len(rows),
+            'online': counts[STATUS_ONLINE], 'offline': counts[STATUS_OFFLINE],
+            'unknown': counts[STATUS_UNKNOWN], 'unreachable': counts[STATUS_UNREACHABLE],
+            'last_change': change_seq,
+        })
+
+
+class LatencySnapshot:
+    """Son ping zamanları ve gecikmelerin anlık görüntüsü (her pingte eskir)"""
+
+    __slots__ = ('version', 'created', 'etag', 'body')
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.created = time.monotonic()
+        self.etag = f'"{ETAG_PREFIX}-rtt-{version}"'
+        self.body = encode_json({
+            'version': version, 'generated': time.time(),
+            'devices': [{'id': device_id, 'last_check': last_check, 'last_rtt': last_rtt}
+                        for device_id, last_check, last_rtt in rows],
+        })
+
+
+class StatusAPI:
+    """Cihaz durumlarını, özet sayıları ve son durum değişikliklerini sunan HTTP sunucusu.
+
+    Kendi thread'indeki bir asyncio döngüsünde çalışır. Yanıtlar değişmez bir
+    anlık görüntüden verilir; durum görüntüsü yalnızca durum değişikliğinde ve
+    cihaz ekleme/silmede, gecikme görüntüsü ise en fazla refresh_interval
+    saniyede bir yeniden oluşturulur. ETag/If-None-Match, uzun yoklama (?wait=)
+    ve sunucu olayları (/api/events) desteklenir; böylece çok sayıda istemci
+    neredeyse hiç maliyet getirmez.
+
+    Uç noktalar:
+        GET /api/devices           tüm cihazların durumu
+        GET /api/devices/<id>      tek cihaz
+        GET /api/summary           çevrimiçi/çevrimdışı sayıları
+        GET /api/latency           son ping zamanları ve gecikmeler
+        GET /api/changes?since=N   N'den sonraki durum değişiklikleri
+        GET /api/events            durum değişiklikleri (text/event-stream)
+    """
+
+    def __init__(self, monitor, host='127.0.0.1', port=8080, refresh_interval=1.0, max_changes=1000):
+        self.monitor = monitor
+        self.refresh_interval = refresh_interval
+        self.address = None
+        self._changes = collections.deque(maxlen=max_changes)
+        self._change_seq = 0
+        self._snapshot = None
+        self._building = None
+        self._latency = None
+        self._latency_building = None
+        self._changed = None
+        self._server = None
+        self._error = None
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(host, port, started),
+                                        name='status-api', daemon=True)
+        self._thread.start()
+        started.wait()
+        if self._error is not None:
+            raise self._error
+        monitor.status_listeners.append(self._on_status_change)
+
+    def close(self):
+        """Sunucuyu durdur"""
+        try:
+            self.monitor.status_listeners.remove(self._on_status_change)
+        except ValueError:
+            pass
+        if self._thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(5)
+
+    def _run(self, host, port, started):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self._changed = asyncio.Event()
+            self._server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle, host, port))
+            self.address = self._server.sockets[0].getsockname()
+        except OSError as e:
+            self._error = e
+            started.set()
+            self.loop.close()
+            return
+        started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self._server.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    def _on_status_change(self, device, old_status, new_status, timestamp):
+        """Monitör thread'inden çağrılır; olayı asyncio döngüsüne aktarır"""
+        event = {'time': timestamp, 'id': device.id, 'name': device.name, 'ip': device.ip,
+                 'from': STATUS_NAMES[old_status], 'to': STATUS_NAMES[new_status]}
+        try:
+            self.loop.call_soon_threadsafe(self._publish, event)
+        except RuntimeError:
+            pass  # döngü kapanmış
+
+    def _publish(self, event):
+        self._change_seq += 1
+        event['seq'] = self._change_seq
+        self._changes.append(event)
+        # Bekleyen herkesi uyandır; sonraki bekleyiciler yeni olayı bekler
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def changes_since(self, seq):
+        """seq'den sonraki olaylar ve aradaki olayların bir kısmı atıldı mı"""
+        events = [event for event in self._changes if event['seq'] > seq]
+        truncated = bool(self._changes) and self._changes[0]['seq'] > seq + 1
+        return events, truncated
+
+    async def wait_change(self, timeout):
+        """Yeni bir durum değişikliği ya da zaman aşımına kadar bekle"""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def snapshot(self):
+        """Güncel durum görüntüsü; gerekiyorsa ayrı thread'de yeniden oluşturulur"""
+        snapshot = self._snapshot
+        if (snapshot is not None and snapshot.change_seq == self._change_seq
+                and snapshot.version == self.monitor.state_version):
+            return snapshot
+        if self._building is None:
+            # Aynı anda gelen istekler tek bir yeniden oluşturmayı paylaşır
+            self._building = asyncio.ensure_future(self._rebuild())
+        return await asyncio.shield(self._building)
+
+    async def _rebuild(self):
+        try:
+            snapshot = await self.loop.run_in_executor(None, self._build_snapshot, self._change_seq)
+            self._snapshot = snapshot
+            return snapshot
+        finally:
+            self._building = None
+
+    def _build_snapshot(self, change_seq):
+        monitor = self.monitor
+        with monitor._cond:
+            version = monitor.state_version
+            rows = [(device.id, device.name, device.ip, device.status, device.last_status_change)
+                    for device in monitor.devices]
+        return Snapshot(version, change_seq, rows)
+
+    async def latency(self):
+        """Güncel gecikme görüntüsü; en fazla refresh_interval saniyede bir yenilenir"""
+        latency = self._latency
+        if latency is not None and (latency.version == self.monitor.version
+                                    or time.monotonic() - latency.created < self.refresh_interval):
+            return latency
+        if self._latency_building is None:
+            self._latency_building = asyncio.ensure_future(self._rebuild_latency())
+        return await asyncio.shield(self._latency_building)
+
+    async def _rebuild_latency(self):
+        try:
+            latency = await self.loop.run_in_executor(None, self._build_latency)
+            self._latency = latency
+            return latency
+        finally:
+            self._latency_building = None
+
+    def _build_latency(self):
+        monitor = self.monitor
+        with monitor._cond:
+            version = monitor.version
+            rows = [(device.id, device.last_check, device.last_rtt) for device in monitor.devices]
+        return LatencySnapshot(version, rows)
+
+    async def _handle(self, reader, writer):
+        """Tek bir bağlantıdaki istekleri sırayla işle (HTTP/1.1 keep-alive)"""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    await self._send(writer, 400, {'error': 'bad request'}, keep_alive=False)
+                    break
+                method, target, version = parts
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    if len(headers) >= MAX_HEADERS:
+                        await self._send(writer, 431, {'error': 'too many headers'}, keep_alive=False)
+                        return
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                              or headers.get('connection', '').lower() == 'keep-alive')
+                if method not in ('GET', 'HEAD'):
+                    await self._send(writer, 405, {'error': 'method not allowed'},
+                                     keep_alive=False, extra={'Allow': 'GET, HEAD'})
+                    break
+                if not await self._dispatch(method, target, headers, writer, keep_alive):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass  # sunucu kapanıyor
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, headers, writer, keep_alive):
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip('/')
+        head = method == 'HEAD'
+        try:
+            wait = min(MAX_WAIT, max(0.0, float(query.get('wait', 0))))
+            since = int(query.get('since', headers.get('last-event-id', 0)))
+        except ValueError:
+            await self._send(writer, 400, {'error': 'invalid query'}, keep_alive=keep_alive)
+            return keep_alive
+
+        if path == '/api/events':
+            await self._stream_events(writer, since)
+            return False
+
+        if path == '/api/changes':
+            events, truncated = self.changes_since(since)
+            if not events and wait and await self.wait_change(wait):
+                events, truncated = self.changes_since(since)
+            await self._send(writer, 200, {'last': self._change_seq, 'truncated': truncated,
+                                           'changes': events}, keep_alive=keep_alive, head=head)
+            return keep_alive
+
+        if path in ('/api/devices', '/api/summary') or path.startswith('/api/devices/'):
+            snapshot = await self.snapshot()
+            # Uzun yoklama: istemcinin elindeki görüntü güncelse değişiklik bekle
+            if wait and headers.get('if-none-match') == snapshot.etag:
+                if await self.wait_change(wait):
+                    snapshot = await self.snapshot()
+            if path.startswith('/api/devices/'):
+                device = snapshot.devices.get(path[len('/api/devices/'):])
+                if device is None:
+                    await self._send(writer, 404, {'error': 'device not found'}, keep_alive=keep_alive)
+                    return keep_alive
+                body = encode_json(device)
+            else:
+                body = snapshot.devices_body if path == '/api/devices' else snapshot.summary_body
+            extra = {'ETag': snapshot.etag, 'Cache-Control': 'no-cache'}
+            if headers.get('if-none-match') == snapshot.etag:
+                await self._send(writer, 304, None, keep_alive=keep_alive, extra=extra)
+            else:
+                await self._send(writer, 200, body, keep_alive=keep_alive, extra=extra, head=head)
+            return keep_alive
+
+        if path == '/api/latency':
+            latency = await self.latency()
+            extra = {'ETag': latency.etag, 'Cache-Control': 'no-cache'}
+            if headers.get('if-none-match') == latency.etag:
+                await self._send(writer, 304, None, keep_alive=keep_alive, extra=extra)
+            else:
+                await self._send(writer, 200, latency.body, keep_alive=keep_alive, extra=extra, head=head)
+            return keep_alive
+
+        await self._send(writer, 404, {'error': 'not found'}, keep_alive=keep_alive)
+        return keep_alive
+
+    async def _stream_events(self, writer, since):
+        """Durum değişikliklerini sunucu olayları (SSE) olarak akıt"""
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n'
+                     b'Cache-Control: no-cache\r\nConnection: close\r\n'
+                     b'Access-Control-Allow-Origin: *\r\n\r\n')
+        await writer.drain()
+        while True:
+            events, _ = self.changes_since(since)
+            for event in events:
+                writer.write(b'id: %d\nevent: status\ndata: %s\n\n' % (event['seq'], encode_json(event)))
+                since = event['seq']
+            if not events:
+                writer.write(b': keepalive\n\n')
+            await writer.drain()
+            await self.wait_change(SSE_HEARTBEAT)
+
+    async def _send(self, writer, status, body, keep_alive=True, extra=None, head=False):
+        if body is not None and not isinstance(body, bytes):
+            body = encode_json(body)
+        lines = [f'HTTP/1.1 {status} {REASONS.get(status, "")}']
+        if body is not None:
+            lines.append('Content-Type: application/json; charset=utf-8')
+        lines.append(f'Content-Length: {len(body) if body is not None else 0}')
+        lines.append('Access-Control-Allow-Origin: *')
+        lines.append('Connection: ' + ('keep-alive' if keep_alive else 'close'))
+        for name, value in (extra or {}).items():
+            lines.append(f'{name}: {value}')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if body is not None and not head and status != 304:
+            writer.write(body)
+        await writer.drain()
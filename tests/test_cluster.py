@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Koordinatör ve ajan eşitleme testleri
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cluster import Agent, Coordinator
+from device_registry import STATUS_ONLINE
+from ping_monitor import PingMonitor
+
+
+def make_monitor():
+    monitor = PingMonitor(history_file=None, devices_file=None)
+    monitor.log_to_console = False
+    return monitor
+
+
+class AgentSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.monitor = make_monitor()
+        self.device = self.monitor.add_device('A', '10.0.0.1')
+        self.coordinator = Coordinator(self.monitor, port=0)
+        threading.Thread(target=self.coordinator.server.serve_forever, daemon=True).start()
+        self.agent_monitor = make_monitor()
+        self.agent = Agent(self.agent_monitor, f'http://127.0.0.1:{self.coordinator.address[1]}', 'ajan')
+        self.assertTrue(self.agent.sync())
+        self.agent_monitor.drain_logs()
+
+    def tearDown(self):
+        self.stop_coordinator()
+        self.agent_monitor.close()
+        self.monitor.close()
+
+    def stop_coordinator(self):
+        if self.coordinator is not None:
+            self.coordinator.server.shutdown()
+            self.coordinator.server.server_close()
+            self.coordinator = None
+
+    def result(self, rtt):
+        now = time.time()
+        return (self.device.id, now, rtt, STATUS_ONLINE, now)
+
+    def test_rejected_result_is_split_out(self):
+        self.agent.pending.extend([self.result(1.0), (self.device.id, 'bozuk'), self.result(2.0)])
+        self.agent_monitor.log_message('ajan logu')
+        version = self.monitor.version
+        self.assertTrue(self.agent.sync())
+        self.assertEqual(self.device.last_rtt, 2.0)
+        self.assertFalse(self.agent.pending)
+        # Geçerli sonuçlar bir kez işlenir, hatalı sonuç atılır ve loglanır
+        self.assertEqual(self.monitor.version - version, 2)
+        lines = [line for line, _ in self.monitor.log_buffer]
+        self.assertTrue(any(line.endswith('ajan logu') for line in lines))
+        rejected = [line for line, _ in self.agent_monitor.log_buffer if 'reddetti' in line]
+        self.assertEqual(len(rejected), 1)
+        self.assertIn('1 sonuç', rejected[0])
+
+    def test_results_and_logs_are_kept_while_unreachable(self):
+        self.stop_coordinator()
+        self.agent.pending.append(self.result(3.0))
+        self.agent_monitor.log_message('bekleyen log')
+        self.assertFalse(self.agent.sync())
+        self.assertEqual(len(self.agent.pending), 1)
+        self.assertTrue(any(line.endswith('bekleyen log') for line, _ in self.agent.pending_logs))
+        self.assertFalse(self.agent.sync())
+        self.assertEqual(len(self.agent.pending), 1)
+        self.assertTrue(any(line.endswith('bekleyen log') for line, _ in self.agent.pending_logs))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Akışlı cihaz listesi okuma ve bozuk dosya testleri
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_cache import iter_json_array
+from ping_monitor import PingMonitor
+
+
+class IterJsonArrayTest(unittest.TestCase):
+
+    def parse(self, text, chunk_size=4):
+        return list(iter_json_array(io.StringIO(text), chunk_size))
+
+    def test_valid(self):
+        self.assertEqual(self.parse(' [ ] '), [])
+        self.assertEqual(self.parse('[{"a": 1}, {"b": [2, 3]}]\n'), [{'a': 1}, {'b': [2, 3]}])
+        items = [{'n': index} for index in range(1000)]
+        self.assertEqual(self.parse(str(items).replace("'", '"'), 64), items)
+
+    def test_invalid(self):
+        for text in ('', '{}', '[,{}]', '[{},,{}]', '[{},]', '[{}', '[{}, {"a"', '[{} {}]', '[{}] x'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    self.parse(text)
+
+
+class LoadDevicesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'devices.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_truncated_file_is_not_loaded_or_overwritten(self):
+        text = '[{"name": "A", "ip": "10.0.0.1"}, {"name": "B", "ip": "10.0.0.2"}, {"name": "C"'
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        monitor = PingMonitor(history_file=None, devices_file=self.path)
+        monitor.log_to_console = False
+        try:
+            self.assertEqual(len(monitor.devices), 0)
+            self.assertIsNotNone(monitor.devices_load_error)
+            monitor.add_device('D', '10.0.0.4')
+            monitor.save_state()
+        finally:
+            monitor.close()
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), text)
+        self.assertEqual(os.listdir(self.directory), ['devices.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
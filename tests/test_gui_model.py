@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Cihaz tablosu filtre dizinleri testleri
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_registry import Device, STATUS_UNKNOWN, STATUS_ONLINE, STATUS_OFFLINE
+from ping_monitor_gui import DeviceListModel
+
+
+def make_device(name, ip, status=STATUS_UNKNOWN):
+    device = Device.from_dict({'name': name, 'ip': ip})
+    device.id = ip
+    device.status = status
+    return device
+
+
+class DeviceListModelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.devices = [make_device('Ofis Yazıcı', '10.0.0.1', STATUS_ONLINE),
+                        make_device('Depo Switch', '10.0.0.2', STATUS_OFFLINE),
+                        make_device('AP', '10.0.1.3', STATUS_ONLINE),
+                        make_device('Ofis AP', '10.0.1.4')]
+        self.model = DeviceListModel()
+        self.model.sync(self.devices)
+
+    def view(self, search='', status_filter=None):
+        self.model.search = search
+        self.model.status_filter = status_filter
+        return self.model.rebuild()
+
+    def scan(self, search, status_filter=None):
+        """Dizinsiz karşılaştırma: tüm cihazları tek tek dolaş"""
+        text = search.strip().casefold()
+        return [device.id for device in self.devices
+                if (text in device.name.casefold() or device.ip.startswith(text))
+                and status_filter in (None, device.status)]
+
+    def test_name_search_matches_scan(self):
+        for search in ('', 'o', 'ap', 'AP', 'ofi', 'ofis ', 'yazıcı', 'witc', 'xyz', 'sw', 'p'):
+            for status_filter in (None, STATUS_UNKNOWN, STATUS_ONLINE, STATUS_OFFLINE):
+                with self.subTest(search=search, status_filter=status_filter):
+                    self.assertEqual(self.view(search, status_filter), self.scan(search, status_filter))
+
+    def test_ip_prefix(self):
+        self.assertEqual(self.view('10.0.1.'), ['10.0.1.3', '10.0.1.4'])
+
+    def test_indexes_follow_changes(self):
+        printer, switch, ap, office_ap = self.devices
+        switch.status = STATUS_ONLINE
+        self.assertTrue(self.model.update(switch))
+        self.assertEqual(self.view('', STATUS_ONLINE), ['10.0.0.1', '10.0.0.2', '10.0.1.3'])
+        self.assertEqual(self.view('', STATUS_OFFLINE), [])
+        office_ap.name = 'Toplantı Odası'
+        self.model.sync([printer, switch, office_ap])
+        self.assertEqual(self.view('ap'), [])
+        self.assertEqual(self.view('oda'), ['10.0.1.4'])
+        self.assertEqual(self.model.counts, [1, 2, 0, 0])
+        self.assertNotIn('ap', self.model._grams)
+
+
+if __name__ == '__main__':
+    unittest.main()
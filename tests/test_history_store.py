@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Geçmiş veritabanı yazıcısı ve özetleme testleri
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import history_store
+from history_store import HistoryStore, INSERT_SQL
+
+HOUR = 1800000000  # saat başı
+
+
+class HistoryStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'history.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_bad_row_does_not_stop_writer(self):
+        logs = []
+        store = HistoryStore(self.path, flush_interval=0.05, rollup_interval=3600, log=logs.append)
+        store.record(None, 'a', None)
+        store.record(time.time(), 'a', 1.0)
+        time.sleep(0.3)
+        store.record(time.time(), 'a', 2.0)
+        store.close()
+        self.assertFalse(store._thread.is_alive())
+        self.assertEqual(store.dropped, 1)
+        self.assertEqual(len(logs), 1)
+        conn = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM probes').fetchone()[0], 2)
+        finally:
+            conn.close()
+
+    def test_late_rows_reroll_hours(self):
+        store = HistoryStore(self.path)
+        store.close()
+        conn = store.connect()
+        try:
+            def insert(rows):
+                with conn:
+                    conn.executemany(INSERT_SQL, rows)
+
+            def rollup(now):
+                with mock.patch.object(history_store.time, 'time', return_value=now):
+                    store.rollup(conn)
+
+            insert([(HOUR + minute * 60, 'a', 1, 1.0) for minute in range(0, 120, 5)])
+            rollup(HOUR + 7800)
+            # Ajanın geç gönderdiği, saatlik özete aktarılmış dakikalara düşen kayıtlar
+            insert([(HOUR + 30, 'a', 0, None), (HOUR + 3700, 'a', 1, 5.0)])
+            rollup(HOUR + 8100)
+            rows = conn.execute('SELECT bucket, probes, ok, rtt_sum, rtt_max FROM rollup_1h '
+                                'WHERE device = ? ORDER BY bucket', ('a',)).fetchall()
+            self.assertEqual(rows, [(HOUR, 13, 12, 12.0, 1.0), (HOUR + 3600, 13, 13, 17.0, 5.0)])
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Tarama süresi ölçümü testleri
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_registry import Device, DeviceRegistry, STATUS_UNREACHABLE
+from metrics import Metrics
+
+
+class SweepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = DeviceRegistry()
+        for index in range(3):
+            self.registry.add(Device.from_dict({'name': f'Cihaz {index}', 'ip': f'10.0.0.{index}'}))
+        self.a, self.b, self.c = (device.id for device in self.registry)
+        self.metrics = Metrics()
+
+    def visit(self, *ids):
+        for device_id in ids:
+            self.metrics.probe_done(1.0, device_id, self.registry)
+        return self.metrics.sweep_seconds.count
+
+    def test_sweep_waits_for_every_device(self):
+        self.visit(self.a)  # ilk ping taramayı başlatır
+        # Kısa aralıklı cihaz defalarca pinglense de tarama bitmez
+        self.assertEqual(self.visit(self.a, self.a, self.b, self.a), 0)
+        self.assertEqual(self.visit(self.c), 1)
+
+    def test_removed_and_added_devices(self):
+        self.visit(self.a)
+        self.registry.remove(self.c)
+        extra = Device.from_dict({'name': 'Yeni', 'ip': '10.0.0.9'})
+        self.registry.add(extra)
+        # Silinen cihaz beklenmez, eklenen sonraki taramaya kalır
+        self.assertEqual(self.visit(self.a, self.b), 1)
+        self.assertEqual(self.visit(self.a, self.b), 1)
+        self.assertEqual(self.visit(extra.id), 2)
+
+    def test_held_and_unreachable_devices(self):
+        self.visit(self.a)
+        self.metrics.probe_held(self.c, self.registry)
+        self.registry.get(self.c).status = STATUS_UNREACHABLE
+        self.assertEqual(self.visit(self.a, self.b), 1)
+        # Erişilemez cihaz pinglenmediği için sonraki tarama onu beklemez
+        self.assertEqual(self.visit(self.a, self.b), 2)
+        self.assertEqual(self.metrics.probes_suppressed.value, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - DNS önbelleği testleri
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resolver
+from resolver import Resolver
+
+
+class ResolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.resolver = Resolver(max_workers=1)
+
+    def tearDown(self):
+        self.release.set()
+        self.resolver.close()
+
+    def getaddrinfo(self, host, *args):
+        if host == 'yavas.example':
+            self.release.wait(5)
+        addresses = {'yavas.example': '192.0.2.1', 'b.example': '192.0.2.2'}
+        return [(socket.AF_INET, socket.SOCK_DGRAM, 0, '', (addresses[host], 0))]
+
+    def test_timed_out_lookup_is_not_cancelled(self):
+        async def scenario():
+            # Tek işçi yavaş çözümlemeyle meşgul; b.example kuyrukta beklerken zaman aşımı
+            self.resolver.prefetch(['yavas.example'])
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.resolver.resolve_async('b.example'), 0.05)
+            self.release.set()
+            return await asyncio.wait_for(self.resolver.resolve_async('b.example'), 5)
+
+        with mock.patch.object(resolver.socket, 'getaddrinfo', self.getaddrinfo):
+            self.assertEqual(asyncio.run(scenario()), '192.0.2.2')
+            self.assertEqual(self.resolver.resolve('yavas.example', 5), '192.0.2.1')
+        self.assertEqual(self.resolver._pending, {})
+
+    def test_cancelled_lookup_is_restarted(self):
+        with mock.patch.object(resolver.socket, 'getaddrinfo', self.getaddrinfo):
+            self.resolver.prefetch(['yavas.example', 'b.example'])
+            self.assertTrue(self.resolver._pending['b.example'].cancel())
+            self.assertNotIn('b.example', self.resolver._pending)
+            self.release.set()
+            self.assertEqual(self.resolver.resolve('b.example', 5), '192.0.2.2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Erişilebilirlik (SLA) raporu hesaplama testleri
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore
+from sla_report import SlaReport, build_report, open_history
+
+HOUR = 1800000000  # saat başı
+START = HOUR + 1800           # rapor saatin ortasında başlar
+END = HOUR + 3 * 3600 + 1800  # son saat tamamlanmadan biter
+DONE = HOUR + 3 * 3600        # saatlik özete aktarılmış son dakika
+
+
+def minutes(first, last):
+    """HOUR'dan itibaren first..last dakikalarının başlangıçları"""
+    return [HOUR + minute * 60 for minute in range(first, last + 1)]
+
+
+# Cihaz -> (verisi olan dakikalar, başarısız dakikalar); her dakikada tek ping
+HISTORY = {
+    # Tek başarısız ping kesinti sayılmaz
+    'a': (minutes(0, 209), minutes(160, 160)),
+    # Saatlik özetten ayrıntıya inilen 10 dakikalık kesinti
+    'b': (minutes(0, 209), minutes(80, 89)),
+    # Dönem başlangıcını ve bitişini kesen kesintiler: yalnızca dönem içindeki kısımlar
+    'd': (minutes(0, 209), minutes(26, 34) + minutes(207, 209)),
+    # Yalnızca tamamlanmamış son saatte verisi var
+    'e': (minutes(180, 209), minutes(190, 194)),
+}
+
+
+class SlaReportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'history.db')
+        store = HistoryStore(self.path)
+        store.close()
+        conn = store.connect()
+        try:
+            with conn:
+                hours = {}
+                for device, (present, failed) in HISTORY.items():
+                    failed = set(failed)
+                    for bucket in present:
+                        ok = int(bucket not in failed)
+                        rtt = 10.0 if ok else None
+                        conn.execute('INSERT INTO rollup_1m VALUES (?, ?, 1, ?, ?, ?, ?)',
+                                     (bucket, device, ok, rtt, rtt, rtt))
+                        if bucket < DONE:
+                            totals = hours.setdefault((bucket // 3600 * 3600, device), [0, 0])
+                            totals[0] += 1
+                            totals[1] += ok
+                conn.executemany('INSERT INTO rollup_1h VALUES (?, ?, ?, ?, ?, 10.0, 10.0)',
+                                 [(bucket, device, probes, ok, 10.0 * ok)
+                                  for (bucket, device), (probes, ok) in hours.items()])
+                conn.execute("INSERT INTO meta VALUES ('rollup_1h_bucket', ?)", (DONE,))
+        finally:
+            conn.close()
+        self.devices = {key: (key.upper(), None, 'x' if key in 'ab' else None) for key in 'abcde'}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def report(self):
+        conn = open_history(self.path)
+        try:
+            stats = SlaReport(conn).run(START, END)
+        finally:
+            conn.close()
+        return build_report(stats, self.devices, START, END)
+
+    def test_blocks(self):
+        conn = open_history(self.path)
+        try:
+            blocks = list(SlaReport(conn).blocks(START, END))
+        finally:
+            conn.close()
+        self.assertEqual(blocks, [(START, HOUR + 3600, 'minute'),
+                                  (HOUR + 3600, HOUR + 7200, 'hour'),
+                                  (HOUR + 7200, DONE, 'hour'),
+                                  (DONE, END, 'minute')])
+
+    def test_uptime(self):
+        report = self.report()
+        rows = {row['id']: row for row in report['devices']}
+        # İzlenen süre 3 saat (10800 sn); "e" yalnızca son yarım saatte (1800 sn) izlendi
+        self.assertEqual({key: row['uptime'] for key, row in rows.items()},
+                         {'a': 100.0, 'b': 94.4444, 'c': None, 'd': 95.5556, 'e': 83.3333})
+        self.assertEqual({key: row['outages'] for key, row in rows.items()},
+                         {'a': 0, 'b': 1, 'c': None, 'd': 2, 'e': 1})
+        self.assertEqual(rows['d']['downtime'], 480.0)
+        self.assertEqual(rows['a']['probes'], 180)
+        self.assertEqual(rows['a']['loss'], 0.5556)
+        self.assertEqual(rows['c']['probes'], 0)
+        self.assertEqual(report['groups'][0]['uptime'], 97.2222)
+        self.assertEqual(report['total']['uptime'], 95.9649)
+
+
+if __name__ == '__main__':
+    unittest.main()
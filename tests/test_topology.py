@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Bağımlılık grafiği ve erişilemez yayılımı testleri
+"""
+
+import os
+import queue
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_registry import (Device, DeviceRegistry, STATUS_UNKNOWN, STATUS_ONLINE,
+                             STATUS_OFFLINE, STATUS_UNREACHABLE)
+from ping_monitor import PingMonitor
+from sharding import ShardPool
+from topology import Topology, dependency_groups
+
+
+def make_registry(*specs):
+    """(ad, ip, üst cihazlar) üçlülerinden kayıt defteri"""
+    registry = DeviceRegistry()
+    for name, ip, parents in specs:
+        registry.add(Device.from_dict({'name': name, 'ip': ip, 'parents': list(parents)}))
+    return registry
+
+
+def by_name(registry, name):
+    return next(device for device in registry if device.name == name)
+
+
+class TopologyTest(unittest.TestCase):
+
+    def test_parents_by_name_ip_and_id(self):
+        registry = make_registry(('Modem', '10.0.0.1', ()), ('Switch', '10.0.0.2', ('Modem',)),
+                                 ('AP', '10.0.0.3', ('10.0.0.2',)))
+        modem, switch, ap = (by_name(registry, name) for name in ('Modem', 'Switch', 'AP'))
+        registry.add(Device.from_dict({'name': 'Yazıcı', 'ip': '10.0.0.4', 'parents': [ap.id]}))
+        printer = by_name(registry, 'Yazıcı')
+        topology = Topology(registry)
+        self.assertEqual(topology.parents[switch.id], (modem.id,))
+        self.assertEqual(topology.parents[ap.id], (switch.id,))
+        self.assertEqual(topology.parents[printer.id], (ap.id,))
+        self.assertEqual([topology.depth[device.id] for device in (modem, switch, ap, printer)],
+                         [0, 1, 2, 3])
+        self.assertEqual(list(topology.dependents(modem.id)), [switch.id])
+        self.assertEqual(topology.warnings, [])
+
+    def test_depth_is_longest_path(self):
+        registry = make_registry(('A', '10.0.0.1', ()), ('B', '10.0.0.2', ('A',)),
+                                 ('C', '10.0.0.3', ('A', 'B')))
+        topology = Topology(registry)
+        self.assertEqual(topology.depth[by_name(registry, 'C').id], 2)
+
+    def test_missing_and_self_parents_are_ignored(self):
+        registry = make_registry(('A', '10.0.0.1', ('Yok', 'A')))
+        topology = Topology(registry)
+        self.assertEqual(len(topology), 0)
+        self.assertEqual(len(topology.warnings), 2)
+        self.assertIn('Yok', topology.warnings[0])
+
+    def test_cycle_edge_is_removed(self):
+        registry = make_registry(('Kök', '10.0.0.1', ()), ('A', '10.0.0.2', ('Kök', 'C')),
+                                 ('B', '10.0.0.3', ('A',)), ('C', '10.0.0.4', ('B',)))
+        topology = Topology(registry)
+        self.assertEqual(len(topology.warnings), 1)
+        self.assertIn('döngü', topology.warnings[0])
+        # Döngüdeki her cihazın bir derinliği olur ve grafikte döngü kalmaz
+        self.assertEqual(set(topology.depth), {device.id for device in registry})
+        for device_id, parents in topology.parents.items():
+            for parent_id in parents:
+                self.assertLess(topology.depth[parent_id], topology.depth[device_id])
+
+    def test_check(self):
+        registry = make_registry(('A', '10.0.0.1', ()), ('B', '10.0.0.2', ()),
+                                 ('C', '10.0.0.3', ('A', 'B')), ('D', '10.0.0.4', ()))
+        a, b, c, d = (by_name(registry, name) for name in 'ABCD')
+        topology = Topology(registry)
+        self.assertEqual(topology.check(d, registry), (None, None))
+
+        a.status, b.status = STATUS_OFFLINE, STATUS_ONLINE
+        self.assertEqual(topology.check(c, registry), (None, None))  # yedek yol açık
+
+        b.recent_failures = 1
+        self.assertEqual(topology.check(c, registry), ('wait', b))
+
+        b.recent_failures = 0
+        b.status = STATUS_UNKNOWN
+        self.assertEqual(topology.check(c, registry), ('wait', b))
+
+        b.status = STATUS_UNREACHABLE
+        self.assertEqual(topology.check(c, registry), ('down', a))
+
+
+class DependencyGroupsTest(unittest.TestCase):
+
+    def test_groups(self):
+        registry = make_registry(('A', '10.0.0.1', ()), ('B', '10.0.0.2', ('A',)),
+                                 ('C', '10.0.0.3', ()), ('D', '10.0.0.4', ('C', 'B')),
+                                 ('E', '10.0.0.5', ()), ('F', '10.0.0.6', ('E',)),
+                                 ('G', '10.0.0.7', ()))
+        groups = dependency_groups(registry)
+        ids = {name: by_name(registry, name).id for name in 'ABCDEFG'}
+        self.assertEqual(groups[ids['A']], min(ids[name] for name in 'ABCD'))
+        self.assertEqual(len({groups[ids[name]] for name in 'ABCD'}), 1)
+        self.assertEqual(groups[ids['E']], groups[ids['F']])
+        self.assertNotEqual(groups[ids['E']], groups[ids['A']])
+        self.assertNotIn(ids['G'], groups)
+        self.assertEqual(dependency_groups(make_registry(('A', '10.0.0.1', ()))), {})
+
+    def test_shard_pool_moves_joined_group(self):
+        monitor = PingMonitor(history_file=None, devices_file=None)
+        monitor.log_to_console = False
+        try:
+            pool = ShardPool(monitor, 64)
+            pool.commands = [queue.Queue() for _ in range(pool.workers)]
+            for index in range(20):
+                monitor.add_device(f'Cihaz {index}', f'10.0.1.{index}')
+            pool._assigned = pool._assign()
+            devices = list(monitor.devices)
+            parents = [device.name for device in devices]
+            with monitor._cond:
+                child = Device.from_dict({'name': 'Çok bağlı', 'ip': '10.0.2.1', 'parents': parents})
+                monitor.devices.add(child)
+                pool.add([child])
+            indexes = {pool._assigned[device.id] for device in monitor.devices}
+            self.assertEqual(len(indexes), 1)
+            moved = 0
+            for index, commands in enumerate(pool.commands):
+                while not commands.empty():
+                    command, argument = commands.get_nowait()
+                    if command == 'remove':
+                        moved += len(argument)
+                        self.assertNotIn(index, indexes)
+                    else:
+                        self.assertIn(index, indexes)
+            self.assertGreater(moved, 0)
+        finally:
+            monitor.close()
+
+
+class PropagateStatusTest(unittest.TestCase):
+
+    def setUp(self):
+        self.monitor = PingMonitor(history_file=None, devices_file=None)
+        self.monitor.log_to_console = False
+        self.changes = []
+        self.monitor.status_listeners.append(
+            lambda device, old, new, timestamp: self.changes.append((device.name, old, new)))
+        self.devices = {}
+        for name, ip, parents in (('Modem', '10.0.0.1', ()), ('Switch', '10.0.0.2', ('Modem',)),
+                                  ('AP', '10.0.0.3', ('Switch',)), ('Yedekli', '10.0.0.4', ('Switch', 'Yedek')),
+                                  ('Yedek', '10.0.0.5', ())):
+            device = self.monitor.add_device(name, ip, parents=list(parents))
+            device.status = STATUS_ONLINE
+            self.devices[name] = device
+
+    def tearDown(self):
+        self.monitor.close()
+
+    def test_down_parent_marks_dependents_unreachable(self):
+        topology = self.monitor.get_topology()
+        modem = self.devices['Modem']
+        modem.status = STATUS_OFFLINE
+        self.monitor.propagate_status(topology, modem)
+        self.assertEqual(self.devices['Switch'].status, STATUS_UNREACHABLE)
+        self.assertEqual(self.devices['AP'].status, STATUS_UNREACHABLE)
+        # Yedek üst cihazı çevrimiçi olan cihaz pinglenmeye devam eder
+        self.assertEqual(self.devices['Yedekli'].status, STATUS_ONLINE)
+        self.assertEqual(sorted(self.changes), [('AP', STATUS_ONLINE, STATUS_UNREACHABLE),
+                                                ('Switch', STATUS_ONLINE, STATUS_UNREACHABLE)])
+        logs = [message for message, _ in self.monitor.log_buffer if '2 alt cihaz' in message]
+        self.assertEqual(len(logs), 1)
+
+    def test_all_parents_down(self):
+        topology = self.monitor.get_topology()
+        self.devices['Yedek'].status = STATUS_OFFLINE
+        self.monitor.propagate_status(topology, self.devices['Yedek'])
+        self.assertEqual(self.devices['Yedekli'].status, STATUS_ONLINE)
+        self.devices['Modem'].status = STATUS_OFFLINE
+        self.monitor.propagate_status(topology, self.devices['Modem'])
+        self.assertEqual(self.devices['Yedekli'].status, STATUS_UNREACHABLE)
+
+    def test_unreachable_mark_is_status_only(self):
+        updates = []
+        self.monitor.gui_callback = updates.append
+        self.monitor.status_callback = lambda device: updates.append(('durum', device.name))
+        topology = self.monitor.get_topology()
+        self.devices['Switch'].status = STATUS_OFFLINE
+        self.monitor.propagate_status(topology, self.devices['Switch'])
+        self.assertEqual(updates, [('durum', 'AP')])
+        self.assertIsNone(self.devices['AP'].last_check)
+
+    def test_online_parent_reschedules_dependents(self):
+        monitor = self.monitor
+        topology = monitor.get_topology()
+        with monitor._cond:
+            for device in monitor.devices:
+                monitor._schedule_device(device, float('inf'))
+        monitor.propagate_status(topology, self.devices['Switch'])
+        for name in ('AP', 'Yedekli'):
+            self.assertLess(monitor._entries[self.devices[name].id][2], float('inf'))
+        self.assertEqual(monitor._entries[self.devices['Modem'].id][2], float('inf'))
+
+
+if __name__ == '__main__':
+    unittest.main()
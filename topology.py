@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ping Monitor - Cihazlar arası bağımlılık (üst cihaz) grafiği
+"""
+
+import collections
+
+from device_registry import STATUS_UNKNOWN, STATUS_OFFLINE, STATUS_UNREACHABLE
+
+
+class Topology:
+    """Cihazların "parents" alanından kurulan yönlü döngüsüz grafik (DAG).
+
+    Üst cihaz kimlik, hedef (IP) ya da adla belirtilebilir. Bulunamayan üst
+    cihazlar ve döngü oluşturan bağlantılar yok sayılır, warnings listesine
+    yazılır. Bir cihazın tüm üst cihazları çevrimdışı (ya da erişilemez) ise
+    cihaz erişilemez sayılır; tek bir yedek yol açıksa erişilebilir kabul edilir.
+    """
+
+    def __init__(self, registry):
+        self.parents = {}    # kimlik -> üst cihaz kimlikleri
+        self.children = collections.defaultdict(list)
+        self.depth = {}      # kimlik -> kökten uzaklık (üst cihazı olmayanlar 0)
+        self.warnings = []
+
+        names = {}
+        for device in registry:
+            names.setdefault(device.name, device.id)
+        for device in registry:
+            if not device.parents:
+                continue
+            resolved = []
+            for reference in device.parents:
+                parent = registry.get(reference) or registry.find_target(reference)
+                parent_id = parent.id if parent is not None else names.get(reference)
+                if parent_id is None:
+                    self.warnings.append(f"{device.name}: üst cihaz bulunamadı: {reference}")
+                elif parent_id == device.id:
+                    self.warnings.append(f"{device.name}: cihaz kendisine bağlanamaz")
+                elif parent_id not in resolved:
+                    resolved.append(parent_id)
+            if resolved:
+                self.parents[device.id] = tuple(resolved)
+                for parent_id in resolved:
+                    self.children[parent_id].append(device.id)
+        self._sort(registry)
+
+    def _sort(self, registry):
+        """Kahn algoritmasıyla derinlikleri hesapla; döngüdeki bağlantıları kaldır"""
+        pending = {device_id: len(parents) for device_id, parents in self.parents.items()}
+        queue = collections.deque(device.id for device in registry if device.id not in pending)
+        for device_id in queue:
+            self.depth[device_id] = 0
+        while queue:
+            device_id = queue.popleft()
+            for child_id in self.children.get(device_id, ()):
+                self.depth[child_id] = max(self.depth.get(child_id, 0), self.depth[device_id] + 1)
+                pending[child_id] -= 1
+                if pending[child_id] == 0:
+                    queue.append(child_id)
+
+        # Sırası gelmeyen cihazlar bir döngünün içinde ya da arkasındadır; derinlik
+        # öncelikli aramada döngüyü kapatan bağlantılar bulunup kaldırılır
+        remaining = {device_id for device_id, count in pending.items() if count > 0}
+        if not remaining:
+            return
+        state = {}  # 1: arama yolunda, 2: tamamlandı
+        for start in remaining:
+            if start in state:
+                continue
+            state[start] = 1
+            stack = [(start, iter(self.parents.get(start, ())))]
+            while stack:
+                device_id, parents = stack[-1]
+                for parent_id in parents:
+                    if parent_id not in remaining:
+                        continue
+                    if state.get(parent_id) == 1:
+                        self._remove_edge(device_id, parent_id)
+                        self.warnings.append(f"{registry.get(device_id).name}: bağımlılık döngüsü, "
+                                             f"{registry.get(parent_id).name} üst cihazı yok sayıldı")
+                    elif parent_id not in state:
+                        state[parent_id] = 1
+                        stack.append((parent_id, iter(self.parents.get(parent_id, ()))))
+                        break
+                else:
+                    state[device_id] = 2
+                    stack.pop()
+        self.depth = {}
+        self._sort(registry)
+
+    def _remove_edge(self, device_id, parent_id):
+        self.children[parent_id].remove(device_id)
+        parents = tuple(other for other in self.parents[device_id] if other != parent_id)
+        if parents:
+            self.parents[device_id] = parents
+        else:
+            del self.parents[device_id]
+
+    def __len__(self):
+        return len(self.parents)
+
+    def check(self, device, registry):
+        """Cihaz şimdi pinglenmeli mi?
+
+        (None, None): pingle; ('down', üst): tüm üst cihazlar düşmüş, cihaz
+        erişilemez; ('wait', üst): üst cihaz henüz doğrulanıyor, pingi ertele.
+        """
+        parents = self.parents.get(device.id)
+        if not parents:
+            return None, None
+        down = waiting = None
+        for parent_id in parents:
+            parent = registry.get(parent_id)
+            if parent is None:
+                return None, None
+            if parent.status in (STATUS_OFFLINE, STATUS_UNREACHABLE):
+                down = down or parent
+            elif parent.status == STATUS_UNKNOWN or parent.recent_failures & 1:
+                waiting = waiting or parent
+            else:
+                return None, None  # en az bir yol açık
+        if waiting is not None:
+            return 'wait', waiting
+        return 'down', down
+
+    def dependents(self, device_id):
+        """Alt cihazların kimlikleri (doğrudan)"""
+        return self.children.get(device_id, ())
+
+
+def dependency_groups(registry):
+    """Bağımlılıklarla birbirine bağlı cihaz kümeleri: kimlik -> kümenin anahtarı.
+
+    Anahtar kümedeki en küçük cihaz kimliğidir. Hiçbir bağımlılığa katılmayan
+    cihazlar sözlükte yer almaz. İşçi ve ajan dağıtımı bu anahtara göre
+    yapılır; böylece bir cihaz tüm üst cihazlarıyla aynı işlemde izlenir.
+    """
+    if not any(device.parents for device in registry):
+        return {}
+    topology = Topology(registry)
+    leader = {}
+
+    def find(device_id):
+        root = device_id
+        while leader.setdefault(root, root) != root:
+            root = leader[root]
+        while leader[device_id] != root:
+            leader[device_id], device_id = root, leader[device_id]
+        return root
+
+    for device_id, parents in topology.parents.items():
+        for parent_id in parents:
+            first, second = find(device_id), find(parent_id)
+            if first != second:
+                leader[max(first, second)] = min(first, second)
+    return {device_id: find(device_id) for device_id in leader}